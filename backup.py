@@ -0,0 +1,456 @@
+"""Streaming workspace backup and restore in gzip-compressed NDJSON.
+
+A backup file is a sequence of JSON records, one per line::
+
+    {"type": "meta", ...}
+    {"type": "database", "id": ..., "title": [...], "properties": {...}}
+    {"type": "page", "database_id": ..., "id": ..., "properties": {...}}
+    {"type": "cursor", "database_id": ..., "next_cursor": ..., "done": false}
+
+``cursor`` records are checkpoints written after every query page, so an
+interrupted backup resumes from the last cursor instead of starting over.
+Records are written and read one at a time, keeping memory constant.
+
+Files hosted by Notion are only reachable through signed URLs that expire
+after about an hour, so they are downloaded into a ``<backup>.files``
+directory next to the backup (named by SHA-256) and uploaded again on
+restore. Hosted files without a downloaded copy are reported as not
+restorable instead of being written back as links that stop working.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import time
+import urllib.request
+from typing import Dict, Iterator, List, Optional, Tuple
+from config import PARENT_PAGE_ID
+from concurrency import limiter_for, map_limited
+from file_uploads import uploader_for
+from logging_utils import get_logger
+from notion_db_utils import notion, retrieve_database, update_database
+
+log = get_logger(__name__)
+
+FORMAT_VERSION = 1
+QUERY_PAGE_SIZE = 100
+RESTORE_BATCH = 100
+DOWNLOAD_TIMEOUT = 60
+# File value types whose URLs are hosted (and expired) by Notion
+_HOSTED_FILE_TYPES = ("file", "file_upload")
+
+# Property types that can be recreated as schema and written as values
+_WRITABLE_TYPES = {
+    "title",
+    "rich_text",
+    "number",
+    "select",
+    "multi_select",
+    "status",
+    "date",
+    "people",
+    "files",
+    "checkbox",
+    "url",
+    "email",
+    "phone_number",
+}
+
+
+def read_records(path: str) -> Iterator[Dict]:
+    """Yield records of a backup file, stopping at a truncated tail."""
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+    except (EOFError, gzip.BadGzipFile, json.JSONDecodeError) as exc:
+        log.warning("백업 파일 끝이 손상되어 이후 레코드를 무시합니다: %s", exc)
+
+
+def _scan_progress(path: str) -> Tuple[Dict[str, Dict], bool]:
+    """Return per-database progress and whether the file ended cleanly."""
+    progress: Dict[str, Dict] = {}
+    clean = True
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            for line in fh:
+                rec = json.loads(line)
+                if rec["type"] == "database":
+                    progress.setdefault(rec["id"], {"cursor": None, "done": False})
+                elif rec["type"] == "cursor":
+                    progress[rec["database_id"]] = {
+                        "cursor": rec.get("next_cursor"),
+                        "done": rec.get("done", False),
+                    }
+    except (EOFError, gzip.BadGzipFile, json.JSONDecodeError):
+        clean = False
+    return progress, clean
+
+
+def _repair(path: str) -> None:
+    """Rewrite the readable part of a truncated backup so it can be appended."""
+    tmp_path = f"{path}.repair"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as out:
+        for rec in read_records(path):
+            out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    os.replace(tmp_path, path)
+
+
+def files_dir_for(path: str) -> str:
+    """Return the directory holding the downloaded files of a backup."""
+    return f"{path}.files"
+
+
+def _download(url: str, files_dir: str) -> Dict[str, str]:
+    """Stream ``url`` into ``files_dir`` and return its ``{"path", "sha256"}``."""
+    os.makedirs(files_dir, exist_ok=True)
+    digest = hashlib.sha256()
+    tmp_path = os.path.join(files_dir, f".download-{os.getpid()}-{time.monotonic_ns()}")
+    try:
+        with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT) as src, open(tmp_path, "wb") as dst:
+            while True:
+                block = src.read(1 << 20)
+                if not block:
+                    break
+                digest.update(block)
+                dst.write(block)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    name = digest.hexdigest()
+    os.replace(tmp_path, os.path.join(files_dir, name))
+    return {"path": name, "sha256": name}
+
+
+def _keep_files(properties: Dict, files_dir: str) -> Dict:
+    """Download the Notion-hosted files of a page and note the local copies."""
+    for prop in properties.values():
+        if prop.get("type") != "files":
+            continue
+        for f in prop.get("files") or []:
+            url = (f.get(f.get("type")) or {}).get("url")
+            if f.get("type") not in _HOSTED_FILE_TYPES or not url:
+                continue
+            try:
+                f["backup"] = _download(url, files_dir)
+            except Exception as exc:
+                log.warning("첨부파일 다운로드 실패 %s: %s", f.get("name"), exc)
+    return properties
+
+
+def _child_database_ids(api, parent_page_id: str) -> List[str]:
+    ids: List[str] = []
+    cursor = None
+    while True:
+        if cursor:
+            page = api.blocks.children.list(parent_page_id, start_cursor=cursor)
+        else:
+            page = api.blocks.children.list(parent_page_id)
+        ids.extend(b["id"] for b in page.get("results", []) if b.get("type") == "child_database")
+        cursor = page.get("next_cursor")
+        if not cursor:
+            return ids
+
+
+def backup_workspace(
+    path: str,
+    parent_page_id: str = PARENT_PAGE_ID,
+    *,
+    client=None,
+    resume: bool = True,
+) -> Dict[str, int]:
+    """Stream every child database of ``parent_page_id`` into ``path``.
+
+    With ``resume`` an existing file is continued from its last checkpoint.
+    Notion-hosted attachments are downloaded next to the backup (see
+    :func:`files_dir_for`). Returns the number of databases and pages
+    written in this call.
+    """
+    api = client or notion
+    counts = {"databases": 0, "pages": 0}
+    if not api:
+        log.debug("노션 클라이언트 미설정")
+        return counts
+    progress: Dict[str, Dict] = {}
+    mode = "wt"
+    if resume and os.path.exists(path):
+        progress, clean = _scan_progress(path)
+        if not clean:
+            _repair(path)
+        mode = "at"
+
+    with gzip.open(path, mode, encoding="utf-8") as out:
+
+        def write(rec: Dict) -> None:
+            out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+        if mode == "wt":
+            write(
+                {
+                    "type": "meta",
+                    "version": FORMAT_VERSION,
+                    "parent_page_id": parent_page_id,
+                    "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                }
+            )
+        for db_id in _child_database_ids(api, parent_page_id):
+            state = progress.get(db_id)
+            if state and state["done"]:
+                continue
+            if state is None:
+                info = retrieve_database(db_id, client=api)
+                write(
+                    {
+                        "type": "database",
+                        "id": db_id,
+                        "title": info.get("title", []),
+                        "icon": info.get("icon"),
+                        "properties": info.get("properties", {}),
+                    }
+                )
+                counts["databases"] += 1
+            cursor = state["cursor"] if state else None
+            while True:
+                kwargs = {"page_size": QUERY_PAGE_SIZE}
+                if cursor:
+                    kwargs["start_cursor"] = cursor
+                data = api.databases.query(db_id, **kwargs)
+                for page in data.get("results", []):
+                    write(
+                        {
+                            "type": "page",
+                            "database_id": db_id,
+                            "id": page["id"],
+                            "properties": _keep_files(
+                                page.get("properties", {}), files_dir_for(path)
+                            ),
+                        }
+                    )
+                    counts["pages"] += 1
+                cursor = data.get("next_cursor")
+                write(
+                    {
+                        "type": "cursor",
+                        "database_id": db_id,
+                        "next_cursor": cursor,
+                        "done": not cursor,
+                    }
+                )
+                out.flush()
+                if not cursor:
+                    break
+    log.info("백업 완료: 데이터베이스 %d개, 페이지 %d건", counts["databases"], counts["pages"])
+    return counts
+
+
+def _schema_for_create(properties: Dict) -> Tuple[Dict, Dict]:
+    """Split a retrieved schema into creatable properties and relations."""
+    create: Dict[str, Dict] = {}
+    relations: Dict[str, Dict] = {}
+    for name, prop in properties.items():
+        ptype = prop.get("type")
+        if ptype == "relation":
+            relations[name] = prop["relation"]
+        elif ptype in _WRITABLE_TYPES:
+            cfg = dict(prop.get(ptype) or {})
+            if "options" in cfg:
+                cfg["options"] = [
+                    {k: v for k, v in opt.items() if k in ("name", "color")}
+                    for opt in cfg["options"]
+                ]
+            cfg.pop("groups", None)
+            create[name] = {ptype: cfg}
+    return create, relations
+
+
+def _rich_text(items: List[Dict]) -> List[Dict]:
+    """Drop the read-only parts of rich text; mentions become plain text."""
+    out = []
+    for t in items:
+        if t.get("type") == "text" and t.get("text"):
+            text = t["text"]
+        else:
+            text = {"content": t.get("plain_text", "")}
+        out.append({"type": "text", "text": text, "annotations": t.get("annotations", {})})
+    return out
+
+
+def writable_value(prop: Dict, files_dir: Optional[str] = None) -> Optional[Dict]:
+    """Convert a property value read from a page into its write form.
+
+    Hosted files with a copy in ``files_dir`` become upload placeholders
+    (see :func:`file_uploads.encode_files`); other hosted files are left out.
+    """
+    ptype = prop.get("type")
+    value = prop.get(ptype)
+    if ptype not in _WRITABLE_TYPES:
+        return None
+    if ptype in ("title", "rich_text"):
+        return {ptype: _rich_text(value or [])}
+    if ptype in ("select", "status"):
+        return {ptype: {"name": value["name"]} if value else None}
+    if ptype == "multi_select":
+        return {ptype: [{"name": v["name"]} for v in value or []]}
+    if ptype == "people":
+        return {ptype: [{"id": p["id"]} for p in value or []]}
+    if ptype == "files":
+        files = []
+        for f in value or []:
+            kind = f.get("type")
+            url = (f.get(kind) or {}).get("url")
+            if kind == "external" and url:
+                files.append({"name": f.get("name", url), "type": "external", "external": {"url": url}})
+            elif f.get("backup") and files_dir:
+                files.append(
+                    {
+                        "name": f.get("name") or f["backup"]["sha256"],
+                        "path": os.path.join(files_dir, f["backup"]["path"]),
+                        "sha256": f["backup"]["sha256"],
+                    }
+                )
+        return {ptype: files}
+    return {ptype: value}
+
+
+def restore_workspace(
+    path: str, parent_page_id: str = PARENT_PAGE_ID, *, client=None
+) -> Dict[str, int]:
+    """Recreate the databases and rows of a backup under ``parent_page_id``.
+
+    Rows are created in batches under the client's adaptive concurrency
+    limit. Relation columns are added once every database exists and their
+    values are written in a second pass with page ids remapped to the new
+    pages. Pages repeated by a resumed backup are restored once. Downloaded
+    attachments are uploaded again through the client's
+    :class:`file_uploads.FileUploader`; hosted attachments without a copy
+    are counted in ``files_skipped``.
+    """
+    api = client or notion
+    counts = {"databases": 0, "pages": 0, "relations": 0, "files_skipped": 0}
+    if not api:
+        log.debug("노션 클라이언트 미설정")
+        return counts
+    db_map: Dict[str, str] = {}
+    page_map: Dict[str, str] = {}
+    relation_cols: Dict[str, Dict[str, Dict]] = {}
+    limiter = limiter_for("notion", api)
+    batch: List[Tuple[str, Dict]] = []
+    files_dir = files_dir_for(path)
+    uploader = uploader_for(api)
+
+    def create_row(entry: Tuple[str, Dict]) -> Tuple[str, str, int]:
+        old_id, rec = entry
+        props = {}
+        skipped = 0
+        for name, prop in rec["properties"].items():
+            value = writable_value(prop, files_dir)
+            if value is not None:
+                props[name] = value
+            if prop.get("type") == "files":
+                skipped += sum(
+                    1
+                    for f in prop.get("files") or []
+                    if f.get("type") in _HOSTED_FILE_TYPES and not f.get("backup")
+                )
+        res = api.pages.create(
+            parent={"database_id": db_map[rec["database_id"]]}, properties=uploader.resolve(props)
+        )
+        return old_id, res["id"], skipped
+
+    def flush() -> None:
+        for old_id, new_id, skipped in map_limited(limiter, create_row, batch):
+            page_map[old_id] = new_id
+            counts["files_skipped"] += skipped
+        counts["pages"] += len(batch)
+        batch.clear()
+
+    for rec in read_records(path):
+        if rec["type"] == "database":
+            props, relations = _schema_for_create(rec["properties"])
+            res = api.databases.create(
+                parent={"type": "page_id", "page_id": parent_page_id},
+                title=rec.get("title") or [],
+                icon=rec.get("icon"),
+                properties=props,
+            )
+            db_map[rec["id"]] = res["id"]
+            relation_cols[rec["id"]] = relations
+            counts["databases"] += 1
+        elif rec["type"] == "page" and rec["id"] not in page_map and rec["database_id"] in db_map:
+            page_map[rec["id"]] = ""
+            batch.append((rec["id"], rec))
+            if len(batch) >= RESTORE_BATCH:
+                flush()
+    flush()
+
+    for old_db, relations in relation_cols.items():
+        updates = {
+            name: {
+                "relation": {
+                    "database_id": db_map[cfg["database_id"]],
+                    "type": "single_property",
+                    "single_property": {},
+                }
+            }
+            for name, cfg in relations.items()
+            if cfg.get("database_id") in db_map
+        }
+        if updates:
+            update_database(db_map[old_db], client=api, properties=updates)
+
+    def link(entry: Tuple[str, Dict]) -> None:
+        new_id, props = entry
+        api.pages.update(new_id, properties=props)
+
+    pending: List[Tuple[str, Dict]] = []
+    linked = set()
+    for rec in read_records(path):
+        if rec["type"] != "page" or not page_map.get(rec["id"]) or rec["id"] in linked:
+            continue
+        linked.add(rec["id"])
+        props = {
+            name: {
+                "relation": [
+                    {"id": page_map[r["id"]]}
+                    for r in prop["relation"]
+                    if page_map.get(r["id"])
+                ]
+            }
+            for name, prop in rec["properties"].items()
+            if prop.get("type") == "relation" and prop.get("relation")
+        }
+        if props:
+            pending.append((page_map[rec["id"]], props))
+        if len(pending) >= RESTORE_BATCH:
+            map_limited(limiter, link, pending)
+            counts["relations"] += len(pending)
+            pending.clear()
+    map_limited(limiter, link, pending)
+    counts["relations"] += len(pending)
+    log.info(
+        "복원 완료: 데이터베이스 %d개, 페이지 %d건, 관계 %d건",
+        counts["databases"], counts["pages"], counts["relations"],
+    )
+    if counts["files_skipped"]:
+        log.warning("백업본이 없어 복원하지 못한 첨부파일 %d개", counts["files_skipped"])
+    return counts
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="노션 워크스페이스 백업/복원")
+    parser.add_argument("command", choices=["backup", "restore"])
+    parser.add_argument("path", help="NDJSON.gz 파일 경로")
+    parser.add_argument("--parent", default=PARENT_PAGE_ID, help="대상 부모 페이지 ID")
+    parser.add_argument("--no-resume", action="store_true", help="기존 백업을 이어쓰지 않음")
+    args = parser.parse_args(argv)
+    if args.command == "backup":
+        backup_workspace(args.path, args.parent, resume=not args.no_resume)
+    else:
+        restore_workspace(args.path, args.parent)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""Benchmark suite with a baseline regression gate.
+
+Runs the main flows against the simulated clients of ``simulated.py`` at
+several data sizes and records wall time, API calls per endpoint and peak
+traced memory. Results are compared with ``baseline.json``; a call count
+(total or per endpoint) or peak memory above its baseline by more than
+``--margin`` fails the run (exit status 1)::
+
+    python benchmarks/bench.py --sizes 10,100
+    python benchmarks/bench.py --update-baseline
+
+Wall time depends on the machine and its load, so it is only reported as
+advisory and never fails the gate. Call counts are deterministic and catch
+extra or repeated requests. Refresh the baseline in the same change that
+alters the measured flows.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import ExitStack
+from typing import Callable, Dict, List
+from unittest.mock import patch
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import calendar_sync
+import google_calendar_utils
+import main as app
+import notion_db_utils
+import notion_templates
+import slack_utils
+from synthetic_data import generate_items
+from simulated import SimulatedCalendar, SimulatedNotion
+
+# Importing main installs the Slack log handler; benchmarks never post logs
+logging.getLogger().removeHandler(app.slack_handler)
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+PARENT = "bench-parent"
+CALENDAR_TEMPLATE = "회사 일정 캘린더"
+
+
+def _calendar_pages(client: SimulatedNotion, size: int) -> str:
+    tmpl = notion_templates.get_template(CALENDAR_TEMPLATE)
+    db_id = client.add_database(PARENT, tmpl["properties"], CALENDAR_TEMPLATE)
+    for item in generate_items(CALENDAR_TEMPLATE, size):
+        props = notion_db_utils.encode_item(item, tmpl)
+        client.pages_store[db_id].append(
+            {"id": client._new_id("page"), "properties": props}
+        )
+    return db_id
+
+
+def bench_delete(client: SimulatedNotion, size: int) -> Callable[[], None]:
+    for _ in range(size):
+        client.add_database(PARENT, {"제목": {"title": {}}})
+    return lambda: notion_db_utils.delete_existing_databases(PARENT, client=client)
+
+
+def bench_create_dummy_data(client: SimulatedNotion, size: int) -> Callable[[], None]:
+    tmpl = notion_templates.get_template("지출결의서")
+    db_id = client.add_database(
+        PARENT, {**tmpl["properties"], notion_db_utils.IDEMPOTENCY_PROPERTY: {"rich_text": {}}}
+    )
+    return lambda: asyncio.run(
+        notion_db_utils.create_dummy_data(db_id, "지출결의서", client=client, count=size)
+    )
+
+
+def bench_sync_calendar(client: SimulatedNotion, size: int) -> Callable[[], None]:
+    db_id = _calendar_pages(client, size)
+    return lambda: calendar_sync.sync_notion_calendar(db_id)
+
+
+def bench_main_run(client: SimulatedNotion, size: int) -> Callable[[], None]:
+    return lambda: asyncio.run(app.run(client, PARENT, notify=False, rows=size))
+
+
+def bench_main_rerun_upsert(client: SimulatedNotion, size: int) -> Callable[[], None]:
+    """Measure a rerun on unchanged data, which should make no writes."""
+    asyncio.run(app.run(client, PARENT, notify=False, rows=size, upsert=True))
+    return lambda: asyncio.run(app.run(client, PARENT, notify=False, rows=size, upsert=True))
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "delete_existing_databases": bench_delete,
+    "create_dummy_data": bench_create_dummy_data,
+    "sync_notion_calendar": bench_sync_calendar,
+    "main.run": bench_main_run,
+    "main.run.upsert_rerun": bench_main_rerun_upsert,
+}
+
+
+def measure(name: str, size: int, *, time_scale: float) -> Dict:
+    """Run one scenario at ``size`` rows and return its metrics."""
+    client = SimulatedNotion(time_scale=time_scale)
+    calendar = SimulatedCalendar(time_scale=time_scale)
+    with ExitStack() as stack:
+        stack.enter_context(patch.object(google_calendar_utils, "_service", calendar))
+        stack.enter_context(patch.object(calendar_sync, "notion", client))
+        stack.enter_context(patch.object(slack_utils, "slack_client", None))
+        fn = SCENARIOS[name](client, size)
+        # Only the measured call counts, not the scenario setup
+        client.calls.clear()
+        calendar.calls.clear()
+        tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            fn()
+        finally:
+            wall = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    calls = {f"notion.{k}": v for k, v in client.calls.items()}
+    calls.update({f"calendar.{k}": v for k, v in calendar.calls.items()})
+    return {
+        "wall": round(wall, 4),
+        "calls": sum(calls.values()),
+        "peak_kb": round(peak / 1024, 1),
+        "endpoints": dict(sorted(calls.items())),
+    }
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], margin: float) -> List[str]:
+    """Return a message for every gated metric above ``baseline * (1 + margin)``.
+
+    Only deterministic metrics are gated: total calls, calls per endpoint
+    (an endpoint missing from the baseline counts from zero) and peak memory.
+    """
+    failures = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        metrics = [(m, result[m], base[m]) for m in ("calls", "peak_kb")]
+        base_endpoints = base.get("endpoints", {})
+        metrics += [
+            (endpoint, count, base_endpoints.get(endpoint, 0))
+            for endpoint, count in result.get("endpoints", {}).items()
+        ]
+        for metric, value, expected in metrics:
+            if value > expected * (1 + margin):
+                failures.append(f"{key} {metric}: {value} > {expected} (+{margin:.0%})")
+    return failures
+
+
+def advisories(
+    results: Dict[str, Dict],
+    baseline: Dict[str, Dict],
+    margin: float,
+    *,
+    wall_slack: float = 0.05,
+) -> List[str]:
+    """Return a message for every wall time above its baseline.
+
+    Wall time is noisy, so these are reported without failing the gate.
+    ``wall_slack`` seconds are added so short scenarios do not flood the
+    report with timer noise.
+    """
+    notes = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base and result["wall"] > base["wall"] * (1 + margin) + wall_slack:
+            notes.append(f"{key} wall: {result['wall']} > {base['wall']} (+{margin:.0%})")
+    return notes
+
+
+def run_suite(names: List[str], sizes: List[int], *, time_scale: float) -> Dict[str, Dict]:
+    results = {}
+    for name in names:
+        for size in sizes:
+            results[f"{name}@{size}"] = measure(name, size, time_scale=time_scale)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="성능 벤치마크와 회귀 검사")
+    parser.add_argument("--sizes", default="10,100", help="쉼표로 구분한 행 수")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="실행할 시나리오")
+    parser.add_argument("--margin", type=float, default=0.25, help="허용 초과 비율")
+    parser.add_argument("--time-scale", type=float, default=20.0, help="지연/요청 한도 배율")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+    logging.disable(logging.INFO)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    names = [n for n in args.scenarios.split(",") if n]
+    results = run_suite(names, sizes, time_scale=args.time_scale)
+    for key, result in results.items():
+        print(f"{key:<36} {result['wall']:>8.3f}s {result['calls']:>6} calls {result['peak_kb']:>10.1f} KiB")
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, ensure_ascii=False, indent=2, sort_keys=True)
+            fh.write("\n")
+        print(f"baseline 저장: {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("baseline 파일이 없어 비교를 건너뜁니다")
+        return 0
+    with open(args.baseline, encoding="utf-8") as fh:
+        baseline = json.load(fh)
+    for note in advisories(results, baseline, args.margin):
+        print(f"SLOWER (advisory) {note}")
+    failures = compare(results, baseline, args.margin)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
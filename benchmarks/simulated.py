@@ -0,0 +1,250 @@
+"""In-memory Notion and Google Calendar clients with simulated latency.
+
+Both clients implement the subset of the real client interfaces used by
+this repository. Every call waits for a shared rate limit, sleeps for the
+configured latency and is counted per endpoint. ``time_scale`` shrinks
+latency and widens the rate limit by the same factor so a benchmark keeps
+realistic proportions while finishing quickly.
+"""
+import itertools
+import sys
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rate_limit import RateLimiter
+
+
+class _Simulated:
+    def __init__(self, *, latency: float, rate: float, time_scale: float) -> None:
+        self.latency = latency / time_scale
+        self.limiter = RateLimiter(rate * time_scale)
+        self.calls: Counter = Counter()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def _call(self, endpoint: str) -> None:
+        self.limiter.acquire()
+        with self._lock:
+            self.calls[endpoint] += 1
+        time.sleep(self.latency)
+
+    def _new_id(self, prefix: str) -> str:
+        with self._lock:
+            return f"{prefix}-{next(self._ids):08d}"
+
+
+def _read_form(properties: Dict[str, Dict]) -> Dict[str, Dict]:
+    """Convert ``{"select": {...}}`` schema entries to ``{"type": "select", ...}``."""
+    out = {}
+    for name, prop in properties.items():
+        ptype = next(iter(prop))
+        out[name] = {"id": name, "type": ptype, ptype: prop[ptype]}
+    return out
+
+
+class SimulatedNotion(_Simulated):
+    """Notion client stand-in; defaults follow the public 3 req/s limit."""
+
+    PAGE_SIZE = 100
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.3,
+        rate: float = 3.0,
+        time_scale: float = 20.0,
+        users: int = 20,
+    ) -> None:
+        super().__init__(latency=latency, rate=rate, time_scale=time_scale)
+        self.options = SimpleNamespace(auth="simulated")
+        self.databases_store: Dict[str, Dict] = {}
+        self.pages_store: Dict[str, List[Dict]] = defaultdict(list)
+        self.children: Dict[str, List[str]] = defaultdict(list)
+        # Content blocks appended under pages and blocks, kept apart from databases
+        self.blocks_store: Dict[str, List[Dict]] = defaultdict(list)
+        self.users_store = [
+            {"object": "user", "id": f"user-{i}", "name": f"사용자{i}", "type": "person",
+             "person": {"email": f"user{i}@example.com"}}
+            for i in range(users)
+        ]
+        self.databases = SimpleNamespace(
+            create=self._db_create, retrieve=self._db_retrieve,
+            update=self._db_update, query=self._db_query,
+        )
+        self.pages = SimpleNamespace(create=self._page_create, update=self._page_update)
+        self.blocks = SimpleNamespace(
+            delete=self._block_delete,
+            children=SimpleNamespace(list=self._children_list, append=self._children_append),
+        )
+        self.users = SimpleNamespace(list=self._users_list)
+
+    def add_database(self, parent_id: str, properties: Dict[str, Dict], title: str = "") -> str:
+        """Create a database directly, without counting an API call."""
+        db_id = self._new_id("db")
+        self.databases_store[db_id] = {
+            "id": db_id,
+            "title": [{"plain_text": title, "text": {"content": title}}],
+            "properties": _read_form(properties),
+        }
+        self.children[parent_id].append(db_id)
+        return db_id
+
+    def _db_create(self, *, parent, title, properties, icon=None) -> Dict:
+        self._call("databases.create")
+        text = "".join(t.get("text", {}).get("content", "") for t in title)
+        return {"id": self.add_database(parent["page_id"], properties, text)}
+
+    def _db_retrieve(self, db_id: str) -> Dict:
+        self._call("databases.retrieve")
+        return self.databases_store[db_id]
+
+    def _db_update(self, db_id: str, *, properties=None, **_) -> Dict:
+        self._call("databases.update")
+        self.databases_store[db_id]["properties"].update(_read_form(properties or {}))
+        return self.databases_store[db_id]
+
+    def _db_query(self, db_id: str, *, start_cursor=None, page_size=PAGE_SIZE, **_) -> Dict:
+        self._call("databases.query")
+        pages = self.pages_store[db_id]
+        start = int(start_cursor or 0)
+        end = start + min(page_size, self.PAGE_SIZE)
+        return {
+            "results": pages[start:end],
+            "next_cursor": str(end) if end < len(pages) else None,
+        }
+
+    def _page_create(self, *, parent, properties, children=None) -> Dict:
+        self._call("pages.create")
+        page = {
+            "id": self._new_id("page"),
+            "last_edited_time": "2024-01-01T00:00:00.000Z",
+            "properties": dict(properties),
+        }
+        with self._lock:
+            self.pages_store[parent["database_id"]].append(page)
+            self.blocks_store[page["id"]].extend(children or [])
+        return page
+
+    def _page_update(self, page_id: str, *, properties=None, **_) -> Dict:
+        self._call("pages.update")
+        with self._lock:
+            for pages in self.pages_store.values():
+                for page in pages:
+                    if page["id"] == page_id:
+                        page["properties"].update(properties or {})
+                        return page
+        return {"id": page_id}
+
+    def _block_delete(self, block_id: str) -> Dict:
+        self._call("blocks.delete")
+        with self._lock:
+            for blocks in self.children.values():
+                if block_id in blocks:
+                    blocks.remove(block_id)
+        return {"id": block_id}
+
+    def _children_list(self, block_id: str, start_cursor=None) -> Dict:
+        self._call("blocks.children.list")
+        ids = self.children[block_id]
+        start = int(start_cursor or 0)
+        end = start + self.PAGE_SIZE
+        return {
+            "results": [
+                {
+                    "id": i,
+                    "type": "child_database",
+                    "child_database": {
+                        "title": self.databases_store[i]["title"][0]["plain_text"]
+                    },
+                }
+                for i in ids[start:end]
+            ],
+            "next_cursor": str(end) if end < len(ids) else None,
+        }
+
+    def _children_append(self, block_id: str, *, children) -> Dict:
+        self._call("blocks.children.append")
+        created = []
+        for block in children:
+            body = {k: v for k, v in block[block["type"]].items() if k != "children"}
+            created.append({**block, "id": self._new_id("block"), block["type"]: body})
+        with self._lock:
+            self.blocks_store[block_id].extend(created)
+            for block, new in zip(children, created):
+                self.blocks_store[new["id"]].extend(block[block["type"]].get("children", []))
+        return {"object": "list", "results": created}
+
+    def _users_list(self, start_cursor=None) -> Dict:
+        self._call("users.list")
+        return {"results": list(self.users_store), "next_cursor": None}
+
+
+class _Request:
+    """Deferred call; ``fields="id"`` projects the response to the id."""
+
+    def __init__(self, service: "SimulatedCalendar", endpoint: str, fn, fields=None) -> None:
+        self._service = service
+        self._endpoint = endpoint
+        self._fn = fn
+        self._fields = fields
+
+    def execute(self):
+        self._service._call(self._endpoint)
+        result = self._fn()
+        if self._fields == "id" and result is not None:
+            return {"id": result["id"]}
+        return result
+
+
+class SimulatedCalendar(_Simulated):
+    """``googleapiclient`` calendar service stand-in."""
+
+    def __init__(
+        self, *, latency: float = 0.2, rate: float = 10.0, time_scale: float = 20.0
+    ) -> None:
+        super().__init__(latency=latency, rate=rate, time_scale=time_scale)
+        self.store: Dict[str, Dict] = {}
+
+    def events(self) -> "SimulatedCalendar":
+        return self
+
+    def insert(self, calendarId: str, body: Dict, fields: Optional[str] = None) -> _Request:
+        def run():
+            # Like Google, all-day end dates are exclusive and must follow the start
+            if body["end"]["date"] <= body["start"]["date"]:
+                raise ValueError("400 The specified time range is empty.")
+            event = dict(body)
+            event.setdefault("id", self._new_id("event"))
+            self.store[event["id"]] = event
+            return event
+
+        return _Request(self, "events.insert", run, fields)
+
+    def patch(
+        self, calendarId: str, eventId: str, body: Dict, fields: Optional[str] = None
+    ) -> _Request:
+        def run():
+            event = self.store.setdefault(eventId, {"id": eventId})
+            event.update(body)
+            return event
+
+        return _Request(self, "events.patch", run, fields)
+
+    def get(self, calendarId: str, eventId: str, fields: Optional[str] = None) -> _Request:
+        return _Request(self, "events.get", lambda: self.store.get(eventId), fields)
+
+    def list(self, calendarId: str, pageToken: Optional[str] = None, maxResults: int = 2500, **_) -> _Request:
+        def run():
+            items = list(self.store.values())
+            start = int(pageToken or 0)
+            end = start + maxResults
+            data = {"items": items[start:end], "nextSyncToken": "sync"}
+            if end < len(items):
+                data["nextPageToken"] = str(end)
+            return data
+
+        return _Request(self, "events.list", run)
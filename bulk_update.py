@@ -0,0 +1,206 @@
+"""Apply one property patch or archive to every row matching a filter.
+
+Rows are selected with a server-side ``databases.query`` filter and streamed
+from the query cursor straight into concurrent ``pages.update`` calls under
+the client's adaptive concurrency limit, so the next result page is fetched
+while the previous one is being written and no more than the in-flight
+updates are held in memory. Failed pages are collected in a report instead
+of aborting the run.
+
+Command line usage::
+
+    python bulk_update.py 지출결의서 --where 상태=미처리 --where 요청월=2024-05 --set 상태=완료
+    python bulk_update.py <DB ID> --where 상태=반려 --archive --dry-run
+"""
+import argparse
+import json
+import re
+from typing import Dict, Iterator, List, Optional
+from config import PARENT_PAGE_ID
+from concurrency import limiter_for, map_limited
+from file_uploads import uploader_for
+from logging_utils import get_logger
+from notion_db_utils import encode_item, find_databases, notion, retrieve_database
+from retry import call_with_retry
+
+log = get_logger(__name__)
+
+QUERY_PAGE_SIZE = 100
+
+# Property types understood by ``where_filter`` and their filter conditions
+_FILTER_CONDITIONS = {
+    "title": "equals",
+    "rich_text": "equals",
+    "select": "equals",
+    "status": "equals",
+    "number": "equals",
+    "date": "equals",
+    "checkbox": "equals",
+    "multi_select": "contains",
+    "people": "contains",
+}
+# Property types ``encode_item`` can write
+_SETTABLE_TYPES = {"title", "rich_text", "select", "date", "number", "people", "relation", "files"}
+
+
+def where_filter(schema: Dict[str, Dict], conditions: Dict[str, str]) -> Optional[Dict]:
+    """Build a Notion filter matching all ``{property: value}`` conditions."""
+    clauses = []
+    for name, value in conditions.items():
+        ptype = schema.get(name, {}).get("type")
+        if ptype not in _FILTER_CONDITIONS:
+            raise ValueError(f"필터를 지원하지 않는 속성입니다: {name} ({ptype})")
+        if ptype == "number":
+            value = float(value)
+        elif ptype == "checkbox":
+            value = str(value).lower() in ("1", "true", "yes")
+        clauses.append({"property": name, ptype: {_FILTER_CONDITIONS[ptype]: value}})
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"and": clauses}
+
+
+def encode_patch(schema: Dict[str, Dict], values: Dict) -> Dict[str, Dict]:
+    """Encode plain ``{property: value}`` pairs as Notion property values."""
+    template = {"properties": {}}
+    for name in values:
+        ptype = schema.get(name, {}).get("type")
+        if ptype not in _SETTABLE_TYPES:
+            raise ValueError(f"일괄 변경을 지원하지 않는 속성입니다: {name} ({ptype})")
+        if ptype == "number":
+            values = {**values, name: float(values[name])}
+        template["properties"][name] = {ptype: {}}
+    return encode_item(values, template)
+
+
+def iter_pages(db_id: str, filter: Optional[Dict], *, client) -> Iterator[Dict]:
+    """Yield the pages matching ``filter``, one result page at a time."""
+    query: Dict = {"page_size": QUERY_PAGE_SIZE}
+    if filter:
+        query["filter"] = filter
+    cursor = None
+    while True:
+        if cursor:
+            data = client.databases.query(db_id, start_cursor=cursor, **query)
+        else:
+            data = client.databases.query(db_id, **query)
+        yield from data.get("results", [])
+        cursor = data.get("next_cursor")
+        if not cursor:
+            return
+
+
+def bulk_update(
+    db_id: str,
+    *,
+    filter: Optional[Dict] = None,
+    properties: Optional[Dict[str, Dict]] = None,
+    archive: bool = False,
+    dry_run: bool = False,
+    client=None,
+) -> Dict:
+    """Patch ``properties`` of, or archive, every page matching ``filter``.
+
+    ``properties`` are encoded Notion values (see :func:`encode_patch`);
+    local files among them are uploaded once before the first update. With
+    ``dry_run`` matches are only counted. Returns ``{"matched",
+    "updated", "failed"}`` where ``failed`` lists ``{"page_id", "error"}``.
+    """
+    api = client or notion
+    result: Dict = {"matched": 0, "updated": 0, "failed": []}
+    if not api:
+        log.debug("노션 클라이언트 미설정")
+        return result
+    if not properties and not archive:
+        raise ValueError("변경할 속성이나 archive 중 하나는 필요합니다")
+    body: Dict = {}
+    if properties:
+        body["properties"] = properties
+    if archive:
+        body["archived"] = True
+
+    def _counted(pages: Iterator[Dict]) -> Iterator[str]:
+        for page in pages:
+            result["matched"] += 1
+            yield page["id"]
+
+    def _update(page_id: str) -> Optional[Dict]:
+        try:
+            call_with_retry("pages.update", api.pages.update, page_id, **body)
+        except Exception as exc:
+            log.warning("페이지 일괄 변경 실패 %s: %s", page_id, exc)
+            return {"page_id": page_id, "error": str(exc)}
+        return None
+
+    page_ids = _counted(iter_pages(db_id, filter, client=api))
+    if dry_run:
+        for _ in page_ids:
+            pass
+        log.info("일괄 변경 dry-run: 대상 %d건", result["matched"])
+        return result
+    if properties:
+        body["properties"] = uploader_for(api).resolve(properties)
+    failures = [f for f in map_limited(limiter_for("notion", api), _update, page_ids) if f]
+    result["failed"] = failures
+    result["updated"] = result["matched"] - len(failures)
+    log.info(
+        "일괄 변경 완료: 대상 %d건, 성공 %d건, 실패 %d건",
+        result["matched"], result["updated"], len(failures),
+    )
+    return result
+
+
+def _pairs(items: List[str]) -> Dict[str, str]:
+    pairs = {}
+    for item in items or []:
+        if "=" not in item:
+            raise SystemExit(f"속성=값 형식이 아닙니다: {item}")
+        name, value = item.split("=", 1)
+        pairs[name.strip()] = value
+    return pairs
+
+
+def _resolve_database(name: str, parent: Optional[str]) -> str:
+    """Return ``name`` if it is a database id, else the id of that title."""
+    if re.fullmatch(r"[0-9a-fA-F]{32}|[0-9a-fA-F-]{36}", name):
+        return name
+    db_id = find_databases(parent).get(name)
+    if not db_id:
+        raise SystemExit(f"데이터베이스를 찾을 수 없습니다: {name}")
+    return db_id
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="노션 데이터베이스 행 일괄 변경")
+    parser.add_argument("database", help="데이터베이스 ID 또는 부모 페이지 아래의 제목")
+    parser.add_argument("--where", action="append", metavar="속성=값", help="일치 조건(반복 가능)")
+    parser.add_argument("--filter", metavar="JSON", help="노션 filter 객체(JSON)를 그대로 사용")
+    parser.add_argument("--set", action="append", metavar="속성=값", help="바꿀 값(반복 가능)")
+    parser.add_argument("--archive", action="store_true", help="조건에 맞는 행을 보관(삭제)")
+    parser.add_argument("--dry-run", action="store_true", help="대상 수만 세고 변경하지 않음")
+    parser.add_argument("--parent", default=PARENT_PAGE_ID, help="제목으로 찾을 때의 부모 페이지 ID")
+    parser.add_argument("--report", metavar="FILE", help="실패 목록을 JSON 파일로 저장")
+    args = parser.parse_args(argv)
+
+    db_id = _resolve_database(args.database, args.parent)
+    schema = retrieve_database(db_id)["properties"]
+    if args.filter:
+        filter = json.loads(args.filter)
+    else:
+        filter = where_filter(schema, _pairs(args.where))
+    properties = encode_patch(schema, _pairs(args.set)) if args.set else None
+    result = bulk_update(
+        db_id, filter=filter, properties=properties, archive=args.archive, dry_run=args.dry_run
+    )
+    print(
+        f"대상 {result['matched']}건, 성공 {result['updated']}건, 실패 {len(result['failed'])}건"
+    )
+    for failure in result["failed"]:
+        print(f"- {failure['page_id']}: {failure['error']}")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as fh:
+            json.dump(result, fh, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
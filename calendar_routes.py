@@ -0,0 +1,128 @@
+"""Routing of Notion databases onto Google Calendars.
+
+A :class:`CalendarRoute` names the title, date and description properties
+of one template and the calendar its rows are written to. The defaults
+cover every template with dates; ``CALENDAR_ROUTES_FILE`` may override them
+with a JSON list such as::
+
+    [{"template": "휴가 기록서", "title": "제목", "start": "휴가시작",
+      "end": "휴가종료", "calendar_id": "leave@group.calendar.google.com"}]
+
+When ``start`` and ``end`` name the same property its date range is used.
+"""
+import json
+import os
+from typing import Dict, List, Optional
+from config import CALENDAR_ROUTES_FILE, GOOGLE_CALENDAR_ID
+from logging_utils import get_logger
+from page_decoder import Column, PageDecoder
+
+log = get_logger(__name__)
+
+
+class CalendarRoute:
+    """Property mapping of one template onto a calendar."""
+
+    def __init__(
+        self,
+        template: str,
+        *,
+        title: str = "제목",
+        start: str,
+        end: Optional[str] = None,
+        description: Optional[str] = None,
+        calendar_id: str = GOOGLE_CALENDAR_ID,
+    ) -> None:
+        self.template = template
+        self.title = title
+        self.start = start
+        self.end = end or start
+        self.description = description
+        self.calendar_id = calendar_id
+        end_kind = "date_end" if self.end == self.start else "date"
+        columns = [
+            Column("id", "page_id", name="page_id"),
+            Column(title, "title", name="summary"),
+            Column(start, "date", name="start"),
+            Column(self.end, end_kind, name="end"),
+        ]
+        if description:
+            columns.append(Column(description, "rich_text", "", name="description"))
+        self._decoder = PageDecoder(columns)
+
+    def __repr__(self) -> str:
+        return f"CalendarRoute({self.template!r} -> {self.calendar_id!r})"
+
+    def row(self, page: Dict) -> Optional[Dict[str, str]]:
+        """Return the event fields of a page or ``None`` without a start date."""
+        row = self._decoder.decode(page)
+        if not row["start"]:
+            return None
+        row["summary"] = row["summary"] or "Untitled"
+        row["end"] = row["end"] or row["start"]
+        row.setdefault("description", "")
+        return row
+
+    def to_properties(self, fields: Dict[str, str], current: Dict[str, str]) -> Dict[str, Dict]:
+        """Build Notion property values for changed event ``fields``.
+
+        ``current`` supplies the unchanged start/end when only one side of a
+        date range property changed.
+        """
+        props: Dict[str, Dict] = {}
+        if "summary" in fields:
+            props[self.title] = {"title": [{"text": {"content": fields["summary"]}}]}
+        if "description" in fields and self.description:
+            value = fields["description"]
+            props[self.description] = {"rich_text": [{"text": {"content": value}}] if value else []}
+        if "start" not in fields and "end" not in fields:
+            return props
+        start = fields.get("start", current.get("start"))
+        end = fields.get("end", current.get("end"))
+        if self.end == self.start:
+            props[self.start] = {
+                "date": {"start": start, "end": end if end and end != start else None}
+                if start
+                else None
+            }
+        else:
+            if "start" in fields:
+                props[self.start] = {"date": {"start": start} if start else None}
+            if "end" in fields:
+                props[self.end] = {"date": {"start": end} if end else None}
+        return props
+
+
+DEFAULT_ROUTES: List[CalendarRoute] = [
+    CalendarRoute("회사 일정 캘린더", start="시작일", end="종료일", description="설명"),
+    CalendarRoute("출장 요청서", start="출장기간", description="출장목적"),
+    CalendarRoute("휴가 기록서", start="휴가시작", end="휴가종료"),
+    CalendarRoute("교육 수강 신청서", start="교육일", description="교육명"),
+]
+
+
+def load_routes(path: Optional[str] = CALENDAR_ROUTES_FILE) -> List[CalendarRoute]:
+    """Return the routes of ``path`` or :data:`DEFAULT_ROUTES` without it."""
+    if not path or not os.path.exists(path):
+        return list(DEFAULT_ROUTES)
+    with open(path, encoding="utf-8") as fh:
+        entries = json.load(fh)
+    routes = []
+    for entry in entries:
+        entry = dict(entry)
+        if "template" not in entry or "start" not in entry:
+            raise ValueError(f"캘린더 라우트에 template/start 가 필요합니다: {entry}")
+        routes.append(CalendarRoute(entry.pop("template"), **entry))
+    log.debug("캘린더 라우트 %d개 로드: %s", len(routes), path)
+    return routes
+
+
+ROUTES = load_routes()
+
+
+def route_for(template: str, routes: Optional[List[CalendarRoute]] = None) -> Optional[CalendarRoute]:
+    """Return the route of a template title, if any."""
+    for route in ROUTES if routes is None else routes:
+        if route.template == template:
+            return route
+    return None
@@ -1,44 +1,263 @@
 """Helpers to sync Notion calendar databases with Google Calendar."""
+import asyncio
+from typing import Dict, List, Optional
+from circuit_breaker import get_breaker
+from concurrency import limiter_for, map_limited
+from config import GOOGLE_CALENDAR_ID
 from logging_utils import get_logger
 from notion_db_utils import notion
-from google_calendar_utils import create_event
+from calendar_routes import CalendarRoute, ROUTES, route_for
+from google_calendar_utils import (
+    CalendarIndex,
+    HASH_KEY,
+    NOTION_PAGE_KEY,
+    TEMPLATE_KEY,
+    SyncTokenExpired,
+    create_event,
+    event_fields,
+    event_hash,
+    list_changes,
+    update_event,
+)
+from priority import priority
+from state_store import StateStore
 
 log = get_logger(__name__)
 
+# StateStore namespaces used by the two sync directions
+TOKENS_NS = "calendar_sync_tokens"
+SNAPSHOTS_NS = "calendar_snapshots"
 
-def _get_plain_text(prop: dict) -> str:
-    """Extract plain text from a Notion rich text or title property."""
-    texts = []
-    for t in prop.get("rich_text") or prop.get("title") or []:
-        if "plain_text" in t:
-            texts.append(t["plain_text"])
-        elif t.get("text"):
-            texts.append(t["text"].get("content", ""))
-    return "".join(texts)
+DEFAULT_TEMPLATE = "회사 일정 캘린더"
+_EMPTY = {"insert": 0, "patch": 0, "skip": 0}
 
 
-def sync_notion_calendar(db_id: str) -> None:
-    """Create calendar events for all rows in the given Notion database."""
-    if not notion:
+def _default_route() -> CalendarRoute:
+    return route_for(DEFAULT_TEMPLATE) or CalendarRoute(
+        DEFAULT_TEMPLATE, start="시작일", end="종료일", description="설명"
+    )
+
+
+def sync_pages_to_calendar(
+    pages: List[Dict],
+    state: Optional[StateStore] = None,
+    *,
+    route: Optional[CalendarRoute] = None,
+) -> Dict[str, int]:
+    """Insert, patch or skip calendar events for already fetched pages.
+
+    The events of the covered date window are indexed with one
+    ``events.list`` call and each row is then compared with the event linked
+    to its page id. The window also spans the dates last synced for these
+    pages (from ``state``), so a page whose date moved still finds its
+    event. Rows that remain unmatched although they may be linked (they have
+    a snapshot, or there is no ``state`` to tell) are looked up once more
+    across the whole route before anything is inserted. When a ``state``
+    store is given the written content is
+    remembered so that :func:`sync_google_to_notion` can send minimal updates
+    back. Inserts and patches run concurrently under the adaptive Google
+    Calendar limit. ``route`` selects the template properties and target
+    calendar (the 회사 일정 캘린더 route by default). Returns the number of
+    rows per action.
+    """
+    route = route or _default_route()
+    counts = dict(_EMPTY)
+    rows = [row for row in (route.row(page) for page in pages) if row]
+    if not rows:
+        return counts
+
+    index = CalendarIndex(route.calendar_id)
+    snapshots = {}
+    if state is not None:
+        for row in rows:
+            snapshot = row["page_id"] and state.get(SNAPSHOTS_NS, row["page_id"])
+            if snapshot and snapshot.get("start"):
+                snapshots[row["page_id"]] = snapshot
+    dated = rows + list(snapshots.values())
+    window_start = min(r["start"] for r in dated)
+    window_end = max(r.get("end") or r["start"] for r in dated)
+    if not index.load(window_start, window_end):
+        log.error("캘린더 인덱스 로드 실패로 동기화를 중단합니다")
+        return counts
+    missing = [r["page_id"] for r in rows if r["page_id"] and r["page_id"] not in index.events]
+    if missing and (state is None or any(p in snapshots for p in missing)):
+        if not index.load_linked(route.template):
+            log.error("캘린더 인덱스 로드 실패로 동기화를 중단합니다")
+            return counts
+
+    plans = []
+    for row in rows:
+        page_id = row.pop("page_id")
+        action, event_id, changes = index.plan(page_id, **row)
+        plans.append((page_id, row, action, event_id, changes))
+        counts[action] += 1
+
+    def _write(plan) -> Optional[str]:
+        page_id, row, action, event_id, changes = plan
+        if action == "insert":
+            return create_event(
+                row["summary"], row["start"], row["end"], row["description"],
+                page_id=page_id,
+                template=route.template,
+                calendar_id=route.calendar_id,
+            )
+        update_event(
+            event_id,
+            private={HASH_KEY: event_hash(row)},
+            calendar_id=route.calendar_id,
+            **changes,
+        )
+        return event_id
+
+    writes = [plan for plan in plans if plan[2] != "skip"]
+    written = map_limited(limiter_for("google_calendar"), _write, writes)
+    for (page_id, row, _, _, changes), event_id in zip(writes, written):
+        if page_id:
+            index.record(page_id, event_id, changes)
+    if state is not None:
+        for page_id, row, *_ in plans:
+            if page_id:
+                state.set(SNAPSHOTS_NS, page_id, row)
+    if state is not None:
+        state.save()
+    log.info(
+        "캘린더 동기화 완료(%s): 생성 %d, 수정 %d, 유지 %d",
+        route.template, counts["insert"], counts["patch"], counts["skip"],
+    )
+    return counts
+
+
+def sync_notion_calendar(
+    db_id: str,
+    state: Optional[StateStore] = None,
+    *,
+    route: Optional[CalendarRoute] = None,
+    client=None,
+) -> Dict[str, int]:
+    """Create or update calendar events for all rows in the given database.
+
+    All pages are read first and then handed to :func:`sync_pages_to_calendar`,
+    so reruns cost one ``events.list`` call instead of one insert per row.
+    Notion reads run as ``sync`` priority work.
+    """
+    api = client or notion
+    if not api:
         log.debug("노션 클라이언트 미설정")
-        return
+        return dict(_EMPTY)
     cursor = None
     try:
-        while True:
-            if cursor:
-                data = notion.databases.query(db_id, start_cursor=cursor)
-            else:
-                data = notion.databases.query(db_id)
-            for page in data.get("results", []):
-                props = page.get("properties", {})
-                title = _get_plain_text(props.get("제목", {})) or "Untitled"
-                start = props.get("시작일", {}).get("date", {}).get("start")
-                end = props.get("종료일", {}).get("date", {}).get("start", start)
-                desc = _get_plain_text(props.get("설명", {}))
-                if start:
-                    create_event(title, start, end, desc)
-            cursor = data.get("next_cursor")
-            if not cursor:
-                break
+        pages: List[Dict] = []
+        with priority("sync"):
+            while True:
+                if cursor:
+                    data = api.databases.query(db_id, start_cursor=cursor)
+                else:
+                    data = api.databases.query(db_id)
+                pages.extend(data.get("results", []))
+                cursor = data.get("next_cursor")
+                if not cursor:
+                    break
+        return sync_pages_to_calendar(pages, state, route=route)
     except Exception as exc:
         log.error("캘린더 동기화 실패: %s", exc)
+        return dict(_EMPTY)
+
+
+async def sync_all_calendars(
+    db_ids: Dict[str, str],
+    state: Optional[StateStore] = None,
+    *,
+    routes: Optional[List[CalendarRoute]] = None,
+    client=None,
+) -> Dict[str, Dict[str, int]]:
+    """Sync every routed database in ``db_ids`` (``{template: id}``) at once.
+
+    Routes run concurrently in worker threads. They share the Notion client
+    and its rate limit, the adaptive Google Calendar limit and one state
+    store, which is saved once more after all routes finish.
+    """
+    state = state or StateStore()
+    jobs = [
+        (route, db_ids[route.template])
+        for route in (ROUTES if routes is None else routes)
+        if db_ids.get(route.template)
+    ]
+    results = await asyncio.gather(
+        *(
+            asyncio.to_thread(sync_notion_calendar, db_id, state, route=route, client=client)
+            for route, db_id in jobs
+        )
+    )
+    state.save()
+    return {route.template: counts for (route, _), counts in zip(jobs, results)}
+
+
+def sync_google_to_notion(
+    state: Optional[StateStore] = None,
+    calendar_id: str = GOOGLE_CALENDAR_ID,
+    *,
+    routes: Optional[List[CalendarRoute]] = None,
+) -> Dict[str, int]:
+    """Apply Google Calendar edits back to the linked Notion pages.
+
+    Only events changed since the stored ``syncToken`` are fetched. Events
+    whose content still matches the ``notionHash`` written by
+    :func:`sync_notion_calendar` are our own writes and are skipped, which
+    prevents updates from bouncing between both sides. For real edits only the
+    properties that differ from the last synced snapshot are sent with
+    ``pages.update`` and the event hash is refreshed afterwards. The route
+    recorded on the event decides which properties are written; events
+    without one belong to the 회사 일정 캘린더 route.
+    Returns the number of updated, skipped and unlinked events.
+    """
+    counts = {"update": 0, "skip": 0, "unlinked": 0}
+    if not notion:
+        log.debug("노션 클라이언트 미설정")
+        return counts
+    state = state or StateStore()
+    token = state.get(TOKENS_NS, calendar_id)
+    try:
+        try:
+            events, next_token = list_changes(token, calendar_id=calendar_id)
+        except SyncTokenExpired:
+            log.warning("syncToken 만료로 전체 목록을 다시 불러옵니다: %s", calendar_id)
+            events, next_token = list_changes(None, calendar_id=calendar_id)
+
+        for event in events:
+            private = event.get("extendedProperties", {}).get("private", {})
+            page_id = private.get(NOTION_PAGE_KEY)
+            if not page_id or event.get("status") == "cancelled":
+                counts["unlinked"] += 1
+                continue
+            fields = event_fields(event)
+            digest = event_hash(fields)
+            if digest == private.get(HASH_KEY):
+                counts["skip"] += 1
+                continue
+            route = route_for(private.get(TEMPLATE_KEY) or DEFAULT_TEMPLATE, routes)
+            route = route or _default_route()
+            snapshot = state.get(SNAPSHOTS_NS, page_id) or {}
+            changed = {k: v for k, v in fields.items() if snapshot.get(k) != v}
+            properties = route.to_properties(changed, fields) if changed else {}
+            if properties:
+                with priority("sync"):
+                    get_breaker("notion").call(
+                        notion.pages.update, page_id, properties=properties
+                    )
+                log.info("노션 페이지 역동기화: %s (%s)", page_id, ", ".join(changed))
+                counts["update"] += 1
+            else:
+                counts["skip"] += 1
+            state.set(SNAPSHOTS_NS, page_id, fields)
+            update_event(event["id"], private={HASH_KEY: digest}, calendar_id=calendar_id)
+
+        if next_token:
+            state.set(TOKENS_NS, calendar_id, next_token)
+        state.save()
+        log.info(
+            "역방향 동기화 완료: 수정 %d, 유지 %d, 미연결 %d",
+            counts["update"], counts["skip"], counts["unlinked"],
+        )
+    except Exception as exc:
+        log.error("역방향 캘린더 동기화 실패: %s", exc)
+    return counts
@@ -0,0 +1,177 @@
+"""Per-service circuit breakers for the external integrations."""
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict
+from config import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_SECONDS,
+    BREAKER_SLOW_CALL_SECONDS,
+)
+from logging_utils import get_logger
+from retry import error_status
+
+log = get_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a service whose breaker is open."""
+
+
+def _answered(exc: BaseException) -> bool:
+    """Return ``True`` for client errors, which the service did answer."""
+    status = error_status(exc)
+    return status is not None and 400 <= status < 500
+
+
+class CircuitBreaker:
+    """Fail fast after repeated failures or slow calls of one service.
+
+    ``failure_threshold`` consecutive failures or calls slower than
+    ``slow_call_seconds`` open the breaker. While open every call raises
+    :class:`CircuitOpenError` immediately. After ``reset_seconds`` a single
+    probe call is let through (half-open); its outcome closes or reopens the
+    breaker. Client errors (4xx, including 429) show that the service is
+    answering and count as successes; a cancelled call counts as neither and
+    only frees the probe.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        slow_call_seconds: float = BREAKER_SLOW_CALL_SECONDS,
+        reset_seconds: float = BREAKER_RESET_SECONDS,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self.trips = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return ``True`` when a call may be attempted now."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record(self, ok: bool, elapsed: float = 0.0) -> None:
+        """Record the outcome of a call that :meth:`allow` let through."""
+        slow = elapsed >= self.slow_call_seconds
+        with self._lock:
+            self._probing = False
+            if ok and not slow:
+                if self.state != CLOSED:
+                    log.info("%s 서킷 복구", self.name)
+                self.state = CLOSED
+                self.failures = 0
+                return
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.trips += 1
+                    log.warning(
+                        "%s 서킷 열림 (연속 실패/지연 %d회)", self.name, self.failures
+                    )
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Forget a call that :meth:`allow` let through without an outcome."""
+        with self._lock:
+            self._probing = False
+
+    def _finish(self, outcome, started: float) -> None:
+        if outcome is None:
+            self.release()
+        else:
+            self.record(outcome, time.monotonic() - started)
+
+    def _reject(self) -> CircuitOpenError:
+        return CircuitOpenError(f"{self.name} 서킷이 열려 있어 호출을 건너뜁니다")
+
+    def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call ``fn`` through the breaker."""
+        if not self.allow():
+            raise self._reject()
+        started = time.monotonic()
+        outcome = None
+        try:
+            result = fn(*args, **kwargs)
+            outcome = True
+            return result
+        except Exception as exc:
+            outcome = _answered(exc)
+            raise
+        finally:
+            self._finish(outcome, started)
+
+    async def call_async(self, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Await ``fn`` through the breaker."""
+        if not self.allow():
+            raise self._reject()
+        started = time.monotonic()
+        outcome = None
+        try:
+            result = await fn(*args, **kwargs)
+            outcome = True
+            return result
+        except Exception as exc:
+            outcome = _answered(exc)
+            raise
+        finally:
+            self._finish(outcome, started)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the breaker state for reporting."""
+        with self._lock:
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "trips": self.trips,
+                "rejected": self.rejected,
+            }
+
+
+BREAKERS: Dict[str, CircuitBreaker] = {
+    name: CircuitBreaker(name) for name in ("notion", "google_calendar", "slack")
+}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Return the shared breaker of a service, creating it on first use."""
+    if name not in BREAKERS:
+        BREAKERS[name] = CircuitBreaker(name)
+    return BREAKERS[name]
+
+
+def breaker_summary() -> str:
+    """Return one line per breaker for the run summary."""
+    lines = []
+    for name, breaker in BREAKERS.items():
+        snap = breaker.snapshot()
+        lines.append(
+            f"{name}: {snap['state']} (열림 {snap['trips']}회, 차단 {snap['rejected']}건)"
+        )
+    return "\n".join(lines)
+
+# Example usage:
+# get_breaker("slack").call(webhook_client.send, text="hello")
@@ -0,0 +1,193 @@
+"""Adaptive (AIMD) concurrency control for outbound API calls."""
+import asyncio
+import contextvars
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List
+from config import (
+    AIMD_INITIAL_LIMIT,
+    AIMD_LATENCY_THRESHOLD,
+    AIMD_MAX_LIMIT,
+)
+from deadlines import check_deadline
+from logging_utils import get_logger
+from metrics import metrics
+from retry import error_status
+
+log = get_logger(__name__)
+
+
+class AIMDLimiter:
+    """Limit in-flight calls and adapt the limit to observed health.
+
+    Each healthy response raises the limit by ``increase / limit`` (about one
+    per round of calls). A 429 or a latency spike multiplies it by
+    ``decrease``. Calls that started before the last cut do not cut again,
+    so one burst of throttled responses only halves the limit once.
+    The current limit is published as the ``<name>.concurrency_limit`` gauge.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        initial: float = AIMD_INITIAL_LIMIT,
+        min_limit: float = 1,
+        max_limit: float = AIMD_MAX_LIMIT,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_threshold: float = AIMD_LATENCY_THRESHOLD,
+    ) -> None:
+        self.name = name
+        self.limit = float(initial)
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max_limit)
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_threshold = latency_threshold
+        self.in_flight = 0
+        self._avg_latency = 0.0
+        self._last_cut = 0.0
+        self._cond = threading.Condition()
+        metrics.gauge(f"{name}.concurrency_limit", self.limit)
+
+    def acquire(self) -> float:
+        """Block until a slot is free and return the call start time."""
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+            return time.monotonic()
+
+    def _is_spike(self, latency: float) -> bool:
+        if latency >= self.latency_threshold:
+            return True
+        return self._avg_latency > 0 and latency > 3 * self._avg_latency and latency > 0.5
+
+    def release(self, started: float, *, throttled: bool = False) -> None:
+        """Free a slot and adapt the limit from the call outcome."""
+        latency = time.monotonic() - started
+        with self._cond:
+            self.in_flight -= 1
+            if throttled or self._is_spike(latency):
+                if started >= self._last_cut:
+                    self.limit = max(self.min_limit, self.limit * self.decrease)
+                    self._last_cut = time.monotonic()
+                    metrics.incr(f"{self.name}.concurrency_cuts")
+                    log.debug("%s 동시성 축소: %.2f", self.name, self.limit)
+            else:
+                self.limit = min(self.max_limit, self.limit + self.increase / self.limit)
+            self._avg_latency = latency if not self._avg_latency else (
+                0.8 * self._avg_latency + 0.2 * latency
+            )
+            metrics.gauge(f"{self.name}.concurrency_limit", self.limit)
+            self._cond.notify_all()
+
+    def abandon(self) -> None:
+        """Free a slot that was acquired but never used, without adapting."""
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def run_acquired(self, started: float, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run ``fn`` in a slot taken with :meth:`acquire`."""
+        throttled = False
+        try:
+            return fn(*args, **kwargs)
+        except Exception as exc:
+            throttled = error_status(exc) == 429
+            raise
+        finally:
+            self.release(started, throttled=throttled)
+
+    def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Acquire a slot, run ``fn`` and release the slot."""
+        return self.run_acquired(self.acquire(), fn, *args, **kwargs)
+
+
+def map_limited(limiter: AIMDLimiter, fn: Callable[[Any], Any], items: Iterable) -> List[Any]:
+    """Apply ``fn`` to ``items`` in threads under ``limiter``; keeps order.
+
+    Slots are taken by the caller before each submit, so calls start in
+    input order and the first exception is re-raised after all calls end.
+    Workers run in a copy of the caller's context (phase, deadline) and no
+    call is started once the active deadline has passed.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, int(limiter.max_limit))) as pool:
+        futures = []
+        for item in items:
+            check_deadline(f"{limiter.name} 호출")
+            started = limiter.acquire()
+            ctx = contextvars.copy_context()
+            futures.append(pool.submit(ctx.run, limiter.run_acquired, started, fn, item))
+    return [f.result() for f in futures]
+
+
+async def _acquire_async(limiter: AIMDLimiter) -> float:
+    """Wait for a slot in a thread; a slot granted after cancellation is freed."""
+    pending = asyncio.ensure_future(asyncio.to_thread(limiter.acquire))
+    try:
+        return await asyncio.shield(pending)
+    except asyncio.CancelledError:
+
+        def _give_back(fut: asyncio.Future) -> None:
+            if not fut.cancelled() and fut.exception() is None:
+                limiter.abandon()
+
+        pending.add_done_callback(_give_back)
+        raise
+
+
+async def gather_limited(
+    limiter: AIMDLimiter, fn: Callable[[Any], Any], items: Iterable
+) -> List[Any]:
+    """Async variant of :func:`map_limited` for use inside coroutines.
+
+    If starting the calls stops early (the deadline passed or the caller was
+    cancelled) the calls already started are waited for, or cancelled, and
+    their outcome collected before the error propagates.
+    """
+    tasks = []
+    try:
+        for item in items:
+            check_deadline(f"{limiter.name} 호출")
+            started = await _acquire_async(limiter)
+            tasks.append(
+                asyncio.ensure_future(asyncio.to_thread(limiter.run_acquired, started, fn, item))
+            )
+    except BaseException as exc:
+        if isinstance(exc, asyncio.CancelledError):
+            for task in tasks:
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    return list(await asyncio.gather(*tasks))
+
+
+_client_limiters: "weakref.WeakKeyDictionary[Any, AIMDLimiter]" = weakref.WeakKeyDictionary()
+_service_limiters: Dict[str, AIMDLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def limiter_for(service: str, client: Any = None) -> AIMDLimiter:
+    """Return the shared limiter of ``service`` or of a specific client.
+
+    Notion throttles per token, so every Notion client gets its own limiter.
+    """
+    with _registry_lock:
+        if client is not None:
+            try:
+                limiter = _client_limiters.get(client)
+                if limiter is None:
+                    limiter = _client_limiters[client] = AIMDLimiter(service)
+                return limiter
+            except TypeError:  # pragma: no cover - client without weakref support
+                pass
+        if service not in _service_limiters:
+            _service_limiters[service] = AIMDLimiter(service)
+        return _service_limiters[service]
+
+# Example usage:
+# results = map_limited(limiter_for("notion", notion), delete_block, block_ids)
@@ -13,19 +13,109 @@ load_dotenv()
 NOTION_TOKEN = os.getenv("NOTION_TOKEN")
 PARENT_PAGE_ID = os.getenv("PARENT_PAGE_ID")
 
+# Requests per second allowed against the Notion API (Notion averages 3)
+NOTION_RATE_LIMIT = float(os.getenv("NOTION_RATE_LIMIT", "3"))
+
+# Multi-tenant provisioning: JSON manifest path and max concurrent tenants
+TENANT_MANIFEST = os.getenv("TENANT_MANIFEST", "tenants.json")
+TENANT_CONCURRENCY = int(os.getenv("TENANT_CONCURRENCY", "4"))
+
 # Slack settings
 SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
 SLACK_CHANNEL = os.getenv("SLACK_CHANNEL", "#general")
 SLACK_WEBHOOK_URL = os.getenv("SLACK_WEBHOOK_URL")
 SLACK_ERROR_WEBHOOK_URL = os.getenv("SLACK_ERROR_WEBHOOK_URL")
+# Minimum level per logger forwarded by SlackLogHandler ("name=LEVEL,...").
+# Loggers without a route use SLACK_LOG_LEVEL.
+SLACK_LOG_LEVEL = os.getenv("SLACK_LOG_LEVEL", "INFO")
+SLACK_LOG_ROUTES = os.getenv(
+    "SLACK_LOG_ROUTES",
+    "googleapiclient=WARNING,google=WARNING,httpx=WARNING,httpcore=WARNING,"
+    "urllib3=WARNING,notion_client=WARNING,slack_sdk=WARNING",
+)
+# Identical records within this many seconds are collapsed into one post
+SLACK_LOG_DEDUP_WINDOW = float(os.getenv("SLACK_LOG_DEDUP_WINDOW", "60"))
+# Upper bound of webhook posts per minute
+SLACK_LOG_MAX_PER_MINUTE = int(os.getenv("SLACK_LOG_MAX_PER_MINUTE", "30"))
 
 # Google calendar (optional)
 GOOGLE_CREDENTIALS_FILE = os.getenv("GOOGLE_CREDENTIALS_FILE")
 GOOGLE_CALENDAR_ID = os.getenv("GOOGLE_CALENDAR_ID", "primary")
+# Socket timeout of one Google Calendar request in seconds, further capped by
+# the time left on the active deadline
+GOOGLE_CALL_TIMEOUT = float(os.getenv("GOOGLE_CALL_TIMEOUT", "30"))
+# Optional JSON list mapping templates and their date properties to calendars
+CALENDAR_ROUTES_FILE = os.getenv("CALENDAR_ROUTES_FILE", "calendar_routes.json")
+
+# Local file that keeps sync tokens and snapshots between runs
+SYNC_STATE_FILE = os.getenv("SYNC_STATE_FILE", ".sync_state.json")
+
+# Watch daemon: comma separated database ids and polling bounds in seconds
+WATCH_DATABASE_IDS = [
+    db_id.strip()
+    for db_id in os.getenv("WATCH_DATABASE_IDS", "").split(",")
+    if db_id.strip()
+]
+WATCH_MIN_INTERVAL = float(os.getenv("WATCH_MIN_INTERVAL", "5"))
+WATCH_MAX_INTERVAL = float(os.getenv("WATCH_MAX_INTERVAL", "300"))
+# Share of the Notion budget (requests per second) that polling may use
+WATCH_API_BUDGET = float(os.getenv("WATCH_API_BUDGET", "1"))
+
+# Circuit breakers: failures/slow calls before opening, slow call threshold
+# and seconds before a half-open probe
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_SLOW_CALL_SECONDS = float(os.getenv("BREAKER_SLOW_CALL_SECONDS", "10"))
+BREAKER_RESET_SECONDS = float(os.getenv("BREAKER_RESET_SECONDS", "30"))
+
+# Retries: attempts per call, backoff bounds in seconds and retries allowed
+# per endpoint and run
+RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", "4"))
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "8"))
+RETRY_BUDGET = int(os.getenv("RETRY_BUDGET", "50"))
+
+# Adaptive concurrency (AIMD): starting and maximum in-flight calls and the
+# latency in seconds treated as congestion
+AIMD_INITIAL_LIMIT = float(os.getenv("AIMD_INITIAL_LIMIT", "1"))
+AIMD_MAX_LIMIT = float(os.getenv("AIMD_MAX_LIMIT", "8"))
+AIMD_LATENCY_THRESHOLD = float(os.getenv("AIMD_LATENCY_THRESHOLD", "5"))
+
+# Priority classes: weighted shares of each service budget, seconds a class
+# may be deferred before it is shed (0 = only when a token is free) and the
+# budget of Slack posts per second
+PRIORITY_WEIGHTS = os.getenv("PRIORITY_WEIGHTS", "critical=8,sync=4,notify=2,background=1")
+PRIORITY_MAX_WAIT = os.getenv("PRIORITY_MAX_WAIT", "notify=30,background=0")
+SLACK_RATE_LIMIT = float(os.getenv("SLACK_RATE_LIMIT", "1"))
+
+# Seconds a Notion read (schema, users) is reused before fetching again
+READ_CACHE_TTL = float(os.getenv("READ_CACHE_TTL", "30"))
+
+# Time budget of one run in seconds (0 = unlimited), optional per-phase
+# limits within it ("seed=600,teardown=120") and seconds still granted to the
+# final Slack report after the budget ran out
+RUN_DEADLINE = float(os.getenv("RUN_DEADLINE", "0"))
+PHASE_DEADLINES = os.getenv("PHASE_DEADLINES", "")
+REPORT_GRACE_SECONDS = float(os.getenv("REPORT_GRACE_SECONDS", "10"))
+
+# JSONL file receiving one record per outbound API call (disabled when empty)
+TRACE_FILE = os.getenv("TRACE_FILE") or None
+
+# 지출결의서 database for monthly rollups and the local columnar store file
+EXPENSE_DATABASE_ID = os.getenv("EXPENSE_DATABASE_ID")
+EXPENSE_STORE_FILE = os.getenv("EXPENSE_STORE_FILE", ".expense_store.npz")
+
+# Attachment uploads: parallel files and part size in bytes (files larger than
+# one part use multi-part uploads; Notion accepts 5-20 MB parts)
+UPLOAD_CONCURRENCY = int(os.getenv("UPLOAD_CONCURRENCY", "4"))
+UPLOAD_PART_SIZE = int(os.getenv("UPLOAD_PART_SIZE", str(10 * 1024 * 1024)))
 
 # Optional default user id for people properties
 DEFAULT_USER_ID = os.getenv("DEFAULT_USER_ID")
 
+# Cache of the workspace user list used to resolve people by email/name
+PEOPLE_CACHE_FILE = os.getenv("PEOPLE_CACHE_FILE", ".people_cache.json")
+PEOPLE_CACHE_TTL = float(os.getenv("PEOPLE_CACHE_TTL", "3600"))
+
 # Logging level
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 
@@ -0,0 +1,228 @@
+"""Run-wide time budget, per-phase deadlines and structured cancellation.
+
+A :class:`Deadline` is a point in time plus a cancel flag. Child deadlines
+never outlive their parent, so a phase budget is always drawn from the run
+budget and a call timeout from the phase. The active deadline is a context
+variable: it follows ``asyncio.to_thread`` and the worker threads of
+:func:`concurrency.map_limited` into the code doing the calls, where
+
+* :func:`check_deadline` refuses to start new work once it expired,
+* :func:`call_timeout` bounds the timeout of a single request and
+* :func:`retry.call_with_retry` gives up instead of sleeping past it.
+
+:meth:`RunReport.phase` runs one phase as an :class:`asyncio.TaskGroup`
+under ``asyncio.timeout``. When the phase deadline passes, the group is
+cancelled, the deadline flag stops worker threads at their next call and
+:class:`DeadlineExceeded` is raised after the phase is recorded, so the run
+can end with a report of what completed.
+"""
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+from logging_utils import get_logger
+from profiling import profiler
+
+log = get_logger(__name__)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when work is started or awaited after its deadline."""
+
+
+class Deadline:
+    """Absolute ``time.monotonic`` deadline with cooperative cancellation."""
+
+    def __init__(
+        self,
+        seconds: Optional[float] = None,
+        *,
+        name: str = "run",
+        parent: Optional["Deadline"] = None,
+    ) -> None:
+        self.name = name
+        self.parent = parent
+        self.expires = time.monotonic() + seconds if seconds else float("inf")
+        if parent is not None:
+            self.expires = min(self.expires, parent.expires)
+        self._cancelled = threading.Event()
+
+    def child(self, name: str, seconds: Optional[float] = None) -> "Deadline":
+        """Return a deadline for a part of this one, at most ``seconds`` long."""
+        return Deadline(seconds, name=f"{self.name}/{name}", parent=self)
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set() or (self.parent is not None and self.parent.cancelled)
+
+    def remaining(self) -> float:
+        """Return the seconds left, ``0`` once expired or cancelled."""
+        if self.cancelled:
+            return 0.0
+        return max(0.0, self.expires - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self, what: str = "") -> None:
+        """Raise :class:`DeadlineExceeded` when no time is left."""
+        if self.expired():
+            raise DeadlineExceeded(f"{self.name} 기한 초과{': ' + what if what else ''}")
+
+
+_current: ContextVar[Optional[Deadline]] = ContextVar("deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Return the innermost active deadline, if any."""
+    return _current.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """Make ``deadline`` the active one inside the block."""
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def check_deadline(what: str = "") -> None:
+    """Raise :class:`DeadlineExceeded` if the active deadline has passed."""
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.check(what)
+
+
+def call_timeout(default: Optional[float]) -> Optional[float]:
+    """Return ``default`` capped by the time left on the active deadline."""
+    deadline = _current.get()
+    if deadline is None or deadline.expires == float("inf"):
+        return default
+    remaining = deadline.remaining()
+    return remaining if default is None else min(default, remaining)
+
+
+def parse_phase_budgets(spec: str) -> Dict[str, float]:
+    """Parse ``"seed=600,teardown=120"`` into seconds per phase."""
+    budgets: Dict[str, float] = {}
+    for part in spec.split(","):
+        if "=" in part:
+            name, seconds = part.split("=", 1)
+            budgets[name.strip()] = float(seconds)
+    return budgets
+
+
+def _deadline_only(exc: BaseException) -> bool:
+    if isinstance(exc, (DeadlineExceeded, TimeoutError)):
+        return True
+    if isinstance(exc, BaseExceptionGroup):
+        return all(_deadline_only(e) for e in exc.exceptions)
+    return False
+
+
+class PhaseGroup:
+    """Task group of one phase; blocking calls run in worker threads."""
+
+    def __init__(self, group: asyncio.TaskGroup) -> None:
+        self._group = group
+
+    def spawn(self, coro) -> asyncio.Task:
+        """Run a coroutine as part of the phase."""
+        return self._group.create_task(coro)
+
+    def run(self, fn: Callable[..., Any], *args, **kwargs) -> asyncio.Task:
+        """Run a blocking function in a thread as part of the phase."""
+        return self._group.create_task(asyncio.to_thread(fn, *args, **kwargs))
+
+
+class RunReport:
+    """Run deadline plus a record of the phases and results that completed.
+
+    ``budget`` seconds (``None``/``0`` for unlimited) bound the whole run and
+    ``phase_budgets`` optionally bound single phases within it.
+    """
+
+    def __init__(
+        self,
+        budget: Optional[float] = None,
+        phase_budgets: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self.deadline = Deadline(budget)
+        self.budget = budget
+        self.phase_budgets = phase_budgets or {}
+        self.phases: List[Dict[str, Any]] = []
+        self.results: Dict[str, Dict[str, int]] = {}
+        self.timed_out: Optional[str] = None
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+
+    def add(self, kind: str, name: str, count: int = 1) -> None:
+        """Count ``count`` completed ``kind`` results (e.g. pages) for ``name``."""
+        with self._lock:
+            bucket = self.results.setdefault(kind, {})
+            bucket[name] = bucket.get(name, 0) + count
+
+    @asynccontextmanager
+    async def phase(self, name: str) -> AsyncIterator[PhaseGroup]:
+        """Run the enclosed block as phase ``name`` under its deadline.
+
+        Tasks started through the yielded :class:`PhaseGroup` are awaited
+        when the block ends and cancelled together when one fails or the
+        deadline passes.
+        """
+        deadline = self.deadline.child(name, self.phase_budgets.get(name))
+        entry: Dict[str, Any] = {"phase": name, "status": "running"}
+        self.phases.append(entry)
+        started = time.monotonic()
+        loop = asyncio.get_running_loop()
+        when = None
+        if deadline.expires != float("inf"):
+            when = loop.time() + deadline.remaining()
+        try:
+            with deadline_scope(deadline), profiler.span(name):
+                async with asyncio.timeout_at(when):
+                    async with asyncio.TaskGroup() as group:
+                        yield PhaseGroup(group)
+        except BaseException as exc:
+            deadline.cancel()
+            if _deadline_only(exc):
+                entry["status"] = "deadline"
+                self.timed_out = name
+                log.warning("%s 단계가 기한을 넘겨 중단되었습니다", name)
+                raise DeadlineExceeded(f"{name} 단계 기한 초과") from None
+            entry["status"] = "failed"
+            if isinstance(exc, BaseExceptionGroup) and len(exc.exceptions) == 1:
+                raise exc.exceptions[0] from None
+            raise
+        else:
+            entry["status"] = "done"
+        finally:
+            entry["seconds"] = time.monotonic() - started
+
+    def format(self) -> str:
+        """Render the phases and completed results as text."""
+        elapsed = time.monotonic() - self._started
+        budget = f"{self.budget:.0f}s" if self.budget else "없음"
+        if self.timed_out:
+            head = f"⏱️ 실행 기한 초과로 '{self.timed_out}' 단계에서 중단 ({elapsed:.1f}s / 예산 {budget})"
+        else:
+            head = f"실행 완료 ({elapsed:.1f}s / 예산 {budget})"
+        lines = [head]
+        for entry in self.phases:
+            lines.append(f"- {entry['phase']}: {entry['status']} ({entry.get('seconds', 0):.1f}s)")
+        for kind, counts in self.results.items():
+            done = ", ".join(f"{name} {n}" for name, n in counts.items())
+            lines.append(f"- 완료된 {kind}: {done}")
+        return "\n".join(lines)
+
+# Example usage:
+# report = RunReport(budget=900)
+# async with report.phase("seed") as group:
+#     group.run(create_database, template)
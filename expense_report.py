@@ -0,0 +1,272 @@
+"""Incremental monthly rollups of the 지출결의서 database.
+
+Only pages edited since the previous run are fetched. Their ``금액``,
+``요청월``, ``계정과목`` and ``상태`` values are kept in a local columnar store
+(NumPy arrays, text columns dictionary-encoded as integer codes), so grouped
+totals are computed with vectorised operations instead of per-row Python
+loops.
+"""
+import argparse
+import asyncio
+import io
+import os
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    np = None
+from config import EXPENSE_DATABASE_ID, EXPENSE_STORE_FILE
+from logging_utils import get_logger
+from priority import priority
+from notion_db_utils import notion
+from page_decoder import Column, PageDecoder
+from slack_utils import send_message
+from state_store import StateStore
+
+log = get_logger(__name__)
+
+# StateStore namespace holding the last seen edit time per database
+CURSORS_NS = "expense_rollup"
+_TEXT_COLUMNS = ("month", "account", "status")
+_UNKNOWN = "(미지정)"
+_ROW_DECODER = PageDecoder(
+    [
+        Column("id", "page_id"),
+        Column("금액", "number", 0),
+        Column("요청월", "select", _UNKNOWN),
+        Column("계정과목", "select", _UNKNOWN),
+        Column("상태", "select", _UNKNOWN),
+    ]
+)
+
+
+def page_to_row(page: Dict) -> Tuple[str, float, str, str, str]:
+    """Return ``(page_id, amount, month, account, status)`` of a page."""
+    page_id, amount, *texts = _ROW_DECODER.row(page)
+    return (page_id, float(amount), *texts)
+
+
+class ExpenseStore:
+    """Columnar copy of the rollup fields keyed by page id.
+
+    ``amount`` is a float array and the text columns hold integer codes into
+    per-column vocabularies. Rows are upserted by page id and the store is
+    saved as a compressed ``.npz`` file.
+    """
+
+    def __init__(self, path: str = EXPENSE_STORE_FILE) -> None:
+        self.path = path
+        self.ids: List[str] = []
+        self.amount = np.zeros(0, dtype=np.float64)
+        self.codes = {col: np.zeros(0, dtype=np.int32) for col in _TEXT_COLUMNS}
+        self.vocab: Dict[str, List[str]] = {col: [] for col in _TEXT_COLUMNS}
+        self._lookup: Dict[str, Dict[str, int]] = {col: {} for col in _TEXT_COLUMNS}
+        self._pos: Dict[str, int] = {}
+        if path and os.path.exists(path):
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _load(self) -> None:
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                ids = data["ids"].tolist()
+                amount = data["amount"]
+                codes = {col: data[col] for col in _TEXT_COLUMNS}
+                vocab = {col: data[f"{col}_vocab"].tolist() for col in _TEXT_COLUMNS}
+        except (OSError, KeyError, ValueError) as exc:
+            log.warning("지출 저장소를 읽지 못해 새로 시작합니다 %s: %s", self.path, exc)
+            return
+        self.ids, self.amount, self.codes, self.vocab = ids, amount, codes, vocab
+        self._pos = {page_id: i for i, page_id in enumerate(ids)}
+        for col in _TEXT_COLUMNS:
+            self._lookup[col] = {v: i for i, v in enumerate(vocab[col])}
+
+    def _code(self, col: str, value: str) -> int:
+        lookup = self._lookup[col]
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(self.vocab[col])
+            self.vocab[col].append(value)
+        return code
+
+    def upsert(self, rows: Iterable[Tuple[str, float, str, str, str]]) -> int:
+        """Insert or overwrite rows and return the number of new rows."""
+        new_ids: List[str] = []
+        new_amount: List[float] = []
+        new_codes: Dict[str, List[int]] = {col: [] for col in _TEXT_COLUMNS}
+        for page_id, amount, *texts in rows:
+            codes = [self._code(col, v) for col, v in zip(_TEXT_COLUMNS, texts)]
+            pos = self._pos.get(page_id)
+            if pos is None:
+                self._pos[page_id] = len(self.ids) + len(new_ids)
+                new_ids.append(page_id)
+                new_amount.append(amount)
+                for col, code in zip(_TEXT_COLUMNS, codes):
+                    new_codes[col].append(code)
+            else:
+                self.amount[pos] = amount
+                for col, code in zip(_TEXT_COLUMNS, codes):
+                    self.codes[col][pos] = code
+        if new_ids:
+            self.ids.extend(new_ids)
+            self.amount = np.concatenate([self.amount, np.asarray(new_amount, dtype=np.float64)])
+            for col in _TEXT_COLUMNS:
+                self.codes[col] = np.concatenate(
+                    [self.codes[col], np.asarray(new_codes[col], dtype=np.int32)]
+                )
+        return len(new_ids)
+
+    def aggregate(self) -> List[Dict]:
+        """Return totals and counts grouped by month, account and status."""
+        if not self.ids:
+            return []
+        sizes = [max(len(self.vocab[col]), 1) for col in _TEXT_COLUMNS]
+        key = self.codes["month"].astype(np.int64)
+        key = key * sizes[1] + self.codes["account"]
+        key = key * sizes[2] + self.codes["status"]
+        groups, inverse = np.unique(key, return_inverse=True)
+        totals = np.bincount(inverse, weights=self.amount)
+        counts = np.bincount(inverse)
+        result = []
+        for group, total, count in zip(groups.tolist(), totals.tolist(), counts.tolist()):
+            group, status = divmod(group, sizes[2])
+            month, account = divmod(group, sizes[1])
+            result.append(
+                {
+                    "month": self.vocab["month"][month],
+                    "account": self.vocab["account"][account],
+                    "status": self.vocab["status"][status],
+                    "total": total,
+                    "count": count,
+                }
+            )
+        result.sort(key=lambda r: (r["month"], r["account"], r["status"]))
+        return result
+
+    def save(self) -> None:
+        """Write the store to disk atomically."""
+        if not self.path:
+            return
+        buf = io.BytesIO()
+        arrays = {
+            "ids": np.asarray(self.ids, dtype=str),
+            "amount": self.amount,
+        }
+        for col in _TEXT_COLUMNS:
+            arrays[col] = self.codes[col]
+            arrays[f"{col}_vocab"] = np.asarray(self.vocab[col], dtype=str)
+        np.savez_compressed(buf, **arrays)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as fh:
+            fh.write(buf.getvalue())
+        os.replace(tmp_path, self.path)
+
+
+def fetch_changed_pages(client, db_id: str, since: Optional[str]) -> Iterable[Dict]:
+    """Yield pages edited at or after ``since`` (every page without it)."""
+    query: Dict = {"page_size": 100}
+    if since:
+        query["filter"] = {
+            "timestamp": "last_edited_time",
+            "last_edited_time": {"on_or_after": since},
+        }
+    cursor = None
+    while True:
+        if cursor:
+            data = client.databases.query(db_id, start_cursor=cursor, **query)
+        else:
+            data = client.databases.query(db_id, **query)
+        yield from data.get("results", [])
+        cursor = data.get("next_cursor")
+        if not cursor:
+            return
+
+
+def format_rollup(rows: List[Dict]) -> str:
+    """Render grouped totals as a Slack message, one block per month."""
+    if not rows:
+        return "📊 지출결의서 집계: 데이터 없음"
+    lines = ["📊 지출결의서 월별 집계"]
+    month = None
+    month_total = 0.0
+    for row in rows + [None]:
+        if row is None or row["month"] != month:
+            if month is not None:
+                lines.append(f"  합계 {month_total:,.0f}원")
+            if row is None:
+                break
+            month, month_total = row["month"], 0.0
+            lines.append(f"*{month}*")
+        month_total += row["total"]
+        lines.append(
+            f"  {row['account']} / {row['status']}: {row['total']:,.0f}원 ({row['count']}건)"
+        )
+    return "\n".join(lines)
+
+
+async def report_expenses(
+    db_id: Optional[str] = EXPENSE_DATABASE_ID,
+    *,
+    client=None,
+    state: Optional[StateStore] = None,
+    store_path: str = EXPENSE_STORE_FILE,
+    notify: bool = True,
+) -> List[Dict]:
+    """Refresh the local store with changed pages and post the rollup.
+
+    The edit time of the newest fetched page is kept in ``state`` so the
+    next run only reads pages edited since then. Pages removed from the
+    database stay in the store until it is deleted and rebuilt.
+    """
+    api = client or notion
+    if np is None:
+        log.error("numpy 미설치로 지출 집계를 건너뜁니다")
+        return []
+    if not api or not db_id:
+        log.debug("노션 클라이언트 또는 EXPENSE_DATABASE_ID 미설정")
+        return []
+    state = state or StateStore()
+    store = ExpenseStore(store_path)
+    since = state.get(CURSORS_NS, db_id) if len(store) else None
+    started = datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+    def _refresh() -> int:
+        latest = since
+        fetched = 0
+        batch = []
+        for page in fetch_changed_pages(api, db_id, since):
+            batch.append(page_to_row(page))
+            edited = page.get("last_edited_time")
+            if edited and (latest is None or edited > latest):
+                latest = edited
+            if len(batch) >= 1000:
+                store.upsert(batch)
+                fetched += len(batch)
+                batch.clear()
+        store.upsert(batch)
+        store.save()
+        state.set(CURSORS_NS, db_id, latest or started)
+        state.save()
+        return fetched + len(batch)
+
+    with priority("sync"):
+        fetched = await asyncio.to_thread(_refresh)
+    rows = store.aggregate()
+    log.info("지출 집계 갱신: 변경 %d건, 전체 %d건", fetched, len(store))
+    if notify:
+        await send_message(format_rollup(rows))
+    return rows
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="지출결의서 월별 집계")
+    parser.add_argument("db_id", nargs="?", default=EXPENSE_DATABASE_ID)
+    args = parser.parse_args(argv)
+    asyncio.run(report_expenses(args.db_id))
+
+
+if __name__ == "__main__":
+    main()
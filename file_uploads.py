@@ -0,0 +1,217 @@
+"""Stream local attachments to Notion's file upload API.
+
+Notion only accepts external URLs or ids returned by ``/v1/file_uploads`` in
+``files`` properties. A :class:`FileUploader` turns local paths into such
+ids: files up to ``UPLOAD_PART_SIZE`` are sent in one ``single_part`` upload,
+larger ones as ``multi_part`` uploads of that part size followed by
+``complete``. Files are read one part at a time, identical content is
+uploaded once per client (keyed by its SHA-256) and uploads run in threads
+bounded by ``UPLOAD_CONCURRENCY``.
+
+In items a local attachment is a path string (anything that is not an
+``http(s)`` URL) or ``{"path": ..., "name": ...}``. :func:`encode_files`
+turns those into placeholders carrying the content hash, so upsert hashes
+change with file content, and :meth:`FileUploader.resolve` swaps the
+placeholders for ``file_upload`` references right before a page is written.
+"""
+import hashlib
+import mimetypes
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from config import UPLOAD_CONCURRENCY, UPLOAD_PART_SIZE
+from logging_utils import get_logger
+from metrics import metrics
+from read_cache import SingleFlight
+from retry import call_with_retry
+
+log = get_logger(__name__)
+
+# Bytes read per ``update`` while hashing
+_HASH_BLOCK = 1024 * 1024
+
+
+def is_local(entry: Any) -> bool:
+    """Return ``True`` for a path string or ``{"path": ...}`` entry."""
+    if isinstance(entry, dict):
+        return "path" in entry
+    return isinstance(entry, str) and not entry.startswith(("http://", "https://"))
+
+
+def file_digest(path: str) -> str:
+    """Return the SHA-256 of a file, reading it in 1 MiB blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(_HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def encode_files(value: Any) -> List[Dict]:
+    """Return a ``files`` value with local entries as upload placeholders.
+
+    URL strings become external files; file objects are kept as they are.
+    """
+    files = []
+    for entry in value if isinstance(value, list) else [value]:
+        if is_local(entry):
+            path = entry["path"] if isinstance(entry, dict) else entry
+            name = entry.get("name") if isinstance(entry, dict) else None
+            files.append(
+                {
+                    "name": name or os.path.basename(path),
+                    "path": path,
+                    "sha256": file_digest(path),
+                }
+            )
+        elif isinstance(entry, str):
+            files.append({"name": entry, "type": "external", "external": {"url": entry}})
+        else:
+            files.append(entry)
+    return files
+
+
+def _parts(path: str, part_size: int) -> Iterator[bytes]:
+    """Yield the file in ``part_size`` chunks without reading it whole."""
+    with open(path, "rb") as fh:
+        for part in iter(lambda: fh.read(part_size), b""):
+            yield part
+
+
+class FileUploader:
+    """Upload local files once per content hash through a Notion client."""
+
+    def __init__(
+        self,
+        client,
+        *,
+        part_size: int = UPLOAD_PART_SIZE,
+        max_concurrency: int = UPLOAD_CONCURRENCY,
+    ) -> None:
+        self.client = client
+        self.part_size = part_size
+        self.max_concurrency = max(1, max_concurrency)
+        self.flight = SingleFlight()
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._lock = threading.Lock()
+        self._uploaded: Dict[str, str] = {}
+
+    # -- raw endpoints -------------------------------------------------
+    def _create(self, name: str, content_type: str, parts: int) -> str:
+        body = {"filename": name, "content_type": content_type}
+        if parts > 1:
+            body.update(mode="multi_part", number_of_parts=parts)
+        # An unused upload simply expires, so a blind retry is harmless
+        upload = call_with_retry(
+            "file_uploads.create",
+            self.client.request,
+            path="file_uploads",
+            method="POST",
+            body=body,
+        )
+        return upload["id"]
+
+    def _send_part(
+        self, upload_id: str, name: str, content_type: str, data: bytes, number: Optional[int]
+    ) -> None:
+        def _post() -> Dict:
+            response = self.client.client.post(
+                f"file_uploads/{upload_id}/send",
+                files={"file": (name, data, content_type)},
+                data={"part_number": str(number)} if number else None,
+            )
+            response.raise_for_status()
+            return response.json()
+
+        call_with_retry("file_uploads.send", _post)
+        metrics.incr("file_uploads.bytes", len(data))
+
+    def _complete(self, upload_id: str) -> None:
+        call_with_retry(
+            "file_uploads.complete",
+            self.client.request,
+            path=f"file_uploads/{upload_id}/complete",
+            method="POST",
+            body={},
+        )
+
+    # -- public API ----------------------------------------------------
+    def _upload(self, path: str, name: str) -> str:
+        size = os.path.getsize(path)
+        parts = max(1, -(-size // self.part_size))
+        content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        with self._slots:
+            upload_id = self._create(name, content_type, parts)
+            for number, data in enumerate(_parts(path, self.part_size), start=1):
+                self._send_part(
+                    upload_id, name, content_type, data, number if parts > 1 else None
+                )
+            if parts > 1:
+                self._complete(upload_id)
+        metrics.incr("file_uploads.files")
+        log.debug("파일 업로드 완료: %s (%d bytes, %d parts)", name, size, parts)
+        return upload_id
+
+    def upload(self, path: str, *, name: Optional[str] = None, digest: Optional[str] = None) -> Dict:
+        """Upload ``path`` unless the same content was sent; return a file object."""
+        name = name or os.path.basename(path)
+        digest = digest or file_digest(path)
+        with self._lock:
+            upload_id = self._uploaded.get(digest)
+        if upload_id is None:
+            def _load() -> str:
+                with self._lock:
+                    if digest in self._uploaded:
+                        return self._uploaded[digest]
+                uploaded = self._upload(path, name)
+                with self._lock:
+                    self._uploaded[digest] = uploaded
+                return uploaded
+
+            upload_id = self.flight.do(digest, _load)
+        else:
+            metrics.incr("file_uploads.deduplicated")
+        return {"name": name, "type": "file_upload", "file_upload": {"id": upload_id}}
+
+    def upload_many(self, paths: Iterable[str]) -> List[Dict]:
+        """Upload ``paths`` concurrently and return file objects in order."""
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            return list(pool.map(self.upload, paths))
+
+    def resolve(self, properties: Dict[str, Dict]) -> Dict[str, Dict]:
+        """Return ``properties`` with upload placeholders replaced by file objects."""
+        resolved = properties
+        for key, prop in properties.items():
+            files = prop.get("files") if isinstance(prop, dict) else None
+            if not files or not any("path" in f for f in files):
+                continue
+            if resolved is properties:
+                resolved = dict(properties)
+            resolved[key] = {
+                "files": [
+                    self.upload(f["path"], name=f["name"], digest=f.get("sha256"))
+                    if "path" in f
+                    else f
+                    for f in files
+                ]
+            }
+        return resolved
+
+
+_uploaders: "weakref.WeakKeyDictionary[Any, FileUploader]" = weakref.WeakKeyDictionary()
+_uploaders_lock = threading.Lock()
+
+
+def uploader_for(client: Any) -> FileUploader:
+    """Return the file uploader of a Notion client."""
+    with _uploaders_lock:
+        uploader = _uploaders.get(client)
+        if uploader is None:
+            uploader = _uploaders[client] = FileUploader(client)
+        return uploader
+
+# Example usage:
+# files = uploader_for(notion).upload_many(["receipt1.pdf", "receipt2.pdf"])
+# notion.pages.update(page_id, properties={"첨부파일": {"files": files}})
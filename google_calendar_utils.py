@@ -1,46 +1,230 @@
 """Google Calendar integration helpers."""
+import hashlib
+import json
+import threading
+import uuid
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
 try:
+    import httplib2
+    from google_auth_httplib2 import AuthorizedHttp
     from googleapiclient.discovery import build
+    from googleapiclient.errors import HttpError
     from google.oauth2.service_account import Credentials
 except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    httplib2 = None
+    AuthorizedHttp = None
     build = None
+    HttpError = None
     Credentials = None
-from config import GOOGLE_CREDENTIALS_FILE, GOOGLE_CALENDAR_ID
+from circuit_breaker import CircuitOpenError, get_breaker
+from config import GOOGLE_CALL_TIMEOUT, GOOGLE_CREDENTIALS_FILE, GOOGLE_CALENDAR_ID
+from deadlines import call_timeout
 from logging_utils import get_logger
+from metrics import metrics
+from profiling import profiler
+from retry import call_with_retry
+from tracing import tracer
 
 log = get_logger(__name__)
+_breaker = get_breaker("google_calendar")
 
 SCOPES = ["https://www.googleapis.com/auth/calendar"]
+# 노션 페이지 ID를 저장하는 extendedProperties.private 키
+NOTION_PAGE_KEY = "notionPageId"
+# 노션에서 마지막으로 기록한 내용의 해시. 역방향 동기화의 루프 방지에 사용
+HASH_KEY = "notionHash"
+# 이벤트를 만든 노션 템플릿(캘린더 라우트) 이름
+TEMPLATE_KEY = "notionTemplate"
+# events.list 응답에서 인덱스에 필요한 필드만 요청한다.
+_LIST_FIELDS = (
+    "nextPageToken,"
+    "items(id,summary,description,start,end,extendedProperties/private)"
+)
+_CHANGES_FIELDS = (
+    "nextPageToken,nextSyncToken,"
+    "items(id,status,summary,description,start,end,extendedProperties/private)"
+)
+# insert/patch 응답은 사용하지 않으므로 ID만 돌려받는다.
+_WRITE_FIELDS = "id"
 _service = None
+_credentials = None
+# httplib2 transports are not thread-safe, so each worker thread gets its own
+_transports = threading.local()
 if GOOGLE_CREDENTIALS_FILE and Credentials and build:
     try:
-        creds = Credentials.from_service_account_file(
+        _credentials = Credentials.from_service_account_file(
             GOOGLE_CREDENTIALS_FILE, scopes=SCOPES
         )
-        _service = build("calendar", "v3", credentials=creds)
+        _service = build("calendar", "v3", credentials=_credentials)
     except Exception as exc:  # pragma: no cover - filesystem/network issues
         log.error("구글 캘린더 서비스 초기화 실패: %s", exc)
 else:  # pragma: no cover - optional dependency
     log.debug("GOOGLE_CREDENTIALS_FILE 미설정")
 
 
-def create_event(summary: str, start: str, end: str, description: str = "") -> None:
-    """Create a calendar event using RFC3339 date strings."""
+class SyncTokenExpired(Exception):
+    """Raised when Google rejects a stored ``syncToken`` (HTTP 410)."""
+
+
+def _measure_payload(request, endpoint: str) -> None:
+    """Report request and response body sizes of ``request`` as metrics.
+
+    ``googleapiclient`` already asks for gzip (``Accept-Encoding`` and the
+    ``(gzip)`` user agent suffix); responses that arrived compressed are
+    counted in ``google_calendar.gzip_responses``. Response sizes are the
+    decoded JSON bytes that get parsed.
+    """
+    body = getattr(request, "body", None)
+    if body:
+        metrics.observe(f"google_calendar.{endpoint}.request_bytes", len(body))
+    postproc = getattr(request, "postproc", None)
+    if not callable(postproc):
+        return
+
+    def _postproc(resp, content):
+        metrics.observe(f"google_calendar.{endpoint}.response_bytes", len(content or b""))
+        if hasattr(resp, "get") and resp.get("-content-encoding") == "gzip":
+            metrics.incr("google_calendar.gzip_responses")
+        return postproc(resp, content)
+
+    request.postproc = _postproc
+
+
+def _transport(timeout: Optional[float]):
+    """Return this thread's authorized HTTP transport set to ``timeout``.
+
+    The timeout is applied to the transport and to its open keep-alive
+    connections, so a reused socket does not keep an older, longer limit.
+    """
+    http = getattr(_transports, "http", None)
+    if http is None:
+        http = _transports.http = AuthorizedHttp(_credentials, http=httplib2.Http(timeout=timeout))
+    http.http.timeout = timeout
+    for conn in http.http.connections.values():
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+    return http
+
+
+def _send(request):
+    """Execute ``request`` with a timeout capped by the active deadline."""
+    if _credentials is None or AuthorizedHttp is None:
+        return request.execute()
+    return request.execute(http=_transport(call_timeout(GOOGLE_CALL_TIMEOUT)))
+
+
+def _execute(request, endpoint: str, *, safe: bool = True, recover=None):
+    """Execute an API request with retries, each attempt through the breaker.
+
+    Every attempt gets a socket timeout of ``GOOGLE_CALL_TIMEOUT`` capped by
+    the time left on the active deadline, so a cancelled run does not leave
+    a request blocking its worker thread.
+    """
+    _measure_payload(request, endpoint)
+    with profiler.api_call():
+        return call_with_retry(
+            endpoint,
+            _breaker.call,
+            tracer.wrap("google_calendar", endpoint, _send),
+            request,
+            safe=safe,
+            recover=recover,
+        )
+
+
+def _find_event(calendar_id: str, event_id: str) -> Optional[Dict]:
+    """Return an event by id or ``None`` when it was never created."""
+    try:
+        return _breaker.call(
+            _send, _service.events().get(calendarId=calendar_id, eventId=event_id, fields="id")
+        )
+    except Exception as exc:
+        if getattr(getattr(exc, "resp", None), "status", None) == 404:
+            return None
+        raise
+
+
+def event_hash(fields: Dict[str, str]) -> str:
+    """Return a short content hash of the comparable event fields."""
+    payload = json.dumps(
+        {k: fields.get(k) or "" for k in ("summary", "start", "end", "description")},
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _exclusive_end(end: str) -> str:
+    """Return Google's exclusive all-day ``end.date`` for an inclusive end date."""
+    if len(end) != 10:
+        return end
+    return (date.fromisoformat(end) + timedelta(days=1)).isoformat()
+
+
+def _inclusive_end(end: Dict) -> str:
+    """Return the inclusive end of an event ``end`` (the last all-day date)."""
+    if end.get("date"):
+        return (date.fromisoformat(end["date"]) - timedelta(days=1)).isoformat()
+    return end.get("dateTime", "")
+
+
+def create_event(
+    summary: str,
+    start: str,
+    end: str,
+    description: str = "",
+    *,
+    page_id: Optional[str] = None,
+    template: Optional[str] = None,
+    calendar_id: str = GOOGLE_CALENDAR_ID,
+) -> Optional[str]:
+    """Create a calendar event using RFC3339 date strings.
+
+    ``end`` is the inclusive last day, as in Notion; it is sent as Google's
+    exclusive all-day end date (the following day).
+    ``page_id`` is stored in ``extendedProperties.private`` together with a
+    hash of the written content so that later syncs can find the event again
+    and recognise their own writes; ``template`` records which calendar route
+    the page belongs to. The event id is generated on the client,
+    so a retry after an ambiguous failure can check whether the first insert
+    went through instead of creating a duplicate. Returns the new event id.
+    """
     if not _service:
         log.debug("구글 캘린더 서비스 사용 불가")
-        return
+        return None
     event = {
+        "id": uuid.uuid4().hex,
         "summary": summary,
         "start": {"date": start},
-        "end": {"date": end},
+        "end": {"date": _exclusive_end(end)},
     }
     if description:
         event["description"] = description
+    if page_id:
+        fields = {"summary": summary, "start": start, "end": end, "description": description}
+        private = {NOTION_PAGE_KEY: page_id, HASH_KEY: event_hash(fields)}
+        if template:
+            private[TEMPLATE_KEY] = template
+        event["extendedProperties"] = {"private": private}
     try:
-        _service.events().insert(calendarId=GOOGLE_CALENDAR_ID, body=event).execute()
+        res = _execute(
+            _service.events().insert(
+                calendarId=calendar_id, body=event, fields=_WRITE_FIELDS
+            ),
+            "events.insert",
+            safe=False,
+            recover=lambda: _find_event(calendar_id, event["id"]),
+        )
         log.info("캘린더 이벤트 생성: %s", summary)
+        return (res or {}).get("id")
+    except CircuitOpenError:
+        log.debug("캘린더 서킷 열림으로 생성 건너뜀: %s", summary)
+        return None
     except Exception as exc:  # pragma: no cover - network issues
         log.error("캘린더 이벤트 생성 실패 %s: %s", summary, exc)
+        return None
 
 
 def update_event(
@@ -50,8 +234,15 @@ def update_event(
     start: str | None = None,
     end: str | None = None,
     description: str | None = None,
+    private: Optional[Dict[str, str]] = None,
+    calendar_id: str = GOOGLE_CALENDAR_ID,
 ) -> None:
-    """Update an existing calendar event."""
+    """Patch an existing calendar event with only the given fields.
+
+    ``private`` keys are merged into ``extendedProperties.private``. Nothing
+    is sent when no field is given. ``end`` is inclusive as in
+    :func:`create_event`.
+    """
     if not _service:
         log.debug("구글 캘린더 서비스 사용 불가")
         return
@@ -61,13 +252,215 @@ def update_event(
     if start:
         body.setdefault("start", {})["date"] = start
     if end:
-        body.setdefault("end", {})["date"] = end
+        body.setdefault("end", {})["date"] = _exclusive_end(end)
     if description is not None:
         body["description"] = description
+    if private:
+        body["extendedProperties"] = {"private": private}
+    if not body:
+        return
     try:
-        _service.events().patch(
-            calendarId=GOOGLE_CALENDAR_ID, eventId=event_id, body=body
-        ).execute()
+        _execute(
+            _service.events().patch(
+                calendarId=calendar_id, eventId=event_id, body=body, fields=_WRITE_FIELDS
+            ),
+            "events.patch",
+        )
         log.info("캘린더 이벤트 업데이트: %s", event_id)
+    except CircuitOpenError:
+        log.debug("캘린더 서킷 열림으로 업데이트 건너뜀: %s", event_id)
     except Exception as exc:  # pragma: no cover - network issues
         log.error("캘린더 이벤트 업데이트 실패 %s: %s", event_id, exc)
+
+
+def list_events(
+    time_min: Optional[str],
+    time_max: Optional[str],
+    *,
+    calendar_id: str = GOOGLE_CALENDAR_ID,
+    private: Optional[Dict[str, str]] = None,
+) -> Optional[List[Dict]]:
+    """Return every event between ``time_min`` and ``time_max`` (RFC3339).
+
+    Either bound may be ``None`` for an open range; ``private`` limits the
+    result to events whose ``extendedProperties.private`` hold those values.
+    Only the fields needed for duplicate detection are requested and all
+    result pages are followed. ``None`` is returned when the listing fails so
+    callers can tell an empty calendar from an unknown one.
+    """
+    if not _service:
+        log.debug("구글 캘린더 서비스 사용 불가")
+        return []
+    events: List[Dict] = []
+    token = None
+    try:
+        while True:
+            params = {
+                "calendarId": calendar_id,
+                "singleEvents": True,
+                "maxResults": 2500,
+                "fields": _LIST_FIELDS,
+            }
+            if time_min:
+                params["timeMin"] = time_min
+            if time_max:
+                params["timeMax"] = time_max
+            if private:
+                params["privateExtendedProperty"] = [f"{k}={v}" for k, v in private.items()]
+            if token:
+                params["pageToken"] = token
+            data = _execute(_service.events().list(**params), "events.list")
+            events.extend(data.get("items", []))
+            token = data.get("nextPageToken")
+            if not token:
+                break
+    except Exception as exc:  # pragma: no cover - network issues
+        log.error("캘린더 이벤트 조회 실패: %s", exc)
+        return None
+    return events
+
+
+def list_changes(
+    sync_token: Optional[str] = None, *, calendar_id: str = GOOGLE_CALENDAR_ID
+) -> Tuple[List[Dict], Optional[str]]:
+    """Return events changed since ``sync_token`` and the next sync token.
+
+    Without a token every event is listed, which also yields the first
+    token. Raises :class:`SyncTokenExpired` when the token is no longer
+    valid so the caller can restart with a full listing.
+    """
+    if not _service:
+        log.debug("구글 캘린더 서비스 사용 불가")
+        return [], sync_token
+    events: List[Dict] = []
+    page_token = None
+    try:
+        while True:
+            params = {
+                "calendarId": calendar_id,
+                "maxResults": 2500,
+                "fields": _CHANGES_FIELDS,
+            }
+            if sync_token:
+                params["syncToken"] = sync_token
+            if page_token:
+                params["pageToken"] = page_token
+            data = _execute(_service.events().list(**params), "events.list")
+            events.extend(data.get("items", []))
+            page_token = data.get("nextPageToken")
+            if not page_token:
+                return events, data.get("nextSyncToken")
+    except Exception as exc:
+        if HttpError and isinstance(exc, HttpError) and exc.resp.status == 410:
+            raise SyncTokenExpired(str(exc)) from exc
+        raise
+
+
+def _window_bounds(start: str, end: str) -> Tuple[str, str]:
+    """Convert an inclusive date range into RFC3339 ``timeMin``/``timeMax``."""
+    last = date.fromisoformat(end[:10]) + timedelta(days=1)
+    return f"{start[:10]}T00:00:00Z", f"{last.isoformat()}T00:00:00Z"
+
+
+def event_fields(event: Dict) -> Dict[str, str]:
+    """Return the comparable fields of a calendar event.
+
+    All-day end dates are converted back to the inclusive last day, so the
+    fields compare and hash equal to the Notion row they were written from.
+    """
+    start = event.get("start", {})
+    return {
+        "summary": event.get("summary", ""),
+        "start": start.get("date") or start.get("dateTime", ""),
+        "end": _inclusive_end(event.get("end", {})),
+        "description": event.get("description", ""),
+    }
+
+
+class CalendarIndex:
+    """Events of a date window keyed by the Notion page id they came from.
+
+    The index is loaded with a single paged ``events.list`` call and then
+    answers insert/patch/skip decisions locally, so reruns of a sync do not
+    create duplicate events.
+    """
+
+    def __init__(self, calendar_id: str = GOOGLE_CALENDAR_ID) -> None:
+        self.calendar_id = calendar_id
+        self.events: Dict[str, Dict] = {}
+        self.loaded = False
+
+    def load(self, start: str, end: str) -> bool:
+        """Load events between the ``start`` and ``end`` dates (inclusive)."""
+        time_min, time_max = _window_bounds(start, end)
+        items = list_events(time_min, time_max, calendar_id=self.calendar_id)
+        if items is None:
+            return False
+        self._add(items)
+        self.loaded = True
+        log.debug("캘린더 인덱스 로드: %d건", len(self.events))
+        return True
+
+    def load_linked(self, template: str) -> bool:
+        """Add every event of a calendar route, whatever its date.
+
+        Used when rows may be linked to events outside the loaded window
+        (e.g. a page whose date moved); events already indexed are kept.
+        """
+        items = list_events(
+            None, None, calendar_id=self.calendar_id, private={TEMPLATE_KEY: template}
+        )
+        if items is None:
+            return False
+        self._add(items, replace=False)
+        log.debug("캘린더 라우트 전체 인덱스 로드(%s): %d건", template, len(self.events))
+        return True
+
+    def _add(self, items: List[Dict], *, replace: bool = True) -> None:
+        for event in items:
+            private = event.get("extendedProperties", {}).get("private", {})
+            page_id = private.get(NOTION_PAGE_KEY)
+            if page_id and (replace or page_id not in self.events):
+                self.events[page_id] = event
+
+    def plan(
+        self,
+        page_id: Optional[str],
+        summary: str,
+        start: str,
+        end: str,
+        description: str = "",
+    ) -> Tuple[str, Optional[str], Dict[str, str]]:
+        """Decide how to write a row.
+
+        Returns ``(action, event_id, changes)`` where ``action`` is one of
+        ``"insert"``, ``"patch"`` or ``"skip"`` and ``changes`` holds only the
+        fields that differ from the indexed event.
+        """
+        wanted = {
+            "summary": summary,
+            "start": start,
+            "end": end,
+            "description": description or "",
+        }
+        event = self.events.get(page_id) if page_id else None
+        if not event:
+            return "insert", None, wanted
+        current = event_fields(event)
+        changes = {k: v for k, v in wanted.items() if current.get(k) != v}
+        if not changes:
+            return "skip", event.get("id"), {}
+        return "patch", event.get("id"), changes
+
+    def record(self, page_id: str, event_id: Optional[str], fields: Dict[str, str]) -> None:
+        """Remember a written event so later plans see the new state."""
+        event = self.events.setdefault(page_id, {"id": event_id})
+        if event_id:
+            event["id"] = event_id
+        for key in ("summary", "description"):
+            if key in fields:
+                event[key] = fields[key]
+        if "start" in fields:
+            event["start"] = {"date": fields["start"]}
+        if "end" in fields:
+            event["end"] = {"date": _exclusive_end(fields["end"])}
@@ -1,15 +1,30 @@
 """Entry point that orchestrates the automation flow."""
+import argparse
 import asyncio
 import traceback
 from logging_utils import get_logger
 from slack_utils import send_message, send_error_webhook, SlackLogHandler
+from circuit_breaker import breaker_summary
+from backup import backup_workspace
+from profiling import profiled, profiler
+from deadlines import DeadlineExceeded, RunReport, parse_phase_budgets
+from retry import retry_budget_scope
+from tracing import tracer
 import logging
-from config import LOG_LEVEL
+from config import (
+    LOG_LEVEL,
+    PARENT_PAGE_ID,
+    PHASE_DEADLINES,
+    REPORT_GRACE_SECONDS,
+    RUN_DEADLINE,
+    TENANT_MANIFEST,
+)
 from notion_db_utils import (
     delete_existing_databases,
     create_database,
     create_dummy_data,
     add_relation_columns,
+    find_databases,
     notion,
 )
 from notion_templates import DATABASE_TEMPLATES
@@ -22,7 +37,16 @@ root_logger.addHandler(slack_handler)
 log = get_logger(__name__)
 
 
-async def run() -> None:
+async def run(
+    client=None,
+    parent_page_id=None,
+    *,
+    notify: bool = True,
+    backup_path=None,
+    rows=None,
+    upsert: bool = False,
+    deadline=None,
+) -> dict:
     """Create Notion databases and fill them with sample data.
 
     ``create_database`` automatically verifies that a ``상태`` select column
@@ -31,41 +55,213 @@ async def run() -> None:
     ``ensure_status_column`` 호출 시 다른 기본값을 지정할 수 있습니다. 또한
     "회사 일정 캘린더" 테이블 더미 데이터는 생성과 동시에 구글 캘린더 일정도
     등록됩니다.
+
+    ``client``/``parent_page_id`` select another workspace than the one in
+    ``config``. With ``backup_path`` the existing databases are streamed to a
+    backup file before they are deleted. ``rows`` seeds every database with
+    that many synthetic rows instead of the sample items. With ``upsert`` the
+    existing databases are kept and reused by title and rows are upserted by
+    their natural key, so a rerun on unchanged data writes almost nothing.
+
+    Each phase runs as a task group under a deadline drawn from ``deadline``
+    seconds (``RUN_DEADLINE`` by default) and ``PHASE_DEADLINES``. When time
+    runs out outstanding work is cancelled and the run ends with a report of
+    the phases, databases and pages that completed instead of hanging.
+    Returns the number of databases and pages and the phase that timed out.
     """
-    if not notion:
+    api = client or notion
+    if not api:
         log.warning("노션 클라이언트 미설정으로 생성을 건너뜁니다")
         await send_message("⚠️ 노션 인증 정보 없음")
-        return
-    delete_existing_databases()
+        return {"databases": 0, "pages": 0}
+    parent_page_id = parent_page_id or PARENT_PAGE_ID
+    report = RunReport(
+        RUN_DEADLINE if deadline is None else deadline,
+        parse_phase_budgets(PHASE_DEADLINES),
+    )
     db_ids = {}
-    for tmpl in DATABASE_TEMPLATES:
-        db_id = create_database(tmpl)
-        db_ids[tmpl["template_title"]] = db_id
+    page_ids = {}
+    # Retries are budgeted per run, so a long-lived process keeps its budget
+    with retry_budget_scope():
+        try:
+            async with report.phase("teardown") as group:
+                if backup_path:
+                    await group.run(
+                        backup_workspace, backup_path, parent_page_id, client=api, resume=False
+                    )
+                if upsert:
+                    titles = {tmpl["template_title"] for tmpl in DATABASE_TEMPLATES}
+                    found = await group.run(find_databases, parent_page_id, client=api)
+                    db_ids = {title: db_id for title, db_id in found.items() if title in titles}
+                else:
+                    await group.run(delete_existing_databases, parent_page_id, client=api)
+            async with report.phase("create_databases") as group:
+                for tmpl in DATABASE_TEMPLATES:
+                    if tmpl["template_title"] in db_ids:
+                        continue
+                    db_id = await group.run(
+                        create_database, tmpl, client=api, parent_page_id=parent_page_id
+                    )
+                    db_ids[tmpl["template_title"]] = db_id
+                    report.add("데이터베이스", tmpl["template_title"])
 
-    add_relation_columns(db_ids)
+            async with report.phase("relations") as group:
+                await group.run(add_relation_columns, db_ids, client=api, skip_existing=upsert)
 
-    page_ids = {}
-    for tmpl in DATABASE_TEMPLATES:
-        rel_ids = None
-        if tmpl["template_title"] == "휴가 및 출장 증빙서류":
-            rel_ids = page_ids.get("출장 요청서", []).copy()
-        ids = await create_dummy_data(
-            db_ids[tmpl["template_title"]],
-            tmpl["template_title"],
-            related_page_ids=rel_ids,
+            async with report.phase("seed"):
+                for tmpl in DATABASE_TEMPLATES:
+                    title = tmpl["template_title"]
+                    rel_ids = None
+                    if title == "휴가 및 출장 증빙서류":
+                        rel_ids = page_ids.get("출장 요청서", []).copy()
+                    ids = await create_dummy_data(
+                        db_ids[title],
+                        title,
+                        related_page_ids=rel_ids,
+                        client=api,
+                        count=rows,
+                        upsert=upsert,
+                        on_batch=lambda batch, title=title: report.add(
+                            "페이지", title, len(batch)
+                        ),
+                    )
+                    page_ids[title] = ids or []
+        except DeadlineExceeded as exc:
+            log.error("%s\n%s", exc, report.format())
+
+    health = breaker_summary()
+    log.info("서킷 상태\n%s", health)
+    if notify and report.timed_out:
+        # The budget is spent; the report still gets a short grace period
+        with profiler.span("notify"):
+            try:
+                await asyncio.wait_for(
+                    send_message(f"{report.format()}\n{health}"), REPORT_GRACE_SECONDS
+                )
+            except TimeoutError:
+                log.error("기한 초과 보고서 전송 실패")
+    elif notify:
+        async with report.phase("notify"):
+            await send_message(f"✅ Notion automation complete\n{health}")
+    pages = sum(report.results.get("페이지", {}).values())
+    return {"databases": len(db_ids), "pages": pages, "timed_out": report.timed_out}
+
+
+async def sync_calendars(client=None, parent_page_id=None, *, state=None) -> dict:
+    """Sync the routed databases under the parent page to Google Calendar.
+
+    The databases are found by title and handed to
+    :func:`calendar_sync.sync_all_calendars`, which syncs every calendar
+    route at once. Returns the action counts per template.
+    """
+    from calendar_sync import sync_all_calendars
+
+    api = client or notion
+    if not api:
+        log.warning("노션 클라이언트 미설정으로 캘린더 동기화를 건너뜁니다")
+        return {}
+    with retry_budget_scope():
+        found = await asyncio.to_thread(
+            find_databases, parent_page_id or PARENT_PAGE_ID, client=api
+        )
+        results = await sync_all_calendars(found, state, client=api)
+    for template, counts in results.items():
+        log.info(
+            "%s 캘린더: 생성 %d, 수정 %d, 유지 %d",
+            template, counts["insert"], counts["patch"], counts["skip"],
         )
-        page_ids[tmpl["template_title"]] = ids
-        
-    await send_message("✅ Notion automation complete")
+    return results
 
 
-def main() -> None:
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="WATCH_DATABASE_IDS 데이터베이스를 계속 감시하는 데몬 모드로 실행",
+    )
+    parser.add_argument(
+        "--sync-calendars",
+        action="store_true",
+        help="라우팅된 노션 데이터베이스(회사 일정·출장·휴가·교육)를 구글 캘린더에 동시에 동기화",
+    )
+    parser.add_argument(
+        "--tenants",
+        metavar="MANIFEST",
+        nargs="?",
+        const=TENANT_MANIFEST,
+        help="테넌트 매니페스트(JSON)의 모든 워크스페이스를 동시에 생성",
+    )
+    parser.add_argument(
+        "--backup",
+        metavar="PATH",
+        help="기존 데이터베이스를 삭제하기 전에 NDJSON.gz 파일로 백업",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        nargs="?",
+        const="",
+        help="단계별 시간(wall/API/CPU)을 출력하고, FILE을 주면 cProfile 결과도 저장",
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        metavar="N",
+        help="샘플 대신 템플릿마다 N건의 합성 데이터를 생성",
+    )
+    parser.add_argument(
+        "--upsert",
+        action="store_true",
+        help="기존 데이터베이스를 지우지 않고 행을 자연 키로 갱신(변경된 행만 기록)",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="모든 API 호출을 JSONL 파일로 기록 (python tracing.py FILE 로 분석)",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        metavar="SECONDS",
+        help="실행 전체 시간 예산(초). 넘으면 진행 중인 작업을 취소하고 부분 결과를 보고",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    if args.trace:
+        tracer.open(args.trace)
     try:
-        asyncio.run(run())
+        if args.watch:
+            from watch_daemon import watch
+
+            asyncio.run(watch())
+        elif args.sync_calendars:
+            asyncio.run(sync_calendars())
+        elif args.tenants:
+            from tenants import load_manifest, run_tenants
+
+            asyncio.run(run_tenants(load_manifest(args.tenants), run))
+        else:
+            options = dict(
+                backup_path=args.backup, rows=args.rows, upsert=args.upsert, deadline=args.deadline
+            )
+            if args.profile is not None:
+                with profiled(args.profile or None):
+                    result = asyncio.run(run(**options))
+            else:
+                result = asyncio.run(run(**options))
+            if result.get("timed_out"):
+                # Fail the job so CI shows the partial run
+                raise SystemExit(3)
     except Exception as exc:
         log.error("예상치 못한 오류: %s", exc)
         send_error_webhook(exc)
         raise
+    finally:
+        tracer.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,51 @@
+"""In-process metrics registry for counters, gauges and observations."""
+import threading
+from typing import Dict
+
+
+class Metrics:
+    """Thread-safe counters, gauges and summary observations."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.counters: Dict[str, float] = {}
+        self.gauges: Dict[str, float] = {}
+        self.observations: Dict[str, Dict[str, float]] = {}
+
+    def incr(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            self.gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        """Record a sample keeping count, sum and max."""
+        with self._lock:
+            obs = self.observations.setdefault(name, {"count": 0, "sum": 0.0, "max": 0.0})
+            obs["count"] += 1
+            obs["sum"] += value
+            obs["max"] = max(obs["max"], value)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Return a copy of all metrics."""
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+                "observations": {k: dict(v) for k, v in self.observations.items()},
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.observations.clear()
+
+
+metrics = Metrics()
+
+# Example usage:
+# from metrics import metrics
+# metrics.incr("notion.pages.create")
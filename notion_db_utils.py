@@ -1,13 +1,35 @@
 """Utility functions for interacting with Notion databases."""
-from typing import Dict, List, Optional
+import asyncio
+import hashlib
+import itertools
+import json
+import time
+import uuid
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
 try:
+    import httpx
     from notion_client import Client
 except ModuleNotFoundError:  # pragma: no cover - optional dependency for tests
+    httpx = None
     Client = None
-from config import NOTION_TOKEN, PARENT_PAGE_ID, DEFAULT_USER_ID
+from config import NOTION_TOKEN, PARENT_PAGE_ID, DEFAULT_USER_ID, NOTION_RATE_LIMIT
 from logging_utils import get_logger
+from rate_limit import RateLimiter
+from retry import call_with_retry
+from concurrency import gather_limited, limiter_for, map_limited
+from read_cache import cache_for
+from people_resolver import PeopleResolver, workspace_key
+from page_decoder import Column, PageDecoder
+from profiling import profiler
+from deadlines import call_timeout, check_deadline
+from priority import PriorityScheduler, RequestShed
+from tracing import normalize_path, tracer
 import notion_templates as templates
+from synthetic_data import generate_items
 from google_calendar_utils import create_event
+from calendar_routes import CalendarRoute, route_for
+from file_uploads import encode_files, uploader_for
+from page_blocks import append_blocks, inline_body, to_block
 
 log = get_logger(__name__)
 
@@ -22,18 +44,123 @@ DEFAULT_SELECT_OPTIONS = [
 ]
 DEFAULT_SELECT_NAME = "미처리"
 
+# 페이지 생성 요청마다 고유 키를 기록하는 속성. 재시도 전에 이 키로 조회해
+# 이미 생성된 페이지가 있으면 중복 생성하지 않는다.
+IDEMPOTENCY_PROPERTY = "생성키"
+
+# 행 내용(인코딩된 속성)의 해시를 기록하는 속성. upsert 모드에서 바뀐 행만
+# pages.update 하고 같은 행은 건너뛰는 데 사용한다.
+CONTENT_HASH_PROPERTY = "내용해시"
+
+# Rows encoded and created per round by ``create_dummy_data``
+CREATE_BATCH = 500
+
+
+def build_notion_client(token: str, *, limiter: Optional[RateLimiter] = None):
+    """Return a Notion client whose requests all pass through ``limiter``.
+
+    The time from queueing a request until its response arrives, including
+    the wait for the limiter, is reported to the profiler as API time. The
+    call trace starts once the token is granted, so its spans only cover
+    the request itself. Requests are refused after the active
+    deadline and their timeouts are capped by the time left on it. The
+    limiter's tokens are handed out by a :class:`priority.PriorityScheduler`,
+    so provisioning writes keep their share while sync work is busy.
+    """
+    if not Client:
+        return None
+    scheduler = PriorityScheduler("notion", limiter) if limiter else None
+
+    def _on_request(request) -> None:
+        request.extensions["queued"] = time.perf_counter()
+        if scheduler and not scheduler.acquire():
+            raise RequestShed(f"notion 요청 제한으로 건너뜀: {request.url.path}")
+        request.extensions["started"] = time.perf_counter()
+        check_deadline(f"{request.method} {normalize_path(request.url.path)}")
+        timeouts = request.extensions.get("timeout")
+        if timeouts:
+            request.extensions["timeout"] = {
+                key: call_timeout(value) for key, value in timeouts.items()
+            }
+
+    def _on_response(response) -> None:
+        request = response.request
+        queued = request.extensions.get("queued")
+        started = request.extensions.get("started")
+        if queued is not None:
+            done = time.perf_counter()
+            profiler.add_api_time(done - queued)
+            if tracer.enabled and started is not None:
+                now = time.time()
+                tracer.record(
+                    "notion",
+                    f"{request.method} {normalize_path(request.url.path)}",
+                    now - (done - started),
+                    now,
+                    response.status_code,
+                )
+
+    hooks = {"request": [_on_request], "response": [_on_response]}
+    return Client(auth=token, client=httpx.Client(event_hooks=hooks))
+
+
+# Request budget shared by everything that uses the global client
+notion_limiter = RateLimiter(NOTION_RATE_LIMIT)
+
 # Global notion client that other modules may reuse
 if Client and NOTION_TOKEN:
-    notion = Client(auth=NOTION_TOKEN)
+    notion = build_notion_client(NOTION_TOKEN, limiter=notion_limiter)
 else:  # pragma: no cover - used when notion-client not installed for tests
     notion = None
 
 
+def retrieve_database(db_id: str, *, client=None) -> Dict:
+    """Return a database object.
+
+    Concurrent identical calls share one request and the result is reused
+    for ``READ_CACHE_TTL`` seconds unless :func:`update_database` changes it.
+    """
+    api = client or notion
+    return cache_for(api).get(
+        ("databases.retrieve", db_id), lambda: api.databases.retrieve(db_id)
+    )
+
+
+def update_database(db_id: str, *, client=None, **kwargs) -> Dict:
+    """Update a database and drop its cached schema."""
+    api = client or notion
+    try:
+        return api.databases.update(db_id, **kwargs)
+    finally:
+        cache_for(api).invalidate(("databases.retrieve", db_id))
+
+
+def list_users(*, client=None) -> List[Dict]:
+    """Return all workspace users, following pagination, via the read cache."""
+    api = client or notion
+
+    def _load() -> List[Dict]:
+        users: List[Dict] = []
+        cursor = None
+        while True:
+            if cursor:
+                data = api.users.list(start_cursor=cursor)
+            else:
+                data = api.users.list()
+            users.extend(data.get("results", []))
+            cursor = data.get("next_cursor")
+            if not cursor:
+                return users
+
+    return cache_for(api).get(("users.list",), _load)
+
+
 def ensure_status_column(
     db_id: str,
     *,
     options: Optional[List[Dict[str, str]]] = None,
     default_name: Optional[str] = None,
+    client=None,
 ) -> None:
     """Ensure the given database has a styled ``상태`` select property.
 
@@ -50,17 +177,20 @@ def ensure_status_column(
     default_name:
         Default select name to apply when creating new property.
         ``DEFAULT_SELECT_NAME`` when omitted.
+    client:
+        Notion client to use instead of the global ``notion`` client.
 
     This helper is used right after creating a database as some templates may
     miss the column or have it defined with a wrong type. If the column is
     missing or not a ``select`` property it will be recreated using
     ``databases.update`` with the given options.
     """
-    if not notion:
+    api = client or notion
+    if not api:
         log.debug("노션 클라이언트 미설정")
         return
     try:
-        info = notion.databases.retrieve(db_id)
+        info = retrieve_database(db_id, client=api)
         prop = info.get("properties", {}).get("상태")
         need_update = not prop or prop.get("type") != "select"
         if need_update:
@@ -68,39 +198,72 @@ def ensure_status_column(
             name = default_name or DEFAULT_SELECT_NAME
             if name:
                 select_cfg["default"] = {"name": name}
-            notion.databases.update(db_id, properties={"상태": {"select": select_cfg}})
+            update_database(db_id, client=api, properties={"상태": {"select": select_cfg}})
             log.info("상태(select) 컬럼을 보정했습니다: %s", db_id)
     except Exception as exc:  # pragma: no cover - network failures
         log.error("상태 컬럼 보정 실패: %s - %s", db_id, exc)
 
 
-def delete_existing_databases(parent_page_id: str = PARENT_PAGE_ID) -> None:
-    """Remove all child databases under the given Notion page."""
-    if not notion:
+def delete_existing_databases(parent_page_id: str = PARENT_PAGE_ID, *, client=None) -> None:
+    """Remove all child databases under the given Notion page.
+
+    All child blocks are listed first and then deleted concurrently under the
+    client's adaptive concurrency limit.
+    """
+    api = client or notion
+    if not api:
         log.debug("노션 클라이언트 미설정")
         return
+    block_ids: List[str] = []
     try:
         cursor = None
         while True:
             if cursor:
-                page = notion.blocks.children.list(parent_page_id, start_cursor=cursor)
+                page = api.blocks.children.list(parent_page_id, start_cursor=cursor)
             else:
-                page = notion.blocks.children.list(parent_page_id)
+                page = api.blocks.children.list(parent_page_id)
             children = page.get("results", [])
-            for block in children:
-                if block.get("type") == "child_database":
-                    notion.blocks.delete(block_id=block["id"])
-                    log.info("기존 데이터베이스 %s 삭제", block["id"])
+            block_ids.extend(
+                block["id"] for block in children if block.get("type") == "child_database"
+            )
             cursor = page.get("next_cursor")
             if not cursor:
                 break
+
+        def _delete(block_id: str) -> None:
+            api.blocks.delete(block_id=block_id)
+            log.info("기존 데이터베이스 %s 삭제", block_id)
+
+        map_limited(limiter_for("notion", api), _delete, block_ids)
     except Exception as e:
         log.error("데이터베이스 삭제 실패: %s", e)
 
 
-def create_database(template: Dict) -> str:
+def find_databases(parent_page_id: str = PARENT_PAGE_ID, *, client=None) -> Dict[str, str]:
+    """Return ``{title: database id}`` of the child databases of a page."""
+    api = client or notion
+    found: Dict[str, str] = {}
+    cursor = None
+    while True:
+        if cursor:
+            page = api.blocks.children.list(parent_page_id, start_cursor=cursor)
+        else:
+            page = api.blocks.children.list(parent_page_id)
+        for block in page.get("results", []):
+            if block.get("type") == "child_database":
+                title = (block.get("child_database") or {}).get("title", "")
+                found.setdefault(title, block["id"])
+        cursor = page.get("next_cursor")
+        if not cursor:
+            return found
+
+
+def create_database(
+    template: Dict, *, client=None, parent_page_id: Optional[str] = None
+) -> str:
     """Create a database from a template and return its ID."""
-    if not notion:
+    api = client or notion
+    if not api:
         raise RuntimeError("노션 클라이언트가 설정되지 않았습니다")
     title_text = template["template_title"]
     properties = {}
@@ -114,9 +277,11 @@ def create_database(template: Dict) -> str:
             log.debug("relation 속성 %s(%s) 은 후처리 단계에서 생성", name, title_text)
             continue
         properties[name] = prop
+    properties.setdefault(IDEMPOTENCY_PROPERTY, {"rich_text": {}})
+    properties.setdefault(CONTENT_HASH_PROPERTY, {"rich_text": {}})
 
-    res = notion.databases.create(
-        parent={"type": "page_id", "page_id": PARENT_PAGE_ID},
+    res = api.databases.create(
+        parent={"type": "page_id", "page_id": parent_page_id or PARENT_PAGE_ID},
         title=[{"type": "text", "text": {"content": title_text}}],
         icon={"type": "emoji", "emoji": template.get("icon_emoji", "📄")},
         properties=properties,
@@ -124,98 +289,384 @@ def create_database(template: Dict) -> str:
     log.info("데이터베이스 %s 생성 완료", title_text)
     db_id = res["id"]
     # Ensure the status column exists right after creation
-    ensure_status_column(db_id)
+    ensure_status_column(db_id, client=api)
     return db_id
 
 
+def create_page(
+    db_id: str,
+    properties: Dict[str, Dict],
+    *,
+    client=None,
+    idempotent: bool = True,
+    children: Optional[List[Dict]] = None,
+) -> Dict:
+    """Create a database page, retrying transient failures without duplicates.
+
+    ``children`` are page-body blocks created together with the page. With
+    ``idempotent`` a fresh key is written to ``IDEMPOTENCY_PROPERTY``.
+    When a create fails ambiguously (timeout or 5xx) the database is queried
+    for that key before retrying, and an existing page is returned instead.
+    Without the key only failures that were certainly not applied (429,
+    connection errors) are retried.
+    """
+    api = client or notion
+    key = uuid.uuid4().hex if idempotent else None
+    if key:
+        properties = {
+            **properties,
+            IDEMPOTENCY_PROPERTY: {"rich_text": [{"text": {"content": key}}]},
+        }
+
+    def _recover() -> Optional[Dict]:
+        found = api.databases.query(
+            db_id,
+            filter={"property": IDEMPOTENCY_PROPERTY, "rich_text": {"equals": key}},
+            page_size=1,
+        ).get("results", [])
+        return found[0] if found else None
+
+    body = {"children": children} if children else {}
+    return call_with_retry(
+        "pages.create",
+        api.pages.create,
+        parent={"database_id": db_id},
+        properties=properties,
+        **body,
+        safe=False,
+        recover=_recover if key else None,
+    )
+
+
+def _encode_people(value, people: Optional[PeopleResolver] = None) -> List[Dict[str, str]]:
+    """Return ``[{"id": ...}]`` for ids, ``dummy-user`` or emails/names."""
+    ids: List[Dict[str, str]] = []
+    for person in value if isinstance(value, list) else [value]:
+        pid = person.get("id") if isinstance(person, dict) else None
+        if pid == "dummy-user":
+            if DEFAULT_USER_ID:
+                ids.append({"id": DEFAULT_USER_ID})
+        elif pid:
+            ids.append({"id": pid})
+        elif people is not None:
+            uid = people.resolve(person)
+            if uid:
+                ids.append({"id": uid})
+    return ids
+
+
+def _needs_people_lookup(items: List[Dict], template: Dict) -> bool:
+    """Return ``True`` when any people value is an email or name."""
+    for item in items:
+        for key, value in item.items():
+            pdef = template.get("properties", {}).get(key, {})
+            if "people" not in pdef:
+                continue
+            for person in value if isinstance(value, list) else [value]:
+                if isinstance(person, str) or (isinstance(person, dict) and not person.get("id")):
+                    return True
+    return False
+
+
+def people_resolver_for(client=None) -> PeopleResolver:
+    """Return a resolver that lists the users of ``client``'s workspace."""
+    api = client or notion
+    return PeopleResolver(lambda: list_users(client=api), key=workspace_key(api))
+
+
+def encode_item(
+    item: Dict,
+    template: Dict,
+    related_page_ids: Optional[List[str]] = None,
+    people: Optional[PeopleResolver] = None,
+) -> Dict[str, Dict]:
+    """Convert a plain item into Notion property values for ``template``.
+
+    ``"dummy-page"`` relation values consume ids from ``related_page_ids``.
+    People values may be user ids, ``dummy-user`` or, when ``people`` is
+    given, emails and names resolved through it. Local attachment paths in
+    ``files`` values become upload placeholders (see :mod:`file_uploads`).
+    """
+    props: Dict[str, Dict] = {}
+    for key, value in item.items():
+        pdef = template.get("properties", {}).get(key, {})
+        ptype = next(iter(pdef.keys()), None)
+        if ptype == "title":
+            props[key] = {"title": [{"text": {"content": value}}]}
+        elif ptype == "select":
+            props[key] = {"select": {"name": value}}
+        elif ptype == "date" and isinstance(value, str):
+            if key == "출장기간" and "/" in value:
+                start, end = value.split("/")
+                props[key] = {"date": {"start": start, "end": end}}
+            else:
+                props[key] = {"date": {"start": value}}
+        elif ptype == "number":
+            props[key] = {"number": value}
+        elif ptype == "files":
+            props[key] = {"files": encode_files(value)}
+        elif ptype == "people":
+            people_ids = _encode_people(value, people)
+            if people_ids:
+                props[key] = {"people": people_ids}
+        elif ptype == "relation":
+            ids = value if isinstance(value, list) else [value]
+            real_ids = []
+            for rid in ids:
+                if rid == "dummy-page":
+                    if related_page_ids:
+                        real_ids.append(related_page_ids.pop(0))
+                elif rid:
+                    real_ids.append(rid)
+            if real_ids:
+                props[key] = {"relation": [{"id": i} for i in real_ids]}
+        else:
+            if isinstance(value, list) and value and value[0].get("object") == "user":
+                people_ids = _encode_people(value, people)
+                if people_ids:
+                    props[key] = {"people": people_ids}
+            elif isinstance(value, str):
+                props[key] = {"rich_text": [{"text": {"content": value}}]}
+    return props
+
+
+def natural_key(template: Dict) -> str:
+    """Return the column identifying a row of ``template`` across runs.
+
+    Templates may name it with ``"natural_key"``; the title column is used
+    otherwise.
+    """
+    if template.get("natural_key"):
+        return template["natural_key"]
+    for name, prop in template.get("properties", {}).items():
+        if "title" in prop:
+            return name
+    raise ValueError(f"No title column in template {template.get('template_title')}")
+
+
+def content_hash(properties: Dict[str, Dict]) -> str:
+    """Return a short hash of encoded property values."""
+    payload = json.dumps(properties, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _row_index(db_id: str, key_column: str, key_type: str, api) -> Dict[str, Dict[str, str]]:
+    """Return ``{natural key: {"id", "hash"}}`` for every page of a database."""
+    decoder = PageDecoder(
+        [
+            Column("id", "page_id"),
+            Column(key_column, key_type),
+            Column(CONTENT_HASH_PROPERTY, "rich_text", ""),
+        ]
+    )
+    index: Dict[str, Dict[str, str]] = {}
+    cursor = None
+    while True:
+        kwargs = {"page_size": 100}
+        if cursor:
+            kwargs["start_cursor"] = cursor
+        data = api.databases.query(db_id, **kwargs)
+        for page_id, key, digest in decoder.rows(data.get("results", [])):
+            if key is not None:
+                index.setdefault(str(key), {"id": page_id, "hash": digest})
+        cursor = data.get("next_cursor")
+        if not cursor:
+            return index
+
+
+def _upsert_page(
+    db_id: str,
+    props: Dict[str, Dict],
+    existing: Optional[Dict[str, str]],
+    *,
+    api,
+    idempotent: bool,
+    resolve=None,
+    children: Optional[List[Dict]] = None,
+) -> Dict:
+    """Insert, update or skip one row by its content hash.
+
+    ``resolve`` prepares the properties for writing once the row is known to
+    change (attachments are only uploaded then); ``children`` are only sent
+    with inserts. Returns the page with an extra ``"action"`` key.
+    """
+    digest = content_hash(props)
+    if existing and existing["hash"] == digest:
+        return {"id": existing["id"], "action": "skip"}
+    if resolve:
+        props = resolve(props)
+    props = {**props, CONTENT_HASH_PROPERTY: {"rich_text": [{"text": {"content": digest}}]}}
+    if existing:
+        call_with_retry("pages.update", api.pages.update, existing["id"], properties=props)
+        return {"id": existing["id"], "action": "update"}
+    page = create_page(db_id, props, client=api, idempotent=idempotent, children=children)
+    return {**page, "action": "insert"}
+
+
+def _batched(items: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    """Yield lists of up to ``size`` items without materialising ``items``."""
+    it = iter(items)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
 async def create_dummy_data(
     db_id: str,
     template_title: str,
     related_page_ids: Optional[List[str]] = None,
+    *,
+    client=None,
+    count: Optional[int] = None,
+    seed: int = 0,
+    upsert: bool = False,
+    items: Optional[Iterable[Dict]] = None,
+    on_batch: Optional[Callable[[List[str]], None]] = None,
 ) -> List[str]:
-    """Insert sample rows and return created page IDs."""
-    if not notion:
+    """Insert sample rows and return created page IDs.
+
+    Without ``count`` the hand-written ``DUMMY_ITEMS`` are used; with it
+    ``count`` synthetic rows are streamed from :mod:`synthetic_data`. A bulk
+    import passes its own ``items`` instead. Rows
+    are encoded and created in batches of ``CREATE_BATCH``, each batch
+    concurrently under the client's adaptive concurrency limit, so large
+    counts never hold more than one batch of rows in memory. The returned
+    ids keep the order of the items.
+
+    With ``upsert`` rows are matched to existing pages by the template's
+    :func:`natural_key` column. A hash of the encoded properties is kept in
+    ``CONTENT_HASH_PROPERTY``: new rows are inserted, rows whose hash changed
+    are sent with ``pages.update`` and identical rows are skipped, so a rerun
+    on a stable dataset makes no write calls. Calendar events are only
+    created for inserted rows.
+
+    Local files in ``files`` columns are streamed to Notion's file upload API
+    by the client's :class:`file_uploads.FileUploader` while rows are
+    written, each distinct file once. Inserted rows get the template's
+    ``page_blocks`` body: with ``pages.create`` when it fits one request,
+    otherwise by :func:`page_blocks.append_blocks` for the pages of a batch
+    concurrently. ``on_batch`` receives the ids of each
+    finished batch, so callers keep track of progress if the run is cut
+    short.
+    """
+    api = client or notion
+    if not api:
         log.debug("노션 클라이언트 미설정")
         return
     # Verify the status column exists before inserting sample rows
-    ensure_status_column(db_id)
-    prop = notion.databases.retrieve(db_id)["properties"]
+    ensure_status_column(db_id, client=api)
+    prop = retrieve_database(db_id, client=api)["properties"]
     if "상태" not in prop or prop["상태"].get("type") != "select":
         log.warning("상태(select) 컬럼이 없어 생성을 건너뜁니다: %s", db_id)
         return
 
     tmpl = templates.get_template(template_title) or {}
-    items = templates.get_dummy_items(template_title)
+    if items is None and count is None:
+        items = templates.get_dummy_items(template_title)
+    elif items is None:
+        items = generate_items(template_title, count, seed=seed)
+    people = None
+    uploader = uploader_for(api)
+    body = [to_block(spec) for spec in tmpl.get("page_blocks", [])]
+    inline = inline_body(body) if body else None
+    idempotent = IDEMPOTENCY_PROPERTY in prop
+    index: Optional[Dict[str, Dict[str, str]]] = None
+    if upsert:
+        if CONTENT_HASH_PROPERTY not in prop:
+            update_database(
+                db_id, client=api, properties={CONTENT_HASH_PROPERTY: {"rich_text": {}}}
+            )
+        key_column = natural_key(tmpl)
+        key_type = next(iter(tmpl["properties"][key_column]))
+        index = _row_index(db_id, key_column, key_type, api)
+    actions = {"insert": 0, "update": 0, "skip": 0}
     page_ids: List[str] = []
-    for item in items:
-        props: Dict[str, Dict] = {}
-        for key, value in item.items():
-            pdef = tmpl.get("properties", {}).get(key, {})
-            ptype = next(iter(pdef.keys()), None)
-            if ptype == "title":
-                props[key] = {"title": [{"text": {"content": value}}]}
-            elif ptype == "select":
-                props[key] = {"select": {"name": value}}
-            elif ptype == "date" and isinstance(value, str):
-                if key == "출장기간" and "/" in value:
-                    start, end = value.split("/")
-                    props[key] = {"date": {"start": start, "end": end}}
-                else:
-                    props[key] = {"date": {"start": value}}
-            elif ptype == "number":
-                props[key] = {"number": value}
-            elif ptype == "files":
-                props[key] = {"files": value}
-            elif ptype == "people":
-                people_ids = []
-                for person in value:
-                    pid = person.get("id")
-                    if pid == "dummy-user" and DEFAULT_USER_ID:
-                        people_ids.append({"id": DEFAULT_USER_ID})
-                    elif pid and pid != "dummy-user":
-                        people_ids.append({"id": pid})
-                if people_ids:
-                    props[key] = {"people": people_ids}
-            elif ptype == "relation":
-                ids = value if isinstance(value, list) else [value]
-                real_ids = []
-                for rid in ids:
-                    if rid == "dummy-page":
-                        if related_page_ids:
-                            if related_page_ids:
-                                real_ids.append(related_page_ids.pop(0))
-                    elif rid:
-                        real_ids.append(rid)
-                if real_ids:
-                    props[key] = {"relation": [{"id": i} for i in real_ids]}
-            else:
-                if isinstance(value, list) and value and value[0].get("object") == "user":
-                    people_ids = []
-                    for person in value:
-                        pid = person.get("id")
-                        if pid == "dummy-user" and DEFAULT_USER_ID:
-                            people_ids.append({"id": DEFAULT_USER_ID})
-                        elif pid and pid != "dummy-user":
-                            people_ids.append({"id": pid})
-                    if people_ids:
-                        props[key] = {"people": people_ids}
-                elif isinstance(value, str):
-                    props[key] = {"rich_text": [{"text": {"content": value}}]}
-        res = notion.pages.create(parent={"database_id": db_id}, properties=props)
-        page_ids.append(res.get("id", ""))
-        if template_title == "회사 일정 캘린더" and "시작일" in props:
-            create_event(
-                props["제목"]["title"][0]["text"]["content"],
-                props["시작일"]["date"]["start"],
-                props.get("종료일", {"date": {"start": props["시작일"]["date"]["start"]}})["date"]["start"],
-                item.get("설명", ""),
+    for chunk in _batched(items, CREATE_BATCH):
+        if people is None and _needs_people_lookup(chunk, tmpl):
+            # One cached users.list for the whole run instead of per-row lookups
+            people = people_resolver_for(api)
+            people.load()
+        # Encode sequentially so relation targets are assigned in item order
+        rows = [encode_item(item, tmpl, related_page_ids, people) for item in chunk]
+        if index is None:
+            results = await gather_limited(
+                limiter_for("notion", api),
+                lambda props: create_page(
+                    db_id, uploader.resolve(props), client=api, idempotent=idempotent,
+                    children=inline,
+                ),
+                rows,
+            )
+        else:
+            results = await gather_limited(
+                limiter_for("notion", api),
+                lambda pair: _upsert_page(
+                    db_id, pair[1], index.get(str(pair[0].get(key_column))),
+                    api=api, idempotent=idempotent, resolve=uploader.resolve,
+                    children=inline,
+                ),
+                list(zip(chunk, rows)),
             )
-    log.info("더미 데이터 %d건 삽입", len(items))
+        ids = [res.get("id", "") for res in results]
+        for res in results:
+            actions[res.get("action", "insert")] += 1
+        inserted = [
+            {"id": page_id, "properties": props}
+            for props, page_id, res in zip(rows, ids, results)
+            if res.get("action", "insert") == "insert"
+        ]
+        if body and inline is None and inserted:
+            with profiler.span("blocks"):
+                await asyncio.to_thread(
+                    append_blocks, [(page["id"], body) for page in inserted], client=api
+                )
+        route = route_for(template_title)
+        if route:
+            await _create_calendar_events(route, inserted)
+        page_ids.extend(ids)
+        if on_batch:
+            on_batch(ids)
+    if upsert:
+        log.info(
+            "더미 데이터 upsert: 생성 %d, 수정 %d, 유지 %d",
+            actions["insert"], actions["update"], actions["skip"],
+        )
+    else:
+        log.info("더미 데이터 %d건 삽입", len(page_ids))
     return page_ids
 
-def add_relation_columns(db_id_map: Dict[str, str]) -> None:
-    """Update databases with relation properties once all IDs are known."""
-    if not notion:
+
+async def _create_calendar_events(route: CalendarRoute, pages: List[Dict]) -> None:
+    """Register Google Calendar events for created rows of a routed template."""
+    with profiler.span("calendar"):
+        events = [row for row in (route.row(page) for page in pages) if row]
+        await gather_limited(
+            limiter_for("google_calendar"),
+            lambda row: create_event(
+                row["summary"],
+                row["start"],
+                row["end"],
+                row["description"],
+                page_id=row["page_id"],
+                template=route.template,
+                calendar_id=route.calendar_id,
+            ),
+            events,
+        )
+
+
+def add_relation_columns(
+    db_id_map: Dict[str, str], *, client=None, skip_existing: bool = False
+) -> None:
+    """Update databases with relation properties once all IDs are known.
+
+    With ``skip_existing`` relations already pointing at their target are
+    left alone, so reusing existing databases makes no schema writes.
+    """
+    api = client or notion
+    if not api:
         log.debug("노션 클라이언트 미설정")
         return
 
@@ -225,10 +676,14 @@ def add_relation_columns(db_id_map: Dict[str, str]) -> None:
             continue
 
         updates = {}
+        current = retrieve_database(db_id, client=api)["properties"] if skip_existing else {}
         for name, prop in tmpl["properties"].items():
             if prop.get("relation") == {}:
                 target_title = prop.get("target_template")
                 target_id = db_id_map.get(target_title)
+                linked = (current.get(name) or {}).get("relation") or {}
+                if target_id and linked.get("database_id") == target_id:
+                    continue
                 if target_id:
                     updates[name] = {
                         "relation": {
@@ -244,7 +699,7 @@ def add_relation_columns(db_id_map: Dict[str, str]) -> None:
 
         if updates:
             try:
-                notion.databases.update(db_id, properties=updates)
+                update_database(db_id, client=api, properties=updates)
                 log.info("%s 데이터베이스의 relation 업데이트 완료", tmpl["template_title"])
             except Exception as exc:
                 log.error("relation 업데이트 실패 %s: %s", db_id, exc)
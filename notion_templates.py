@@ -26,6 +26,18 @@ DATABASE_TEMPLATES = [
             "상태": {"select": {}},
             "첨부파일": {"files": {}},
         },
+        # Page body written into every row (see page_blocks.to_block)
+        "page_blocks": [
+            {
+                "type": "callout",
+                "icon": "💡",
+                "text": "영수증을 첨부파일에 올린 뒤 상태를 '진행중'으로 바꿔 주세요.",
+            },
+            {"type": "heading_3", "text": "제출 전 확인"},
+            {"type": "to_do", "text": "영수증 또는 세금계산서 첨부"},
+            {"type": "to_do", "text": "계정과목 선택"},
+            {"type": "to_do", "text": "팀장 사전 승인"},
+        ],
     },
     {
         "template_title": "출장 요청서",
@@ -38,6 +50,33 @@ DATABASE_TEMPLATES = [
             "출장목적": {"rich_text": {}},
             "상태": {"select": {}},
         },
+        "page_blocks": [
+            {"type": "heading_3", "text": "출장 준비"},
+            {
+                "type": "to_do",
+                "text": "교통편 예약",
+                "children": [
+                    {"type": "bulleted_list_item", "text": "항공 또는 KTX"},
+                    {
+                        "type": "bulleted_list_item",
+                        "text": "법인카드 결제",
+                        "children": [
+                            {"type": "paragraph", "text": "개인 결제 시 지출결의서를 따로 작성합니다."}
+                        ],
+                    },
+                ],
+            },
+            {"type": "to_do", "text": "숙소 예약"},
+            {"type": "divider"},
+            {
+                "type": "toggle",
+                "text": "복귀 후",
+                "children": [
+                    {"type": "to_do", "text": "증빙서류 등록"},
+                    {"type": "to_do", "text": "출장 보고서 공유"},
+                ],
+            },
+        ],
     },
     {
         "template_title": "휴가 기록서",
@@ -59,8 +98,14 @@ DATABASE_TEMPLATES = [
             "수강생": {"people": {}},
             "교육명": {"rich_text": {}},
             "교육일": {"date": {}},
+            "첨부파일": {"files": {}},
             "상태": {"select": {}},
         },
+        "page_blocks": [
+            {"type": "callout", "icon": "📌", "text": "수강 후 1주일 안에 수료증을 첨부파일에 올려 주세요."},
+            {"type": "heading_3", "text": "수강 후기"},
+            {"type": "paragraph", "text": ""},
+        ],
     },
     {
         "template_title": "회사 일정 캘린더",
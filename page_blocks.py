@@ -0,0 +1,175 @@
+"""Write page-body blocks (guides, checklists) with as few appends as possible.
+
+Templates describe page content with compact specs such as
+``{"type": "to_do", "text": "영수증 첨부", "children": [...]}`` which
+:func:`to_block` turns into Notion block objects.
+
+``blocks.children.append`` takes at most ``MAX_CHILDREN`` children per
+call, ``MAX_REQUEST_BLOCKS`` blocks in total and two levels of nesting below
+the appended blocks. :func:`append_blocks` therefore writes level by level:
+each append sends up to 100 sibling blocks with every subtree that fits
+inline, and children that do not fit are appended in a later round under
+the block ids returned by the first call (the response only carries the ids
+of the appended blocks, not of their children). Different parents are written
+concurrently in every round under the client's adaptive concurrency limit;
+the chunks of one parent stay sequential to keep their order.
+
+A body that fits into a single request (see :func:`inline_body`) is sent
+with ``pages.create`` instead, so the page and its content cost one call.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+from concurrency import limiter_for, map_limited
+from logging_utils import get_logger
+from retry import call_with_retry
+
+log = get_logger(__name__)
+
+MAX_CHILDREN = 100
+MAX_REQUEST_BLOCKS = 1000
+# Levels of children allowed below the blocks of one append request
+MAX_INLINE_DEPTH = 2
+
+_TEXT_TYPES = {
+    "paragraph",
+    "heading_1",
+    "heading_2",
+    "heading_3",
+    "bulleted_list_item",
+    "numbered_list_item",
+    "to_do",
+    "toggle",
+    "quote",
+    "callout",
+}
+
+
+def to_block(spec: Dict) -> Dict:
+    """Convert a compact template spec into a Notion block object."""
+    btype = spec["type"]
+    if btype == "divider":
+        return {"object": "block", "type": "divider", "divider": {}}
+    if btype not in _TEXT_TYPES:
+        raise ValueError(f"지원하지 않는 블록 타입입니다: {btype}")
+    text = spec.get("text", "")
+    body: Dict = {"rich_text": [{"type": "text", "text": {"content": text}}] if text else []}
+    if btype == "to_do":
+        body["checked"] = bool(spec.get("checked"))
+    if btype == "callout" and spec.get("icon"):
+        body["icon"] = {"type": "emoji", "emoji": spec["icon"]}
+    if spec.get("children"):
+        body["children"] = [to_block(child) for child in spec["children"]]
+    return {"object": "block", "type": btype, btype: body}
+
+
+def _children(block: Dict) -> List[Dict]:
+    return block.get(block["type"], {}).get("children") or []
+
+
+def _depth(block: Dict) -> int:
+    """Return the levels of children below ``block``."""
+    children = _children(block)
+    return 1 + max(_depth(c) for c in children) if children else 0
+
+
+def _size(block: Dict) -> int:
+    return 1 + sum(_size(c) for c in _children(block))
+
+
+def _fits_inline(block: Dict) -> bool:
+    def _lists_fit(b: Dict) -> bool:
+        children = _children(b)
+        return len(children) <= MAX_CHILDREN and all(_lists_fit(c) for c in children)
+
+    return (
+        _depth(block) <= MAX_INLINE_DEPTH
+        and _size(block) <= MAX_REQUEST_BLOCKS
+        and _lists_fit(block)
+    )
+
+
+def _split(block: Dict) -> Tuple[Dict, List[Dict]]:
+    """Return the block to send now and the children deferred to later."""
+    if not _children(block) or _fits_inline(block):
+        return block, []
+    body = {k: v for k, v in block[block["type"]].items() if k != "children"}
+    return {**block, block["type"]: body}, _children(block)
+
+
+def _chunks(blocks: Sequence[Dict]) -> List[List[Tuple[Dict, List[Dict]]]]:
+    """Group blocks into requests within the per-request limits."""
+    chunks: List[List[Tuple[Dict, List[Dict]]]] = []
+    current: List[Tuple[Dict, List[Dict]]] = []
+    size = 0
+    for block in blocks:
+        sent, deferred = _split(block)
+        weight = _size(sent)
+        if current and (len(current) >= MAX_CHILDREN or size + weight > MAX_REQUEST_BLOCKS):
+            chunks.append(current)
+            current, size = [], 0
+        current.append((sent, deferred))
+        size += weight
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def inline_body(blocks: Sequence[Dict]) -> Optional[List[Dict]]:
+    """Return ``blocks`` if they can be sent as ``children`` of ``pages.create``.
+
+    That is the case when they fit one append request without deferred
+    levels; otherwise ``None`` and the body has to go through
+    :func:`append_blocks`.
+    """
+    chunks = _chunks(blocks)
+    if len(chunks) != 1 or any(deferred for _, deferred in chunks[0]):
+        return None
+    return list(blocks)
+
+
+def append_blocks(targets: Sequence[Tuple[str, Sequence[Dict]]], *, client) -> int:
+    """Append block trees under parents (pages or blocks); return the calls made.
+
+    ``targets`` pairs a parent id with the Notion block objects to append.
+    """
+    limiter = limiter_for("notion", client)
+    calls = 0
+
+    def _write(target: Tuple[str, Sequence[Dict]]) -> Tuple[int, List[Tuple[str, List[Dict]]]]:
+        parent_id, blocks = target
+        made = 0
+        deferred: List[Tuple[str, List[Dict]]] = []
+        for chunk in _chunks(blocks):
+            res = call_with_retry(
+                "blocks.children.append",
+                client.blocks.children.append,
+                parent_id,
+                children=[sent for sent, _ in chunk],
+                safe=False,
+            )
+            made += 1
+            # The created blocks are the last results (older API versions
+            # answer with all children of the parent)
+            created_blocks = res.get("results", [])[-len(chunk):]
+            for created, (_, later) in zip(created_blocks, chunk):
+                if later:
+                    deferred.append((created["id"], later))
+        return made, deferred
+
+    level = [(parent, list(blocks)) for parent, blocks in targets if blocks]
+    while level:
+        results = map_limited(limiter, _write, level)
+        calls += sum(made for made, _ in results)
+        level = [item for _, deferred in results for item in deferred]
+    log.debug("블록 %d개 부모에 %d회 append", len(targets), calls)
+    return calls
+
+
+def write_page_blocks(page_ids: Sequence[str], specs: Sequence[Dict], *, client) -> int:
+    """Write the same template body (``specs``) into every page."""
+    if not specs or not page_ids:
+        return 0
+    blocks = [to_block(spec) for spec in specs]
+    return append_blocks([(page_id, blocks) for page_id in page_ids], client=client)
+
+# Example usage:
+# write_page_blocks([page_id], [{"type": "to_do", "text": "영수증 첨부"}], client=notion)
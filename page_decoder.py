@@ -0,0 +1,191 @@
+"""Schema-driven decoding of Notion pages into flat typed rows.
+
+Query results nest every value a few levels deep and differently per
+property type. :class:`PageDecoder` compiles a list of wanted columns into
+``(property, decoder, default)`` steps once and then decodes each page with
+one dict lookup and one small function call per column, skipping every
+property that was not requested.
+"""
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    np = None
+
+
+def plain_text(items: Optional[List[Dict]]) -> str:
+    """Join a rich text array into plain text."""
+    texts = []
+    for t in items or []:
+        if "plain_text" in t:
+            texts.append(t["plain_text"])
+        elif t.get("text"):
+            texts.append(t["text"].get("content", ""))
+    return "".join(texts)
+
+
+def _name(value: Optional[Dict]) -> Optional[str]:
+    return value.get("name") if value else None
+
+
+def _date_start(value: Optional[Dict]) -> Optional[str]:
+    return value.get("start") if value else None
+
+
+def _date_end(value: Optional[Dict]) -> Optional[str]:
+    return (value.get("end") or value.get("start")) if value else None
+
+
+def _ids(value: Optional[List[Dict]]) -> Tuple[str, ...]:
+    return tuple(item["id"] for item in value or [])
+
+
+def _file_urls(value: Optional[List[Dict]]) -> Tuple[str, ...]:
+    urls = []
+    for f in value or []:
+        url = (f.get(f.get("type")) or {}).get("url")
+        if url:
+            urls.append(url)
+    return tuple(urls)
+
+
+def _formula(value: Optional[Dict]) -> Any:
+    if not value:
+        return None
+    inner = value.get(value.get("type"))
+    return _date_start(inner) if value.get("type") == "date" else inner
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+# Property value decoders keyed by Notion type. ``date`` yields the start
+# date; the pseudo type ``date_end`` yields the end (or start) of a range.
+DECODERS: Dict[str, Callable[[Any], Any]] = {
+    "title": plain_text,
+    "rich_text": plain_text,
+    "number": _identity,
+    "checkbox": _identity,
+    "url": _identity,
+    "email": _identity,
+    "phone_number": _identity,
+    "created_time": _identity,
+    "last_edited_time": _identity,
+    "select": _name,
+    "status": _name,
+    "multi_select": lambda value: tuple(v["name"] for v in value or []),
+    "date": _date_start,
+    "date_end": _date_end,
+    "people": _ids,
+    "relation": _ids,
+    "files": _file_urls,
+    "formula": _formula,
+}
+
+# Kinds decoded to tuples, kept as object arrays by ``column_arrays``
+_SEQUENCE_KINDS = {"multi_select", "people", "relation", "files"}
+
+# Kinds read from the page object itself instead of its properties
+_PAGE_FIELDS = {"page_id": "id", "page_last_edited_time": "last_edited_time"}
+
+
+class Column(NamedTuple):
+    """A decoded column.
+
+    ``kind`` selects the decoder (a Notion property type, ``date_end``,
+    ``page_id`` or ``page_last_edited_time``); without it the decoder follows
+    the ``type`` of each value. ``name`` is the key in dict rows.
+    """
+
+    prop: str
+    kind: Optional[str] = None
+    default: Any = None
+    name: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        return self.name or self.prop
+
+
+class PageDecoder:
+    """Decode selected columns of pages into tuples, dicts or column arrays."""
+
+    def __init__(self, columns: Sequence[Union[Column, str]]) -> None:
+        self.columns = [c if isinstance(c, Column) else Column(c) for c in columns]
+        self.names = [c.key for c in self.columns]
+        self._steps = []
+        for col in self.columns:
+            if col.kind in _PAGE_FIELDS:
+                self._steps.append((_PAGE_FIELDS[col.kind], None, None, col.default, True))
+                continue
+            if col.kind is not None and col.kind not in DECODERS:
+                raise ValueError(f"Unknown column kind: {col.kind}")
+            value_key = "date" if col.kind == "date_end" else col.kind
+            self._steps.append((col.prop, DECODERS.get(col.kind), value_key, col.default, False))
+
+    @classmethod
+    def from_schema(cls, properties: Dict[str, Dict], names: Iterable[str]) -> "PageDecoder":
+        """Build a decoder whose kinds come from a ``databases.retrieve`` schema."""
+        return cls([Column(name, properties[name]["type"]) for name in names])
+
+    def row(self, page: Dict) -> Tuple:
+        """Return the requested columns of ``page`` as a tuple."""
+        props = page.get("properties", {})
+        out = []
+        for prop, decode, value_key, default, from_page in self._steps:
+            if from_page:
+                value = page.get(prop)
+            else:
+                raw = props.get(prop)
+                if raw is None:
+                    value = None
+                elif decode is None:
+                    ptype = raw.get("type")
+                    value = DECODERS.get(ptype, _identity)(raw.get(ptype))
+                else:
+                    value = decode(raw.get(value_key))
+            out.append(default if value is None else value)
+        return tuple(out)
+
+    def decode(self, page: Dict) -> Dict[str, Any]:
+        """Return the requested columns of ``page`` as a dict."""
+        return dict(zip(self.names, self.row(page)))
+
+    def rows(self, pages: Iterable[Dict]) -> Iterator[Tuple]:
+        """Yield one tuple per page."""
+        row = self.row
+        for page in pages:
+            yield row(page)
+
+    def column_arrays(self, pages: Iterable[Dict], *, arrays: bool = False) -> Dict[str, Any]:
+        """Return the decoded values column by column.
+
+        With ``arrays`` and NumPy installed every column becomes an array, so
+        numeric columns can be aggregated with vectorised operations.
+        """
+        data = list(zip(*self.rows(pages))) or [()] * len(self.names)
+        if not arrays or np is None:
+            return {name: list(values) for name, values in zip(self.names, data)}
+        out = {}
+        for col, values in zip(self.columns, data):
+            if col.kind in _SEQUENCE_KINDS:
+                arr = np.empty(len(values), dtype=object)
+                for i, value in enumerate(values):
+                    arr[i] = value
+                out[col.key] = arr
+            else:
+                out[col.key] = np.asarray(values)
+        return out
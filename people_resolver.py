@@ -0,0 +1,129 @@
+"""Resolve emails and names to Notion user ids with one cached user listing."""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+from config import PEOPLE_CACHE_FILE, PEOPLE_CACHE_TTL
+from logging_utils import get_logger
+
+log = get_logger(__name__)
+
+
+def workspace_key(client) -> str:
+    """Return a stable cache key for the workspace of ``client``."""
+    token = getattr(getattr(client, "options", None), "auth", None)
+    if not isinstance(token, str):
+        return "default"
+    return hashlib.sha1(token.encode("utf-8")).hexdigest()[:12]
+
+
+class PeopleResolver:
+    """Map emails and display names to user ids.
+
+    ``loader`` returns every workspace user (``users.list`` results). It is
+    called at most once per ``ttl`` seconds; the index is kept in
+    ``cache_file`` under ``key`` so later runs skip the listing entirely.
+    Names shared by several users are not resolved.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], List[Dict]],
+        *,
+        key: str = "default",
+        cache_file: Optional[str] = PEOPLE_CACHE_FILE,
+        ttl: float = PEOPLE_CACHE_TTL,
+    ) -> None:
+        self.loader = loader
+        self.key = key
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.index: Optional[Dict[str, str]] = None
+        self._lock = threading.Lock()
+
+    def _read_cache(self) -> Optional[Dict[str, str]]:
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return None
+        try:
+            with open(self.cache_file, encoding="utf-8") as fh:
+                entry = json.load(fh).get(self.key)
+        except (OSError, ValueError):
+            return None
+        if not entry or time.time() - entry.get("fetched_at", 0) > self.ttl:
+            return None
+        return entry.get("index")
+
+    def _write_cache(self, index: Dict[str, str]) -> None:
+        if not self.cache_file:
+            return
+        data: Dict = {}
+        try:
+            with open(self.cache_file, encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            pass
+        data[self.key] = {"fetched_at": time.time(), "index": index}
+        tmp_path = f"{self.cache_file}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, ensure_ascii=False)
+        os.replace(tmp_path, self.cache_file)
+
+    @staticmethod
+    def build_index(users: Iterable[Dict]) -> Dict[str, str]:
+        """Build a lower-cased email/name -> id index."""
+        index: Dict[str, str] = {}
+        ambiguous = set()
+        for user in users:
+            uid = user.get("id")
+            if not uid:
+                continue
+            index[uid] = uid
+            email = (user.get("person") or {}).get("email")
+            if email:
+                index[email.lower()] = uid
+            name = (user.get("name") or "").strip().lower()
+            if name:
+                if name in index and index[name] != uid:
+                    ambiguous.add(name)
+                index[name] = uid
+        for name in ambiguous:
+            index.pop(name, None)
+        return index
+
+    def load(self) -> Dict[str, str]:
+        """Return the index, reading the disk cache or listing users once."""
+        with self._lock:
+            if self.index is None:
+                self.index = self._read_cache()
+                if self.index is None:
+                    self.index = self.build_index(self.loader())
+                    self._write_cache(self.index)
+                    log.info("노션 사용자 %d명 목록을 캐시했습니다", len(self.index))
+            return self.index
+
+    def resolve(self, value) -> Optional[str]:
+        """Return the user id for an email, name, id or ``{"email": ...}``."""
+        if isinstance(value, dict):
+            value = value.get("email") or (value.get("person") or {}).get("email") or value.get("name")
+        if not isinstance(value, str) or not value.strip():
+            return None
+        uid = self.load().get(value.strip().lower())
+        if not uid:
+            log.warning("노션 사용자를 찾을 수 없습니다: %s", value)
+        return uid
+
+    def resolve_many(self, values: Iterable) -> List[Dict[str, str]]:
+        """Resolve values in bulk into ``[{"id": ...}]`` skipping unknown ones."""
+        self.load()
+        ids = []
+        for value in values:
+            uid = self.resolve(value)
+            if uid and {"id": uid} not in ids:
+                ids.append({"id": uid})
+        return ids
+
+# Example usage:
+# resolver = PeopleResolver(lambda: list_users(client=notion), key=workspace_key(notion))
+# resolver.resolve_many(["kim@example.com", "홍길동"])
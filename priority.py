@@ -0,0 +1,159 @@
+"""Priority classes and weighted fair scheduling of per-service budgets.
+
+Every outbound call belongs to a priority class taken from a context
+variable (see :func:`priority`); code that does not set one is on the
+provisioning path and counts as ``critical``. Calendar sync and the watch
+daemon run as ``sync``, Slack messages as ``notify`` and Slack log posts as
+``background``.
+
+A :class:`PriorityScheduler` hands out the tokens of one service's
+:class:`rate_limit.RateLimiter`. Waiting calls are ordered by weighted fair
+queuing: each class advances its own virtual clock by ``1 / weight`` per
+call, so under contention the classes get tokens in proportion to
+``PRIORITY_WEIGHTS`` while an idle class does not bank credit. Classes with
+a maximum wait in ``PRIORITY_MAX_WAIT`` are deferred up to that long and then
+shed (``acquire`` returns ``False``); a maximum of ``0`` only goes ahead when
+a token is free and nobody else is waiting.
+"""
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+from config import PRIORITY_MAX_WAIT, PRIORITY_WEIGHTS, SLACK_RATE_LIMIT
+from deadlines import check_deadline
+from logging_utils import get_logger
+from metrics import metrics
+from rate_limit import RateLimiter
+
+log = get_logger(__name__)
+
+DEFAULT_PRIORITY = "critical"
+
+
+class RequestShed(Exception):
+    """Raised when a low-priority call is dropped to protect the budget."""
+
+
+_priority: ContextVar[str] = ContextVar("priority", default=DEFAULT_PRIORITY)
+
+
+def current_priority() -> str:
+    """Return the priority class of the calling context."""
+    return _priority.get()
+
+
+@contextmanager
+def priority(name: str) -> Iterator[str]:
+    """Run the enclosed block (and threads started from it) as class ``name``."""
+    token = _priority.set(name)
+    try:
+        yield name
+    finally:
+        _priority.reset(token)
+
+
+def parse_classes(spec: str) -> Dict[str, float]:
+    """Parse ``"critical=8,sync=4"`` into ``{class: number}``."""
+    values: Dict[str, float] = {}
+    for part in spec.split(","):
+        if "=" in part:
+            name, value = part.split("=", 1)
+            values[name.strip()] = float(value)
+    return values
+
+
+class _Ticket:
+    __slots__ = ("tag", "seq")
+
+    def __init__(self, tag: float, seq: int) -> None:
+        self.tag = tag
+        self.seq = seq
+
+
+class PriorityScheduler:
+    """Grant the tokens of ``limiter`` to priority classes by weight."""
+
+    def __init__(
+        self,
+        name: str,
+        limiter: RateLimiter,
+        *,
+        weights: Optional[Dict[str, float]] = None,
+        max_wait: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self.name = name
+        self.limiter = limiter
+        self.weights = dict(weights or parse_classes(PRIORITY_WEIGHTS))
+        self.max_wait = dict(parse_classes(PRIORITY_MAX_WAIT) if max_wait is None else max_wait)
+        self._cond = threading.Condition()
+        self._waiting: List[_Ticket] = []
+        self._finish: Dict[str, float] = {}
+        self._clock = 0.0
+        self._seq = itertools.count()
+
+    def _head(self) -> Optional[_Ticket]:
+        return min(self._waiting, key=lambda t: (t.tag, t.seq), default=None)
+
+    def acquire(self, cls: Optional[str] = None) -> bool:
+        """Wait for a token in the order of class weights.
+
+        Returns ``False`` when the call was shed after its class's maximum
+        wait. Raises :class:`deadlines.DeadlineExceeded` if the active
+        deadline passes while waiting.
+        """
+        cls = cls or current_priority()
+        weight = self.weights.get(cls, 1.0)
+        limit = self.max_wait.get(cls)
+        started = time.monotonic()
+        with self._cond:
+            if limit == 0:
+                if self._waiting or not self.limiter.try_acquire():
+                    return self._shed(cls)
+                return self._granted(cls, started, self._clock)
+            start = max(self._finish.get(cls, 0.0), self._clock)
+            ticket = _Ticket(start + 1.0 / weight, next(self._seq))
+            self._finish[cls] = ticket.tag
+            self._waiting.append(ticket)
+            try:
+                while True:
+                    check_deadline(f"{self.name} 대기")
+                    wait = None
+                    if self._head() is ticket:
+                        if self.limiter.try_acquire():
+                            return self._granted(cls, started, start)
+                        wait = max(0.001, (1 - self.limiter.available()) / self.limiter.rate)
+                    if limit is not None:
+                        left = started + limit - time.monotonic()
+                        if left <= 0:
+                            return self._shed(cls)
+                        wait = left if wait is None else min(wait, left)
+                    self._cond.wait(wait if wait is not None else 0.5)
+            finally:
+                self._waiting.remove(ticket)
+                self._cond.notify_all()
+
+    def _granted(self, cls: str, started: float, start: float) -> bool:
+        self._clock = max(self._clock, start)
+        metrics.incr(f"scheduler.{self.name}.{cls}.granted")
+        metrics.observe(f"scheduler.{self.name}.{cls}.wait", time.monotonic() - started)
+        return True
+
+    def _shed(self, cls: str) -> bool:
+        metrics.incr(f"scheduler.{self.name}.{cls}.shed")
+        log.debug("%s 요청 제한으로 %s 작업을 건너뜁니다", self.name, cls)
+        return False
+
+    def waiting(self) -> int:
+        """Return the number of calls currently waiting for a token."""
+        with self._cond:
+            return len(self._waiting)
+
+
+# Budget of Slack posts (messages and log webhooks) shared by all classes
+slack_scheduler = PriorityScheduler("slack", RateLimiter(SLACK_RATE_LIMIT))
+
+# Example usage:
+# with priority("sync"):
+#     sync_notion_calendar(db_id)
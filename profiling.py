@@ -0,0 +1,127 @@
+"""Per-phase timing spans for profiling a run.
+
+``profiler.span(name)`` measures wall and CPU time of a phase. Outbound API
+calls report their duration with :meth:`Profiler.add_api_time`, which is
+attributed to the phase that is active in the calling context (the phase is
+a context variable, so it follows ``asyncio.to_thread`` into worker
+threads). Nested spans are recorded under ``parent/child`` paths.
+
+CPU time is process-wide, so phases running concurrently share it, and API
+time is summed over concurrent calls and can exceed the wall time.
+"""
+import cProfile
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+from logging_utils import get_logger
+from metrics import metrics
+
+log = get_logger(__name__)
+
+_phase: ContextVar[str] = ContextVar("profiling_phase", default="")
+
+
+def current_phase() -> str:
+    """Return the path of the innermost active span (``""`` outside spans)."""
+    return _phase.get()
+
+
+class Profiler:
+    """Accumulate wall, CPU and API time per phase path."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.phases: Dict[str, Dict[str, float]] = {}
+
+    def _entry(self, path: str) -> Dict[str, float]:
+        return self.phases.setdefault(path, {"count": 0, "wall": 0.0, "cpu": 0.0, "api": 0.0})
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[str]:
+        """Time the enclosed block as phase ``name``."""
+        parent = _phase.get()
+        path = f"{parent}/{name}" if parent else name
+        token = _phase.set(path)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield path
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            _phase.reset(token)
+            with self._lock:
+                entry = self._entry(path)
+                entry["count"] += 1
+                entry["wall"] += wall
+                entry["cpu"] += cpu
+            metrics.observe(f"phase.{path}.seconds", wall)
+
+    def add_api_time(self, seconds: float) -> None:
+        """Attribute the duration of an outbound call to the active phase."""
+        path = _phase.get()
+        if not path:
+            return
+        with self._lock:
+            self._entry(path)["api"] += seconds
+
+    @contextmanager
+    def api_call(self) -> Iterator[None]:
+        """Measure the enclosed outbound call as API time."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_api_time(time.perf_counter() - started)
+
+    def breakdown(self) -> List[Dict]:
+        """Return the phases sorted by wall time, longest first."""
+        with self._lock:
+            rows = [dict(entry, phase=path) for path, entry in self.phases.items()]
+        rows.sort(key=lambda r: r["wall"], reverse=True)
+        return rows
+
+    def format_breakdown(self) -> str:
+        """Render :meth:`breakdown` as a fixed-width table."""
+        rows = self.breakdown()
+        width = max([len("phase")] + [len(r["phase"]) for r in rows])
+        lines = [f"{'phase':<{width}}  {'count':>5}  {'wall(s)':>8}  {'api(s)':>8}  {'cpu(s)':>8}"]
+        for r in rows:
+            lines.append(
+                f"{r['phase']:<{width}}  {r['count']:>5}  {r['wall']:>8.3f}"
+                f"  {r['api']:>8.3f}  {r['cpu']:>8.3f}"
+            )
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.phases.clear()
+
+
+profiler = Profiler()
+
+
+@contextmanager
+def profiled(output: Optional[str] = None, *, top: int = 30) -> Iterator[Profiler]:
+    """Profile the enclosed block and print the phase breakdown afterwards.
+
+    With ``output`` the main thread also runs under :mod:`cProfile` and the
+    stats are written to that file (readable with ``python -m pstats``);
+    the ``top`` cumulative entries are printed as well.
+    """
+    profiler.reset()
+    cprof = cProfile.Profile() if output else None
+    if cprof:
+        cprof.enable()
+    try:
+        yield profiler
+    finally:
+        if cprof:
+            cprof.disable()
+            cprof.dump_stats(output)
+            pstats.Stats(cprof).sort_stats("cumulative").print_stats(top)
+            log.info("cProfile 결과 저장: %s", output)
+        print(profiler.format_breakdown())
@@ -0,0 +1,66 @@
+"""Token bucket rate limiter shared by threads and asyncio tasks."""
+import asyncio
+import threading
+import time
+
+
+class RateLimiter:
+    """Allow at most ``rate`` calls per second with bursts up to ``burst``.
+
+    :meth:`acquire` blocks the calling thread, which suits the synchronous
+    Notion client that is also used from worker threads.
+    :meth:`acquire_async` waits without blocking the event loop.
+    """
+
+    def __init__(self, rate: float, burst: int | None = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = float(burst or max(1, int(rate)))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take one token and return how long the caller must wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        """Block until a call may be made."""
+        delay = self._reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """Wait in the event loop until a call may be made."""
+        delay = self._reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+    def try_acquire(self) -> bool:
+        """Take a token only if one is available right now."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def available(self) -> float:
+        """Return the tokens currently available (may be negative)."""
+        with self._lock:
+            elapsed = time.monotonic() - self._updated
+            return min(self.burst, self._tokens + elapsed * self.rate)
+
+# Example usage:
+# limiter = RateLimiter(3)
+# limiter.acquire()
@@ -0,0 +1,106 @@
+"""Single-flight coalescing and a short-TTL memo for Notion reads."""
+import copy
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, Hashable, Tuple
+from config import READ_CACHE_TTL
+from metrics import metrics
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Share one in-flight call among concurrent callers with the same key."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            metrics.incr("read_cache.coalesced")
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as exc:
+                call.error = exc
+            finally:
+                with self._lock:
+                    self._calls.pop(key, None)
+                call.done.set()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+
+class ReadCache:
+    """Memoize read results for ``ttl`` seconds on top of :class:`SingleFlight`.
+
+    Keys are tuples whose first item names the resource, e.g.
+    ``("databases.retrieve", db_id)``. Writes must call :meth:`invalidate`
+    for the resource they change. Callers receive copies, so mutating a result
+    never changes the cached value.
+    """
+
+    def __init__(self, ttl: float = READ_CACHE_TTL) -> None:
+        self.ttl = ttl
+        self.flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._memo: Dict[Tuple, Tuple[float, Any]] = {}
+        self._generation: Dict[Tuple, int] = {}
+
+    def get(self, key: Tuple, loader: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            hit = self._memo.get(key)
+            generation = self._generation.get(key, 0)
+        if hit and now - hit[0] < self.ttl:
+            metrics.incr("read_cache.hits")
+            return copy.deepcopy(hit[1])
+        metrics.incr("read_cache.misses")
+        value = self.flight.do((key, generation), loader)
+        with self._lock:
+            # Do not store a result that a concurrent write already invalidated
+            if self._generation.get(key, 0) == generation:
+                self._memo[key] = (now, value)
+        return copy.deepcopy(value)
+
+    def invalidate(self, key: Tuple) -> None:
+        with self._lock:
+            self._memo.pop(key, None)
+            self._generation[key] = self._generation.get(key, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in self._memo:
+                self._generation[key] = self._generation.get(key, 0) + 1
+            self._memo.clear()
+
+
+_caches: "weakref.WeakKeyDictionary[Any, ReadCache]" = weakref.WeakKeyDictionary()
+_caches_lock = threading.Lock()
+
+
+def cache_for(client: Any) -> ReadCache:
+    """Return the read cache of a Notion client."""
+    with _caches_lock:
+        cache = _caches.get(client)
+        if cache is None:
+            cache = _caches[client] = ReadCache()
+        return cache
+
+# Example usage:
+# schema = cache_for(notion).get(("databases.retrieve", db_id),
+#                                lambda: notion.databases.retrieve(db_id))
@@ -0,0 +1,203 @@
+"""Retry policy engine with backoff, jitter and per-endpoint budgets."""
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional
+from config import (
+    RETRY_BASE_DELAY,
+    RETRY_BUDGET,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_MAX_DELAY,
+)
+from deadlines import DeadlineExceeded, check_deadline, current_deadline
+from logging_utils import get_logger
+
+log = get_logger(__name__)
+
+# HTTP status codes worth retrying. 429 means the request was rejected before
+# doing anything; the 5xx codes may or may not have been applied.
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+# Connection-level failures where the request never reached the server
+_UNSENT_ERRORS = ("ConnectError", "ConnectTimeout", "PoolTimeout")
+# Failures where the request may have been applied
+_AMBIGUOUS_ERRORS = (
+    "RequestTimeoutError",
+    "ReadTimeout",
+    "WriteTimeout",
+    "ReadError",
+    "RemoteProtocolError",
+    "TimeoutError",
+    "ConnectionResetError",
+)
+
+
+def error_status(exc: BaseException) -> Optional[int]:
+    """Return the HTTP status of a Notion, httpx or Google API error."""
+    status = getattr(exc, "status", None)
+    if status is None and getattr(exc, "resp", None) is not None:
+        status = getattr(exc.resp, "status", None)
+    if status is None and getattr(exc, "response", None) is not None:
+        status = getattr(exc.response, "status_code", None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def classify(exc: BaseException) -> Optional[str]:
+    """Return ``"unsent"``, ``"ambiguous"`` or ``None`` (not retryable).
+
+    ``unsent`` errors can always be retried. ``ambiguous`` errors may have
+    been applied by the server, so non-idempotent calls need a check first.
+    """
+    status = error_status(exc)
+    if status is not None:
+        if status == 429:
+            return "unsent"
+        return "ambiguous" if status in RETRYABLE_STATUS else None
+    names = {cls.__name__ for cls in type(exc).__mro__}
+    if names & set(_UNSENT_ERRORS):
+        return "unsent"
+    if names & set(_AMBIGUOUS_ERRORS):
+        return "ambiguous"
+    return None
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """Return the server supplied ``Retry-After`` delay in seconds."""
+    headers = getattr(exc, "headers", None)
+    if headers is None and getattr(exc, "resp", None) is not None:
+        headers = exc.resp
+    try:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        return float(value) if value is not None else None
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter."""
+
+    def __init__(
+        self,
+        max_attempts: int = RETRY_MAX_ATTEMPTS,
+        base_delay: float = RETRY_BASE_DELAY,
+        max_delay: float = RETRY_MAX_DELAY,
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, exc: Optional[BaseException] = None) -> float:
+        """Return the sleep before retry number ``attempt`` (1-based)."""
+        hinted = retry_after(exc) if exc is not None else None
+        if hinted is not None:
+            return min(self.max_delay, hinted)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class RetryBudget:
+    """Limit the total number of retries per endpoint.
+
+    A shared budget keeps a degraded endpoint from turning every call of a
+    run into ``max_attempts`` requests. Each run (and each poll of the watch
+    daemon) gets its own budget through :func:`retry_budget_scope`, so a
+    long-lived process is not left without retries once it has spent one.
+    """
+
+    def __init__(self, per_endpoint: int = RETRY_BUDGET) -> None:
+        self.per_endpoint = per_endpoint
+        self.used: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def take(self, endpoint: str) -> bool:
+        """Consume one retry of ``endpoint`` if any is left."""
+        with self._lock:
+            if self.used.get(endpoint, 0) >= self.per_endpoint:
+                return False
+            self.used[endpoint] = self.used.get(endpoint, 0) + 1
+            return True
+
+    def reset(self) -> None:
+        with self._lock:
+            self.used.clear()
+
+
+DEFAULT_POLICY = RetryPolicy()
+# Used by calls outside any retry_budget_scope (one-shot scripts)
+DEFAULT_BUDGET = RetryBudget()
+
+_budget: ContextVar[Optional[RetryBudget]] = ContextVar("retry_budget", default=None)
+
+
+def current_budget() -> RetryBudget:
+    """Return the retry budget of the calling context."""
+    return _budget.get() or DEFAULT_BUDGET
+
+
+@contextmanager
+def retry_budget_scope(budget: Optional[RetryBudget] = None) -> Iterator[RetryBudget]:
+    """Give the enclosed block (and threads started from it) a fresh budget."""
+    budget = budget or RetryBudget()
+    token = _budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _budget.reset(token)
+
+
+def call_with_retry(
+    endpoint: str,
+    fn: Callable[..., Any],
+    *args,
+    safe: bool = True,
+    recover: Optional[Callable[[], Any]] = None,
+    policy: Optional[RetryPolicy] = None,
+    budget: Optional[RetryBudget] = None,
+    **kwargs,
+) -> Any:
+    """Call ``fn`` and retry transient failures.
+
+    ``safe`` marks idempotent calls that may be repeated blindly. For other
+    calls an ambiguous failure is only retried when ``recover`` is given: it
+    is called first and should look up the marker written by the original
+    request, returning the created object or ``None`` if it does not exist.
+    No attempt starts after the active deadline and a retry whose backoff
+    would outlast it fails with :class:`deadlines.DeadlineExceeded`.
+    """
+    policy = policy or DEFAULT_POLICY
+    budget = budget or current_budget()
+    attempt = 1
+    while True:
+        check_deadline(endpoint)
+        try:
+            return fn(*args, **kwargs)
+        except Exception as exc:
+            kind = classify(exc)
+            if (
+                kind is None
+                or attempt >= policy.max_attempts
+                or (kind == "ambiguous" and not safe and recover is None)
+                or not budget.take(endpoint)
+            ):
+                raise
+            wait = policy.delay(attempt, exc)
+            deadline = current_deadline()
+            if deadline is not None and deadline.remaining() <= wait:
+                raise DeadlineExceeded(f"{endpoint} 재시도 전 기한 초과: {exc}") from exc
+            log.warning(
+                "%s 일시 오류로 %.2f초 후 재시도 (%d/%d): %s",
+                endpoint, wait, attempt, policy.max_attempts - 1, exc,
+            )
+            time.sleep(wait)
+            if kind == "ambiguous" and not safe:
+                existing = recover()
+                if existing is not None:
+                    log.info("%s 이전 요청이 이미 반영되어 재시도를 생략합니다", endpoint)
+                    return existing
+            attempt += 1
+
+# Example usage:
+# call_with_retry("pages.retrieve", notion.pages.retrieve, page_id)
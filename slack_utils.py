@@ -1,6 +1,10 @@
 """Helper functions for sending Slack notifications."""
 import asyncio
+import threading
+import time
 import traceback
+from collections import deque
+from typing import Dict, List, Optional, Tuple
 from slack_sdk.web.async_client import AsyncWebClient
 from slack_sdk.webhook import WebhookClient
 from config import (
@@ -8,24 +12,43 @@ from config import (
     SLACK_CHANNEL,
     SLACK_WEBHOOK_URL,
     SLACK_ERROR_WEBHOOK_URL,
+    SLACK_LOG_DEDUP_WINDOW,
+    SLACK_LOG_LEVEL,
+    SLACK_LOG_MAX_PER_MINUTE,
+    SLACK_LOG_ROUTES,
 )
 import logging
+from profiling import profiler
+from tracing import tracer
+from circuit_breaker import CircuitOpenError, get_breaker
 from logging_utils import get_logger
+from priority import PriorityScheduler, slack_scheduler
 
 log = get_logger(__name__)
+_breaker = get_breaker("slack")
 
 slack_client = AsyncWebClient(token=SLACK_BOT_TOKEN) if SLACK_BOT_TOKEN else None
 webhook_client = WebhookClient(SLACK_WEBHOOK_URL) if SLACK_WEBHOOK_URL else None
 
 
 async def send_message(text: str, channel: str = SLACK_CHANNEL) -> None:
-    """Post a simple message to Slack."""
+    """Post a simple message to Slack.
+
+    Messages share the Slack budget as ``notify`` work: they wait behind
+    higher classes and are dropped after ``PRIORITY_MAX_WAIT``.
+    """
     if not slack_client:
         log.debug("슬랙 클라이언트 미설정")
         return
+    if not await asyncio.to_thread(slack_scheduler.acquire, "notify"):
+        log.warning("슬랙 전송 한도 초과로 메시지를 건너뜁니다")
+        return
     try:
-        await slack_client.chat_postMessage(channel=channel, text=text)
+        with profiler.api_call(), tracer.call("slack", "chat.postMessage"):
+            await _breaker.call_async(slack_client.chat_postMessage, channel=channel, text=text)
         log.info("%s 채널로 슬랙 메시지 전송", channel)
+    except CircuitOpenError:
+        log.debug("슬랙 서킷 열림으로 메시지 전송 건너뜀")
     except Exception as e:
         log.error("슬랙 API 오류: %s", e)
 
@@ -35,47 +58,147 @@ def send_error_webhook(exc: BaseException) -> None:
     if not webhook_client:
         return
     trace_text = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
+    if not slack_scheduler.acquire("notify"):
+        return
     try:
-        webhook_client.send(text=f"❗️ 오류 발생\n```{trace_text}```")
+        _breaker.call(
+            tracer.wrap("slack", "webhook", webhook_client.send),
+            text=f"❗️ 오류 발생\n```{trace_text}```",
+        )
+    except CircuitOpenError:
+        log.debug("슬랙 서킷 열림으로 웹훅 전송 건너뜀")
     except Exception as err:
         log.error("웹훅 전송 실패: %s", err)
 
 
-class SlackLogHandler(logging.Handler):
-    """Logging handler that posts records to Slack via webhook."""
+def parse_log_routes(spec: str) -> Dict[str, int]:
+    """Parse ``"name=LEVEL,..."`` into a logger name -> level mapping."""
+    routes: Dict[str, int] = {}
+    for part in spec.split(","):
+        name, _, level = part.partition("=")
+        if name.strip() and level.strip():
+            routes[name.strip()] = logging.getLevelName(level.strip().upper())
+    return routes
 
-    EMOJIS = {
-        logging.DEBUG: "🔍",
-        logging.INFO: "✅",
-        logging.WARNING: "⚠️",
-        logging.ERROR: "❌",
-        logging.CRITICAL: "💥",
-    }
 
-    def __init__(self) -> None:
+class SlackLogFilter(logging.Filter):
+    """Decide which records :class:`SlackLogHandler` actually posts.
+
+    * Routing: each logger needs the level of its longest matching route in
+      ``routes`` (``default_level`` otherwise), which keeps third-party debug
+      output out of Slack.
+    * Deduplication: records sharing a fingerprint (logger, level and message
+      template) within ``window`` seconds are collapsed. The next record after
+      the window carries ``slack_repeats`` with the number suppressed.
+      Fingerprints whose window passed without repeats are forgotten, so a
+      long-running process does not keep every message it ever logged.
+    * Rate cap: at most ``max_per_minute`` records pass per minute. Dropped
+      records are counted and reported by :meth:`drain`.
+
+    Records that passed but could not be posted (no Slack budget, open
+    circuit) are handed back with :meth:`unsent` and reported separately.
+    """
+
+    def __init__(
+        self,
+        routes: Optional[Dict[str, int]] = None,
+        *,
+        default_level: int | str = SLACK_LOG_LEVEL,
+        window: float = SLACK_LOG_DEDUP_WINDOW,
+        max_per_minute: int = SLACK_LOG_MAX_PER_MINUTE,
+    ) -> None:
         super().__init__()
-        self.webhook = WebhookClient(SLACK_WEBHOOK_URL) if SLACK_WEBHOOK_URL else None
-        self.error_webhook = (
-            WebhookClient(SLACK_ERROR_WEBHOOK_URL)
-            if SLACK_ERROR_WEBHOOK_URL
-            else None
-        )
+        self.routes = parse_log_routes(SLACK_LOG_ROUTES) if routes is None else routes
+        if isinstance(default_level, str):
+            default_level = logging.getLevelName(default_level.upper())
+        self.default_level = default_level
+        self.window = window
+        self.max_per_minute = max_per_minute
+        self.dropped = 0
+        self.shed = 0
+        self._seen: Dict[Tuple, List] = {}
+        self._pruned = time.monotonic()
+        self._sent: deque = deque()
+        self._lock = threading.Lock()
 
-    def emit(self, record: logging.LogRecord) -> None:
-        if not self.webhook:
-            return
-        prefix = self.EMOJIS.get(record.levelno, "")
-        text = f"{prefix} {self.format(record)}"
-        try:
-            self.webhook.send(text=text)
-            if record.levelno >= logging.ERROR and self.error_webhook:
-                self.error_webhook.send(text=text)
-        except Exception as exc:  # pragma: no cover - network errors
-            log.error("SlackLogHandler 오류: %s", exc)
+    def _min_level(self, name: str) -> int:
+        best, level = -1, self.default_level
+        for prefix, route_level in self.routes.items():
+            if (name == prefix or name.startswith(prefix + ".")) and len(prefix) > best:
+                best, level = len(prefix), route_level
+        return level
+
+    @staticmethod
+    def fingerprint(record: logging.LogRecord) -> Tuple:
+        exc_type = record.exc_info[0].__name__ if record.exc_info and record.exc_info[0] else ""
+        return record.name, record.levelno, str(record.msg), exc_type
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < self._min_level(record.name):
+            return False
+        now = time.monotonic()
+        key = self.fingerprint(record)
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry and now - entry[0] < self.window:
+                entry[1] += 1
+                return False
+            while self._sent and now - self._sent[0] >= 60:
+                self._sent.popleft()
+            if len(self._sent) >= self.max_per_minute:
+                self.dropped += 1
+                return False
+            self._sent.append(now)
+            record.slack_repeats = entry[1] if entry else 0
+            self._seen[key] = [now, 0, record.getMessage()]
+            if now - self._pruned >= self.window:
+                self._prune(now)
+        return True
+
+    def _prune(self, now: float) -> None:
+        """Forget fingerprints past their window with no pending repeats."""
+        self._seen = {
+            key: entry
+            for key, entry in self._seen.items()
+            if entry[1] or now - entry[0] < self.window
+        }
+        self._pruned = now
+
+    def unsent(self, record: logging.LogRecord) -> None:
+        """Count a passed record that was not posted and keep its repeats."""
+        with self._lock:
+            self.shed += 1
+            entry = self._seen.get(self.fingerprint(record))
+            if entry:
+                entry[1] += getattr(record, "slack_repeats", 0)
+
+    def drain(self) -> List[str]:
+        """Return and reset summaries of records that were never posted."""
+        with self._lock:
+            lines = [
+                f"{message} (외 {count}건 반복)"
+                for _, count, message in self._seen.values()
+                if count
+            ]
+            if self.dropped:
+                lines.append(f"분당 전송 한도로 {self.dropped}건 생략")
+            if self.shed:
+                lines.append(f"슬랙 전송 예산 부족(또는 서킷 열림)으로 {self.shed}건 미전송")
+            for entry in self._seen.values():
+                entry[1] = 0
+            self.dropped = 0
+            self.shed = 0
+            self._prune(time.monotonic())
+        return lines
 
 
 class SlackLogHandler(logging.Handler):
-    """Logging handler that posts records to Slack via webhook."""
+    """Logging handler that posts records to Slack via webhook.
+
+    Posts are ``background`` work on the Slack budget: a record is only sent
+    when a token is free and no other Slack call is waiting, otherwise it is
+    counted as unsent, so a log storm never delays messages or the run.
+    """
 
     EMOJIS = {
         logging.DEBUG: "🔍",
@@ -85,26 +208,56 @@ class SlackLogHandler(logging.Handler):
         logging.CRITICAL: "💥",
     }
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        log_filter: Optional[SlackLogFilter] = None,
+        scheduler: Optional[PriorityScheduler] = None,
+    ) -> None:
         super().__init__()
+        self.scheduler = scheduler or slack_scheduler
         self.webhook = WebhookClient(SLACK_WEBHOOK_URL) if SLACK_WEBHOOK_URL else None
         self.error_webhook = (
             WebhookClient(SLACK_ERROR_WEBHOOK_URL)
             if SLACK_ERROR_WEBHOOK_URL
             else None
         )
+        self.log_filter = log_filter or SlackLogFilter()
+        self.addFilter(self.log_filter)
 
     def emit(self, record: logging.LogRecord) -> None:
         if not self.webhook:
             return
+        if not self.scheduler.acquire("background"):
+            self.log_filter.unsent(record)
+            return
         prefix = self.EMOJIS.get(record.levelno, "")
         text = f"{prefix} {self.format(record)}"
+        repeats = getattr(record, "slack_repeats", 0)
+        if repeats:
+            text += f"\n(이전 {repeats}건 반복)"
         try:
-            self.webhook.send(text=text)
+            _breaker.call(tracer.wrap("slack", "webhook", self.webhook.send), text=text)
             if record.levelno >= logging.ERROR and self.error_webhook:
-                self.error_webhook.send(text=text)
+                _breaker.call(tracer.wrap("slack", "webhook", self.error_webhook.send), text=text)
+        except CircuitOpenError:
+            self.log_filter.unsent(record)
         except Exception as exc:  # pragma: no cover - network errors
-            log.error("SlackLogHandler failed: %s", exc)
+            log.error("SlackLogHandler 오류: %s", exc)
+
+    def close(self) -> None:
+        """Post a summary of suppressed records before closing."""
+        lines = self.log_filter.drain()
+        if lines and self.webhook and self.scheduler.acquire("notify"):
+            try:
+                _breaker.call(
+                    tracer.wrap("slack", "webhook", self.webhook.send),
+                    text="🔁 생략된 로그\n" + "\n".join(lines),
+                )
+            except CircuitOpenError:
+                log.debug("슬랙 서킷 열림으로 로그 요약 전송 건너뜀")
+            except Exception as exc:  # pragma: no cover - network errors
+                log.error("SlackLogHandler 오류: %s", exc)
+        super().close()
 
 # Example usage:
 # await send_message("hello")
@@ -0,0 +1,71 @@
+"""Small JSON file store for state that must survive between runs."""
+import json
+import os
+import threading
+from typing import Any, Dict
+from config import SYNC_STATE_FILE
+from logging_utils import get_logger
+
+log = get_logger(__name__)
+
+
+class StateStore:
+    """Namespaced key/value state persisted to a JSON file.
+
+    Values must be JSON serialisable. Changes are kept in memory until
+    :meth:`save` is called, which replaces the file atomically.
+    """
+
+    def __init__(self, path: str = SYNC_STATE_FILE) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._data: Dict[str, Dict[str, Any]] = self._read()
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError) as exc:
+            log.warning("상태 파일을 읽지 못해 새로 시작합니다 %s: %s", self.path, exc)
+            return {}
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        """Return the stored value or ``default``."""
+        with self._lock:
+            return self._data.get(namespace, {}).get(key, default)
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        """Store ``value`` under ``namespace``/``key``."""
+        with self._lock:
+            self._data.setdefault(namespace, {})[key] = value
+
+    def delete(self, namespace: str, key: str) -> None:
+        """Remove a key if present."""
+        with self._lock:
+            self._data.get(namespace, {}).pop(key, None)
+
+    def items(self, namespace: str) -> Dict[str, Any]:
+        """Return a copy of all values of a namespace."""
+        with self._lock:
+            return dict(self._data.get(namespace, {}))
+
+    def save(self) -> None:
+        """Write the state to disk atomically."""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        # Concurrent syncs share one store; serialise writers of the temp file
+        with self._save_lock:
+            with self._lock:
+                payload = json.dumps(self._data, ensure_ascii=False, indent=2)
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                fh.write(payload)
+            os.replace(tmp_path, self.path)
+
+# Example usage:
+# state = StateStore()
+# state.set("calendar_sync_tokens", "primary", token)
+# state.save()
@@ -0,0 +1,142 @@
+"""Deterministic synthetic rows for every database template.
+
+``generate_items(title, count, seed=...)`` lazily yields items in the same
+plain format as ``notion_templates.DUMMY_ITEMS`` so they can be passed to
+``encode_item`` unchanged. Values are drawn from a ``random.Random`` seeded
+with the seed and template title, so the same arguments always produce the
+same rows, and nothing is materialised up front.
+"""
+import math
+import random
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+import notion_templates as templates
+
+START_DATE = date(2024, 1, 1)
+DAYS = 366
+
+_TITLE_PREFIX = {
+    "직원목록": "직원",
+    "지출결의서": "지출",
+    "출장 요청서": "출장",
+    "휴가 기록서": "휴가",
+    "교육 수강 신청서": "교육",
+    "회사 일정 캘린더": "일정",
+    "휴가 및 출장 증빙서류": "증빙",
+}
+
+# Weighted select values; weights roughly follow a small company's records
+_SELECTS: Dict[str, Sequence[Tuple[str, int]]] = {
+    "부서": [("개발팀", 40), ("영업팀", 25), ("기획팀", 20), ("인사팀", 10), ("재무팀", 5)],
+    "직급": [("사원", 45), ("대리", 25), ("과장", 15), ("차장", 10), ("부장", 5)],
+    "계정과목": [("소모품비", 40), ("기타", 25), ("복리후생", 15), ("여비교통비", 15), ("교육훈련비", 5)],
+    "휴가유형": [("연차", 70), ("병가", 15), ("반차", 10), ("경조사", 5)],
+    "직원상태": [("재직", 90), ("퇴사", 10)],
+    "상태": [("미처리", 40), ("진행중", 25), ("승인됨", 25), ("반려", 10)],
+    "일정상태": [("예정", 60), ("진행중", 30), ("완료", 10)],
+}
+_WORDS: Dict[str, Sequence[str]] = {
+    "항목명": ("노트북", "모니터", "키보드", "마우스", "책상", "의자", "도서", "택시비", "식대", "소프트웨어"),
+    "출장지": ("서울", "부산", "대전", "인천", "광주", "대구", "울산", "제주"),
+    "출장목적": ("회의", "교육", "고객 미팅", "현장 점검", "세미나"),
+    "교육명": ("파이썬 기초", "데이터 분석", "머신러닝", "인공지능", "빅데이터", "리더십", "보안 교육"),
+    "설명": ("월간 회의", "신규 교육", "전사 회의", "팀 워크샵", "분기 리뷰", "채용 설명회"),
+}
+_SURNAMES = "김이박최정강조윤장임한오서신권황안송류홍"
+_GIVEN = ("민준", "서연", "도윤", "지우", "하준", "서윤", "시우", "지민", "예준", "수아", "길동", "철수", "영희")
+
+
+def _choice(rng: random.Random, name: str) -> str:
+    values, weights = zip(*_SELECTS[name])
+    return rng.choices(values, weights)[0]
+
+
+def _day(rng: random.Random) -> date:
+    # Business days are far more common than weekends
+    day = START_DATE + timedelta(days=rng.randrange(DAYS))
+    if day.weekday() >= 5 and rng.random() < 0.8:
+        day -= timedelta(days=day.weekday() - 4)
+    return day
+
+
+def _span(rng: random.Random, mean_days: float) -> Tuple[str, str]:
+    start = _day(rng)
+    length = min(int(rng.expovariate(1 / mean_days)), 14)
+    return start.isoformat(), (start + timedelta(days=length)).isoformat()
+
+
+def _amount(rng: random.Random) -> int:
+    # Log-normal: most expenses are tens of thousands of won, a few are large
+    return max(1000, int(round(rng.lognormvariate(math.log(120000), 1.0), -3)))
+
+
+def _attachment(rng: random.Random, n: int, stem: str) -> List[Dict]:
+    name = f"{stem}{n}.pdf"
+    return [{"name": name, "type": "external", "external": {"url": f"https://example.com/{name}"}}]
+
+
+# Field generators receive ``(rng, item so far, row number)``. Fields depending
+# on others (요청월, 휴가종료, 종료일) read the value generated before them.
+_FIELDS: Dict[str, Callable[[random.Random, Dict, int], Any]] = {
+    "이름": lambda rng, item, n: rng.choice(_SURNAMES) + rng.choice(_GIVEN),
+    "부서": lambda rng, item, n: _choice(rng, "부서"),
+    "직급": lambda rng, item, n: _choice(rng, "직급"),
+    "항목명": lambda rng, item, n: rng.choice(_WORDS["항목명"]),
+    "금액": lambda rng, item, n: _amount(rng),
+    "계정과목": lambda rng, item, n: _choice(rng, "계정과목"),
+    "요청일": lambda rng, item, n: _day(rng).isoformat(),
+    "요청월": lambda rng, item, n: item["요청일"][:7],
+    "요청자": lambda rng, item, n: [{"object": "user", "id": "dummy-user"}],
+    "출장지": lambda rng, item, n: rng.choice(_WORDS["출장지"]),
+    "출장기간": lambda rng, item, n: "/".join(_span(rng, 2)),
+    "출장목적": lambda rng, item, n: rng.choice(_WORDS["출장목적"]),
+    "휴가시작": lambda rng, item, n: _day(rng).isoformat(),
+    "휴가종료": lambda rng, item, n: (
+        date.fromisoformat(item["휴가시작"]) + timedelta(days=min(int(rng.expovariate(1 / 2)), 10))
+    ).isoformat(),
+    "휴가유형": lambda rng, item, n: _choice(rng, "휴가유형"),
+    "교육명": lambda rng, item, n: rng.choice(_WORDS["교육명"]),
+    "교육일": lambda rng, item, n: _day(rng).isoformat(),
+    "시작일": lambda rng, item, n: _day(rng).isoformat(),
+    "종료일": lambda rng, item, n: (
+        date.fromisoformat(item["시작일"]) + timedelta(days=rng.choice((0, 0, 0, 1, 2, 4)))
+    ).isoformat(),
+    "설명": lambda rng, item, n: rng.choice(_WORDS["설명"]),
+    "첨부파일": lambda rng, item, n: _attachment(rng, n, "receipt" if "금액" in item else "proof"),
+    "관련 요청": lambda rng, item, n: ["dummy-page"],
+}
+# 상태 options differ between templates
+_STATUS = {"직원목록": "직원상태", "회사 일정 캘린더": "일정상태"}
+
+
+def _fallback(ptype: str, rng: random.Random, n: int) -> Any:
+    if ptype == "people":
+        return []
+    if ptype == "number":
+        return rng.randrange(1000)
+    if ptype == "date":
+        return _day(rng).isoformat()
+    return f"값{n}"
+
+
+def generate_items(title: str, count: int, *, seed: int = 0) -> Iterator[Dict]:
+    """Yield ``count`` synthetic items for the template ``title``."""
+    template = templates.get_template(title)
+    if not template:
+        raise ValueError(f"Unknown template: {title}")
+    rng = random.Random(f"{seed}:{title}")
+    prefix = _TITLE_PREFIX.get(title, title)
+    status = _STATUS.get(title, "상태")
+    for n in range(1, count + 1):
+        item: Dict[str, Any] = {}
+        for name, prop in template["properties"].items():
+            ptype = next(iter(prop))
+            if ptype == "title":
+                item[name] = f"{prefix}{n}"
+            elif name == "상태":
+                item[name] = _choice(rng, status)
+            elif name in _FIELDS:
+                item[name] = _FIELDS[name](rng, item, n)
+            else:
+                item[name] = _fallback(ptype, rng, n)
+        yield item
@@ -0,0 +1,101 @@
+"""Provision many Notion workspaces concurrently from a tenant manifest.
+
+The manifest is a JSON list of objects::
+
+    [
+        {"name": "acme", "notion_token_env": "ACME_NOTION_TOKEN",
+         "parent_page_id": "...", "rate_limit": 3}
+    ]
+
+``notion_token`` may be given inline instead of ``notion_token_env``.
+Every tenant gets its own client and :class:`RateLimiter`, so one busy
+workspace cannot use up another workspace's request budget.
+"""
+import asyncio
+import json
+import os
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+from config import NOTION_RATE_LIMIT, TENANT_CONCURRENCY
+from logging_utils import get_logger
+from notion_db_utils import build_notion_client
+from rate_limit import RateLimiter
+from slack_utils import send_message
+
+log = get_logger(__name__)
+
+Runner = Callable[..., Awaitable[Dict]]
+
+
+def load_manifest(path: str) -> List[Dict]:
+    """Read and validate the tenant manifest."""
+    with open(path, encoding="utf-8") as fh:
+        tenants = json.load(fh)
+    if not isinstance(tenants, list):
+        raise ValueError("테넌트 매니페스트는 JSON 배열이어야 합니다")
+    for idx, tenant in enumerate(tenants):
+        tenant.setdefault("name", f"tenant-{idx + 1}")
+        if not tenant.get("parent_page_id"):
+            raise ValueError(f"{tenant['name']}: parent_page_id 가 없습니다")
+    return tenants
+
+
+def _tenant_token(tenant: Dict) -> Optional[str]:
+    env_name = tenant.get("notion_token_env")
+    return os.getenv(env_name) if env_name else tenant.get("notion_token")
+
+
+def _provision(runner: Runner, client, parent_page_id: str) -> Dict:
+    """Run ``runner`` on its own event loop so blocking calls stay isolated."""
+    return asyncio.run(runner(client, parent_page_id, notify=False))
+
+
+async def provision_tenant(tenant: Dict, runner: Runner, slots: asyncio.Semaphore) -> Dict:
+    """Provision one tenant and return its result summary."""
+    result = {"name": tenant["name"], "status": "skipped", "elapsed": 0.0}
+    token = _tenant_token(tenant)
+    if not token:
+        log.warning("%s: 노션 토큰이 없어 건너뜁니다", tenant["name"])
+        return result
+    limiter = RateLimiter(float(tenant.get("rate_limit", NOTION_RATE_LIMIT)))
+    client = build_notion_client(token, limiter=limiter)
+    async with slots:
+        started = time.perf_counter()
+        try:
+            stats = await asyncio.to_thread(
+                _provision, runner, client, tenant["parent_page_id"]
+            )
+            result.update(stats or {})
+            result["status"] = "deadline" if result.get("timed_out") else "ok"
+        except Exception as exc:
+            log.error("%s: 워크스페이스 생성 실패: %s", tenant["name"], exc)
+            result.update(status="error", error=str(exc))
+        result["elapsed"] = round(time.perf_counter() - started, 2)
+    log.info("%s: %s (%.2fs)", tenant["name"], result["status"], result["elapsed"])
+    return result
+
+
+def format_summary(results: List[Dict]) -> str:
+    """Return a one-line-per-tenant summary for Slack."""
+    ok = sum(1 for r in results if r["status"] == "ok")
+    lines = [f"🏢 테넌트 생성 결과: {ok}/{len(results)} 성공"]
+    for r in results:
+        detail = r.get("error") or f"DB {r.get('databases', 0)}개, 페이지 {r.get('pages', 0)}건"
+        lines.append(f"- {r['name']}: {r['status']} ({r['elapsed']}s) {detail}")
+    return "\n".join(lines)
+
+
+async def run_tenants(
+    tenants: List[Dict], runner: Runner, concurrency: int = TENANT_CONCURRENCY
+) -> List[Dict]:
+    """Provision all tenants with at most ``concurrency`` running at once."""
+    slots = asyncio.Semaphore(max(1, concurrency))
+    results = await asyncio.gather(
+        *(provision_tenant(t, runner, slots) for t in tenants)
+    )
+    await send_message(format_summary(results))
+    return list(results)
+
+# Example usage:
+# from main import run
+# asyncio.run(run_tenants(load_manifest("tenants.json"), run))
@@ -0,0 +1,155 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import gzip
+from unittest.mock import MagicMock, patch
+import backup
+from file_uploads import FileUploader
+
+
+def _client(pages_per_db):
+    client = MagicMock()
+    client.blocks.children.list.return_value = {
+        "results": [{"id": db, "type": "child_database"} for db in pages_per_db],
+        "next_cursor": None,
+    }
+    client.databases.retrieve.side_effect = lambda db_id: {
+        "title": [{"plain_text": db_id}],
+        "properties": {
+            "제목": {"id": "title", "type": "title", "title": {}},
+            "상태": {
+                "id": "s",
+                "type": "select",
+                "select": {"options": [{"id": "o1", "name": "미처리", "color": "red"}]},
+            },
+            "관련": {"id": "r", "type": "relation", "relation": {"database_id": "db1"}},
+        },
+    }
+
+    def query(db_id, page_size, start_cursor=None):
+        pages = pages_per_db[db_id]
+        start = int(start_cursor or 0)
+        chunk = pages[start:start + 1]
+        nxt = str(start + 1) if start + 1 < len(pages) else None
+        return {"results": chunk, "next_cursor": nxt}
+
+    client.databases.query.side_effect = query
+    return client
+
+
+def _page(page_id, title, related=()):
+    return {
+        "id": page_id,
+        "properties": {
+            "제목": {"type": "title", "title": [{"type": "text", "text": {"content": title}, "plain_text": title}]},
+            "상태": {"type": "select", "select": {"id": "o1", "name": "미처리", "color": "red"}},
+            "관련": {"type": "relation", "relation": [{"id": r} for r in related]},
+            "생성": {"type": "created_time", "created_time": "2024-01-01T00:00:00Z"},
+        },
+    }
+
+
+def test_backup_resumes_from_last_cursor(tmp_path):
+    """중단된 백업은 마지막 커서부터 이어서 기록한다."""
+
+    path = str(tmp_path / "b.ndjson.gz")
+    pages = {"db1": [_page("a", "A"), _page("b", "B")]}
+    client = _client(pages)
+    client.databases.query.side_effect = [
+        {"results": [pages["db1"][0]], "next_cursor": "1"},
+        RuntimeError("boom"),
+    ]
+    try:
+        backup.backup_workspace(path, "parent", client=client)
+    except RuntimeError:
+        pass
+
+    client = _client(pages)
+    counts = backup.backup_workspace(path, "parent", client=client)
+    assert counts == {"databases": 0, "pages": 1}
+    assert client.databases.query.call_args.kwargs["start_cursor"] == "1"
+    ids = [r["id"] for r in backup.read_records(path) if r["type"] == "page"]
+    assert ids == ["a", "b"]
+
+
+def test_read_records_stops_at_truncated_tail(tmp_path):
+    """잘린 파일은 읽을 수 있는 레코드까지만 돌려준다."""
+
+    path = tmp_path / "b.ndjson.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as fh:
+        for i in range(200):
+            fh.write('{"type": "page", "id": "%d"}\n' % i)
+    data = path.read_bytes()
+    path.write_bytes(data[: len(data) - 20])
+    records = list(backup.read_records(str(path)))
+    assert 0 < len(records) < 200
+
+
+def test_restore_recreates_rows_and_remaps_relations(tmp_path):
+    """복원 시 스키마와 행을 만들고 관계 ID를 새 페이지로 바꾼다."""
+
+    path = str(tmp_path / "b.ndjson.gz")
+    pages = {
+        "db1": [_page("a", "A"), _page("b", "B", related=["a"])],
+    }
+    backup.backup_workspace(path, "parent", client=_client(pages))
+
+    target = MagicMock()
+    target.databases.create.return_value = {"id": "new-db"}
+    target.pages.create.side_effect = [{"id": "new-a"}, {"id": "new-b"}]
+    counts = backup.restore_workspace(path, "new-parent", client=target)
+
+    assert counts == {"databases": 1, "pages": 2, "relations": 1, "files_skipped": 0}
+    schema = target.databases.create.call_args.kwargs["properties"]
+    assert "관련" not in schema
+    assert schema["상태"] == {"select": {"options": [{"name": "미처리", "color": "red"}]}}
+    row = target.pages.create.call_args_list[0].kwargs["properties"]
+    assert row["상태"] == {"select": {"name": "미처리"}}
+    assert "생성" not in row and "관련" not in row
+    relation = target.databases.update.call_args.kwargs["properties"]["관련"]
+    assert relation["relation"]["database_id"] == "new-db"
+    target.pages.update.assert_called_once_with(
+        "new-b", properties={"관련": {"relation": [{"id": "new-a"}]}}
+    )
+
+
+def test_hosted_files_are_downloaded_and_uploaded_again(tmp_path):
+    """노션에 올린 첨부파일은 백업 옆에 내려받아 복원 때 다시 업로드하고, 받지 못한 파일은 건너뛴다."""
+
+    source = tmp_path / "영수증.pdf"
+    source.write_bytes(b"%PDF receipt")
+    page = _page("a", "A")
+    page["properties"]["첨부"] = {
+        "type": "files",
+        "files": [
+            {"name": "영수증.pdf", "type": "file", "file": {"url": source.as_uri(), "expiry_time": "x"}},
+            {"name": "만료.pdf", "type": "file", "file": {"url": (tmp_path / "없음.pdf").as_uri()}},
+            {"name": "링크", "type": "external", "external": {"url": "https://example.com/a.pdf"}},
+        ],
+    }
+    path = str(tmp_path / "b.ndjson.gz")
+    backup.backup_workspace(path, "parent", client=_client({"db1": [page]}))
+
+    copies = os.listdir(backup.files_dir_for(path))
+    assert len(copies) == 1
+    with open(os.path.join(backup.files_dir_for(path), copies[0]), "rb") as fh:
+        assert fh.read() == b"%PDF receipt"
+
+    target = MagicMock()
+    target.databases.create.return_value = {"id": "new-db"}
+    target.pages.create.return_value = {"id": "new-a"}
+    uploader = MagicMock()
+    uploader.upload.return_value = {"name": "영수증.pdf", "type": "file_upload", "file_upload": {"id": "u1"}}
+    uploader.resolve.side_effect = lambda props: FileUploader.resolve(uploader, props)
+    with patch.object(backup, "uploader_for", return_value=uploader):
+        counts = backup.restore_workspace(path, "new-parent", client=target)
+
+    assert counts["files_skipped"] == 1
+    uploader.upload.assert_called_once_with(
+        os.path.join(backup.files_dir_for(path), copies[0]), name="영수증.pdf", digest=copies[0]
+    )
+    files = target.pages.create.call_args.kwargs["properties"]["첨부"]["files"]
+    assert files == [
+        {"name": "영수증.pdf", "type": "file_upload", "file_upload": {"id": "u1"}},
+        {"name": "링크", "type": "external", "external": {"url": "https://example.com/a.pdf"}},
+    ]
@@ -0,0 +1,40 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+import bench
+
+
+def test_scenarios_run_against_simulated_clients():
+    """모든 시나리오가 시뮬레이션 클라이언트에서 실행되고 호출 수를 센다."""
+
+    results = bench.run_suite(list(bench.SCENARIOS), [3], time_scale=1000)
+    assert results["delete_existing_databases@3"]["endpoints"] == {
+        "notion.blocks.children.list": 1,
+        "notion.blocks.delete": 3,
+    }
+    assert results["sync_notion_calendar@3"]["endpoints"]["calendar.events.insert"] == 3
+    assert results["main.run@3"]["calls"] > 0
+
+
+def test_compare_flags_metrics_over_margin():
+    baseline = {"x@10": {"wall": 1.0, "calls": 10, "peak_kb": 100.0}}
+    ok = {"x@10": {"wall": 1.2, "calls": 10, "peak_kb": 110.0}}
+    bad = {"x@10": {"wall": 1.0, "calls": 13, "peak_kb": 100.0}}
+    assert bench.compare(ok, baseline, 0.25) == []
+    assert bench.compare(bad, baseline, 0.25) == ["x@10 calls: 13 > 10 (+25%)"]
+
+
+def test_wall_time_is_advisory_and_endpoint_counts_are_gated():
+    """실행 시간은 참고로만 알리고, 엔드포인트별 호출 수는 검사한다."""
+
+    baseline = {
+        "x@10": {"wall": 1.0, "calls": 10, "peak_kb": 100.0, "endpoints": {"notion.a": 10}},
+    }
+    slow = {"x@10": {"wall": 5.0, "calls": 10, "peak_kb": 100.0, "endpoints": {"notion.a": 10}}}
+    assert bench.compare(slow, baseline, 0.25) == []
+    assert bench.advisories(slow, baseline, 0.25) == ["x@10 wall: 5.0 > 1.0 (+25%)"]
+    shifted = {
+        "x@10": {"wall": 1.0, "calls": 10, "peak_kb": 100.0, "endpoints": {"notion.a": 8, "notion.b": 2}},
+    }
+    assert bench.compare(shifted, baseline, 0.25) == ["x@10 notion.b: 2 > 0 (+25%)"]
@@ -0,0 +1,97 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from unittest.mock import MagicMock, patch
+import bulk_update
+
+SCHEMA = {
+    "상태": {"type": "select"},
+    "요청월": {"type": "rich_text"},
+    "금액": {"type": "number"},
+    "첨부파일": {"type": "files"},
+    "태그": {"type": "multi_select"},
+}
+
+
+def _client(pages):
+    client = MagicMock()
+    first, second = pages[:3], pages[3:]
+    client.databases.query.side_effect = [
+        {"results": [{"id": p} for p in first], "next_cursor": "c1"},
+        {"results": [{"id": p} for p in second], "next_cursor": None},
+    ]
+
+    def update(page_id, **kwargs):
+        if page_id == "p2":
+            raise ValueError("validation_error")
+        return {"id": page_id}
+
+    client.pages.update.side_effect = update
+    return client
+
+
+def test_where_filter_and_patch_use_property_types():
+    """조건과 변경 값은 데이터베이스 스키마의 속성 타입으로 인코딩한다."""
+
+    assert bulk_update.where_filter(SCHEMA, {"상태": "미처리"}) == {
+        "property": "상태",
+        "select": {"equals": "미처리"},
+    }
+    both = bulk_update.where_filter(SCHEMA, {"상태": "미처리", "금액": "1000"})
+    assert both["and"][1] == {"property": "금액", "number": {"equals": 1000.0}}
+    assert bulk_update.encode_patch(SCHEMA, {"상태": "완료"}) == {"상태": {"select": {"name": "완료"}}}
+    try:
+        bulk_update.encode_patch(SCHEMA, {"태그": "x"})
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("multi_select 변경은 거부해야 한다")
+
+
+def test_bulk_update_streams_matches_and_reports_failures():
+    """모든 결과 페이지를 따라가며 갱신하고 실패한 행은 보고서에 남긴다."""
+
+    client = _client(["p1", "p2", "p3", "p4", "p5"])
+    where = {"property": "상태", "select": {"equals": "미처리"}}
+    result = bulk_update.bulk_update(
+        "db", filter=where, properties={"상태": {"select": {"name": "완료"}}}, client=client
+    )
+
+    assert result["matched"] == 5 and result["updated"] == 4
+    assert result["failed"] == [{"page_id": "p2", "error": "validation_error"}]
+    assert client.databases.query.call_args_list[0].kwargs["filter"] == where
+    assert client.databases.query.call_args_list[1].kwargs["start_cursor"] == "c1"
+    updated = sorted(c.args[0] for c in client.pages.update.call_args_list)
+    assert updated == ["p1", "p2", "p3", "p4", "p5"]
+
+
+def test_dry_run_counts_without_writing_and_archive_sets_flag():
+    """dry-run 은 대상 수만 세고, archive 는 archived=True 로 갱신한다."""
+
+    client = _client(["p1", "p3", "p4", "p5", "p6"])
+    dry = bulk_update.bulk_update("db", archive=True, dry_run=True, client=client)
+    assert dry == {"matched": 5, "updated": 0, "failed": []}
+    client.pages.update.assert_not_called()
+
+    client = _client(["p1", "p3", "p4", "p5", "p6"])
+    bulk_update.bulk_update("db", archive=True, client=client)
+    assert client.pages.update.call_args.kwargs == {"archived": True}
+
+
+def test_local_files_are_uploaded_once_before_updates(tmp_path):
+    """로컬 첨부파일은 갱신 전에 한 번 올리고 모든 행에 같은 업로드를 연결한다."""
+
+    path = tmp_path / "receipt.pdf"
+    path.write_bytes(b"pdf")
+    values = bulk_update.encode_patch(SCHEMA, {"첨부파일": str(path)})
+    assert "path" in values["첨부파일"]["files"][0]
+
+    client = _client(["p1", "p3", "p4"])
+    uploader = MagicMock()
+    uploader.resolve.return_value = {"첨부파일": {"files": [{"type": "file_upload"}]}}
+    with patch.object(bulk_update, "uploader_for", return_value=uploader):
+        bulk_update.bulk_update("db", properties=values, client=client)
+
+    uploader.resolve.assert_called_once_with(values)
+    sent = [c.kwargs["properties"] for c in client.pages.update.call_args_list]
+    assert sent == [{"첨부파일": {"files": [{"type": "file_upload"}]}}] * 3
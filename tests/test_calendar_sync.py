@@ -1,7 +1,14 @@
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+import asyncio
+import threading
 import calendar_sync
+import google_calendar_utils as gcal
+from calendar_routes import CalendarRoute, route_for
+from simulated import SimulatedCalendar
+from state_store import StateStore
 from unittest.mock import MagicMock, patch
 
 
@@ -9,6 +16,7 @@ def test_sync_notion_calendar_creates_events():
     pages = {
         "results": [
             {
+                "id": "page-1",
                 "properties": {
                     "제목": {"title": [{"text": {"content": "회의"}}]},
                     "시작일": {"date": {"start": "2024-10-01"}},
@@ -26,5 +34,298 @@ def test_sync_notion_calendar_creates_events():
         notion.databases.query.return_value = pages
         calendar_sync.sync_notion_calendar("db")
         create.assert_called_once_with(
-            "회의", "2024-10-01", "2024-10-02", "내용"
+            "회의", "2024-10-01", "2024-10-02", "내용",
+            page_id="page-1", template="회사 일정 캘린더", calendar_id="primary",
         )
+
+
+def _calendar_page(title="회의", start="2024-10-01", end="2024-10-02"):
+    return {
+        "results": [
+            {
+                "id": "page-1",
+                "properties": {
+                    "제목": {"title": [{"text": {"content": title}}]},
+                    "시작일": {"date": {"start": start}},
+                    "종료일": {"date": {"start": end}},
+                    "설명": {"rich_text": [{"text": {"content": "내용"}}]},
+                },
+            }
+        ],
+        "next_cursor": None,
+    }
+
+
+def _indexed_event(summary="회의"):
+    return {
+        "id": "evt-1",
+        "summary": summary,
+        "description": "내용",
+        "start": {"date": "2024-10-01"},
+        "end": {"date": "2024-10-03"},
+        "extendedProperties": {"private": {"notionPageId": "page-1"}},
+    }
+
+
+def test_sync_skips_existing_event():
+    """이미 동일한 일정이 있으면 다시 생성하지 않아야 한다."""
+
+    with patch("calendar_sync.notion") as notion, patch(
+        "calendar_sync.create_event"
+    ) as create, patch("calendar_sync.update_event") as update, patch(
+        "google_calendar_utils.list_events", return_value=[_indexed_event()]
+    ) as list_events:
+        notion.databases.query.return_value = _calendar_page()
+        counts = calendar_sync.sync_notion_calendar("db")
+
+        list_events.assert_called_once()
+        create.assert_not_called()
+        update.assert_not_called()
+        assert counts["skip"] == 1
+
+
+def test_sync_patches_changed_fields_only():
+    """변경된 필드만 patch로 전송하는지 확인"""
+
+    with patch("calendar_sync.notion") as notion, patch(
+        "calendar_sync.create_event"
+    ) as create, patch("calendar_sync.update_event") as update, patch(
+        "google_calendar_utils.list_events", return_value=[_indexed_event("예전 회의")]
+    ):
+        notion.databases.query.return_value = _calendar_page()
+        calendar_sync.sync_notion_calendar("db")
+
+        create.assert_not_called()
+        update.assert_called_once()
+        assert update.call_args.args == ("evt-1",)
+        assert update.call_args.kwargs["summary"] == "회의"
+        assert set(update.call_args.kwargs) == {"summary", "private", "calendar_id"}
+
+
+def test_sync_patches_event_whose_date_moved_out_of_window(tmp_path):
+    """날짜가 기존 범위 밖으로 옮겨진 행도 연결된 이벤트를 찾아 patch 한다."""
+
+    state = StateStore(str(tmp_path / "state.json"))
+    state.set(
+        calendar_sync.SNAPSHOTS_NS,
+        "page-1",
+        {"summary": "회의", "start": "2024-10-01", "end": "2024-10-02", "description": "내용"},
+    )
+
+    def list_events(time_min, time_max, **kwargs):
+        # The old event is only returned when the window reaches its date
+        return [_indexed_event()] if time_min and time_min[:10] <= "2024-10-01" else []
+
+    with patch("calendar_sync.notion") as notion, patch(
+        "calendar_sync.create_event"
+    ) as create, patch("calendar_sync.update_event") as update, patch(
+        "google_calendar_utils.list_events", side_effect=list_events
+    ):
+        notion.databases.query.return_value = _calendar_page(start="2024-12-01", end="2024-12-02")
+        counts = calendar_sync.sync_notion_calendar("db", state)
+
+        create.assert_not_called()
+        assert update.call_args.args == ("evt-1",)
+        assert update.call_args.kwargs["start"] == "2024-12-01"
+        assert counts["patch"] == 1
+
+
+def test_sync_without_state_looks_up_route_before_insert():
+    """상태 저장소가 없으면 범위 밖 이벤트를 라우트 전체에서 찾은 뒤에만 생성한다."""
+
+    def list_events(time_min, time_max, **kwargs):
+        if kwargs.get("private") == {"notionTemplate": "회사 일정 캘린더"}:
+            return [_indexed_event()]
+        return []
+
+    with patch("calendar_sync.notion") as notion, patch(
+        "calendar_sync.create_event"
+    ) as create, patch("calendar_sync.update_event") as update, patch(
+        "google_calendar_utils.list_events", side_effect=list_events
+    ) as listing:
+        notion.databases.query.return_value = _calendar_page(start="2024-12-01", end="2024-12-02")
+        calendar_sync.sync_notion_calendar("db")
+
+        create.assert_not_called()
+        assert update.call_args.args == ("evt-1",)
+        assert listing.call_count == 2
+
+
+def _google_event(summary, digest=None):
+    private = {"notionPageId": "page-1"}
+    if digest:
+        private["notionHash"] = digest
+    return {
+        "id": "evt-1",
+        "status": "confirmed",
+        "summary": summary,
+        "description": "내용",
+        "start": {"date": "2024-10-01"},
+        "end": {"date": "2024-10-03"},
+        "extendedProperties": {"private": private},
+    }
+
+
+def test_reverse_sync_updates_changed_property_only(tmp_path):
+    """구글에서 바뀐 필드만 노션 페이지에 반영하고 syncToken을 저장한다."""
+    from state_store import StateStore
+
+    state = StateStore(str(tmp_path / "state.json"))
+    state.set(
+        calendar_sync.SNAPSHOTS_NS,
+        "page-1",
+        {"summary": "회의", "start": "2024-10-01", "end": "2024-10-02", "description": "내용"},
+    )
+    with patch("calendar_sync.notion") as notion, patch(
+        "calendar_sync.list_changes",
+        return_value=([_google_event("변경된 회의")], "token-2"),
+    ), patch("calendar_sync.update_event") as update:
+        counts = calendar_sync.sync_google_to_notion(state, calendar_id="cal")
+
+        notion.pages.update.assert_called_once()
+        props = notion.pages.update.call_args.kwargs["properties"]
+        assert list(props) == ["제목"]
+        assert props["제목"]["title"][0]["text"]["content"] == "변경된 회의"
+        assert "notionHash" in update.call_args.kwargs["private"]
+        assert counts["update"] == 1
+
+    reloaded = StateStore(str(tmp_path / "state.json"))
+    assert reloaded.get(calendar_sync.TOKENS_NS, "cal") == "token-2"
+
+
+def test_reverse_sync_ignores_own_writes(tmp_path):
+    """노션에서 기록한 내용 그대로인 이벤트는 다시 반영하지 않는다."""
+    from google_calendar_utils import event_fields, event_hash
+    from state_store import StateStore
+
+    event = _google_event("회의")
+    event["extendedProperties"]["private"]["notionHash"] = event_hash(event_fields(event))
+    state = StateStore(str(tmp_path / "state.json"))
+    with patch("calendar_sync.notion") as notion, patch(
+        "calendar_sync.list_changes", return_value=([event], "token-2")
+    ), patch("calendar_sync.update_event") as update:
+        counts = calendar_sync.sync_google_to_notion(state, calendar_id="cal")
+
+        notion.pages.update.assert_not_called()
+        update.assert_not_called()
+        assert counts["skip"] == 1
+
+
+def test_reverse_sync_restarts_on_expired_token(tmp_path):
+    """syncToken이 만료되면 전체 목록으로 다시 동기화한다."""
+    from google_calendar_utils import SyncTokenExpired
+    from state_store import StateStore
+
+    state = StateStore(str(tmp_path / "state.json"))
+    state.set(calendar_sync.TOKENS_NS, "cal", "old")
+    with patch("calendar_sync.notion"), patch(
+        "calendar_sync.list_changes",
+        side_effect=[SyncTokenExpired("gone"), ([], "fresh")],
+    ) as list_changes:
+        calendar_sync.sync_google_to_notion(state, calendar_id="cal")
+
+        assert list_changes.call_args_list[1].args[0] is None
+        assert state.get(calendar_sync.TOKENS_NS, "cal") == "fresh"
+
+
+def test_routes_cover_trip_ranges_and_separate_leave_dates():
+    """출장기간 범위와 휴가시작/종료 속성을 일정 필드로 변환한다."""
+
+    trip = route_for("출장 요청서").row(
+        {
+            "id": "t1",
+            "properties": {
+                "제목": {"title": [{"text": {"content": "출장1"}}]},
+                "출장기간": {"date": {"start": "2024-06-01", "end": "2024-06-05"}},
+                "출장목적": {"rich_text": [{"text": {"content": "회의"}}]},
+            },
+        }
+    )
+    assert trip == {
+        "page_id": "t1", "summary": "출장1", "start": "2024-06-01",
+        "end": "2024-06-05", "description": "회의",
+    }
+    leave = route_for("휴가 기록서")
+    assert leave.to_properties({"end": "2024-07-09"}, {"start": "2024-07-01"}) == {
+        "휴가종료": {"date": {"start": "2024-07-09"}}
+    }
+    assert route_for("출장 요청서").to_properties(
+        {"end": "2024-06-07"}, {"start": "2024-06-01", "end": "2024-06-07"}
+    ) == {"출장기간": {"date": {"start": "2024-06-01", "end": "2024-06-07"}}}
+
+
+def test_sync_all_calendars_runs_routes_concurrently(tmp_path):
+    """모든 라우트를 한 번에 동시 실행하고 각 캘린더로 보낸다."""
+
+    routes = [
+        CalendarRoute("출장 요청서", start="출장기간", calendar_id="trips"),
+        CalendarRoute("교육 수강 신청서", start="교육일", calendar_id="training"),
+    ]
+    barrier = threading.Barrier(2, timeout=5)
+
+    def _sync(db_id, state, *, route, client=None):
+        barrier.wait()  # both routes must be in flight at the same time
+        return {"insert": 1, "patch": 0, "skip": 0, "calendar": route.calendar_id, "db": db_id}
+
+    state = StateStore(str(tmp_path / "state.json"))
+    with patch("calendar_sync.sync_notion_calendar", side_effect=_sync):
+        result = asyncio.run(
+            calendar_sync.sync_all_calendars(
+                {"출장 요청서": "db-trip", "교육 수강 신청서": "db-edu", "직원목록": "db-x"},
+                state,
+                routes=routes,
+            )
+        )
+    assert result["출장 요청서"]["calendar"] == "trips"
+    assert result["교육 수강 신청서"]["db"] == "db-edu"
+    assert set(result) == {"출장 요청서", "교육 수강 신청서"}
+
+
+def test_single_date_route_writes_exclusive_all_day_end():
+    """하루짜리 일정은 구글의 배타적 종료일(다음 날)로 쓰고, 다시 읽으면 같은 날로 돌아온다."""
+
+    route = route_for("교육 수강 신청서")
+    page = {
+        "id": "e1",
+        "properties": {
+            "제목": {"title": [{"text": {"content": "보안 교육"}}]},
+            "교육일": {"date": {"start": "2024-11-05"}},
+            "교육명": {"rich_text": [{"text": {"content": "보안"}}]},
+        },
+    }
+    calendar = SimulatedCalendar(time_scale=1000)
+    with patch.object(gcal, "_service", calendar):
+        assert calendar_sync.sync_pages_to_calendar([page], route=route)["insert"] == 1
+        (event,) = calendar.store.values()
+        assert (event["start"], event["end"]) == ({"date": "2024-11-05"}, {"date": "2024-11-06"})
+        assert calendar_sync.sync_pages_to_calendar([page], route=route)["skip"] == 1
+
+    fields = gcal.event_fields(event)
+    assert fields["end"] == "2024-11-05"
+    assert gcal.event_hash(fields) == event["extendedProperties"]["private"]["notionHash"]
+    assert route.to_properties({"start": "2024-11-05"}, fields) == {
+        "교육일": {"date": {"start": "2024-11-05", "end": None}}
+    }
+
+
+def test_sync_calendars_entry_point_syncs_found_routed_databases(tmp_path):
+    """--sync-calendars 는 부모 페이지의 데이터베이스를 찾아 라우팅된 것만 동기화한다."""
+    import main as app
+
+    client = MagicMock()
+    synced = {}
+
+    def _sync(db_id, state, *, route, client=None):
+        synced[route.template] = (db_id, client)
+        return {"insert": 1, "patch": 0, "skip": 0}
+
+    state = StateStore(str(tmp_path / "state.json"))
+    with patch.object(
+        app, "find_databases", return_value={"출장 요청서": "db-trip", "직원목록": "db-x"}
+    ) as find, patch("calendar_sync.sync_notion_calendar", side_effect=_sync):
+        result = asyncio.run(app.sync_calendars(client, "parent", state=state))
+
+    find.assert_called_once_with("parent", client=client)
+    assert synced == {"출장 요청서": ("db-trip", client)}
+    assert result == {"출장 요청서": {"insert": 1, "patch": 0, "skip": 0}}
+    assert app.parse_args(["--sync-calendars"]).sync_calendars
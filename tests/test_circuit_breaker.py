@@ -0,0 +1,92 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from unittest.mock import MagicMock, patch
+import pytest
+import circuit_breaker as cb
+import google_calendar_utils as gcal
+
+
+def _failing():
+    raise RuntimeError("503")
+
+
+def test_breaker_opens_after_threshold_and_fails_fast():
+    """연속 실패가 임계값에 도달하면 호출 없이 즉시 실패한다."""
+
+    breaker = cb.CircuitBreaker("svc", failure_threshold=2, reset_seconds=60)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            breaker.call(_failing)
+    fn = MagicMock()
+    with pytest.raises(cb.CircuitOpenError):
+        breaker.call(fn)
+    fn.assert_not_called()
+    assert breaker.snapshot()["state"] == cb.OPEN
+
+
+def test_slow_calls_count_as_failures():
+    """느린 호출도 실패로 집계된다."""
+
+    breaker = cb.CircuitBreaker("svc", failure_threshold=1, slow_call_seconds=5)
+    with patch.object(cb.time, "monotonic", side_effect=[0, 6, 6]):
+        breaker.call(lambda: "ok")
+    assert breaker.state == cb.OPEN
+
+
+def test_half_open_probe_closes_breaker():
+    """대기 시간이 지나면 한 번의 시험 호출로 복구한다."""
+
+    breaker = cb.CircuitBreaker("svc", failure_threshold=1, reset_seconds=10)
+    with patch.object(cb.time, "monotonic", return_value=0):
+        with pytest.raises(RuntimeError):
+            breaker.call(_failing)
+    with patch.object(cb.time, "monotonic", return_value=11):
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record(True)
+    assert breaker.state == cb.CLOSED
+
+
+def test_create_event_skips_when_calendar_breaker_open():
+    """캘린더 서킷이 열려 있으면 API를 호출하지 않는다."""
+
+    breaker = cb.CircuitBreaker("google_calendar", failure_threshold=1, reset_seconds=60)
+    breaker.record(False)
+    with patch.object(gcal, "_service") as svc, patch.object(gcal, "_breaker", breaker):
+        assert gcal.create_event("회의", "2024-10-01", "2024-10-01") is None
+        svc.events.return_value.insert.return_value.execute.assert_not_called()
+
+
+class _Status(Exception):
+    def __init__(self, status):
+        super().__init__(str(status))
+        self.status = status
+
+
+def test_client_errors_do_not_open_breaker():
+    """4xx·429 응답은 서비스가 응답한 것이므로 실패로 세지 않는다."""
+
+    breaker = cb.CircuitBreaker("svc", failure_threshold=2)
+    for status in (400, 429, 404, 429):
+        with pytest.raises(_Status):
+            breaker.call(MagicMock(side_effect=_Status(status)))
+    assert breaker.state == cb.CLOSED and breaker.failures == 0
+    for _ in range(2):
+        with pytest.raises(_Status):
+            breaker.call(MagicMock(side_effect=_Status(503)))
+    assert breaker.state == cb.OPEN
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_frees_half_open_breaker():
+    """취소된 시험 호출은 성공도 실패도 아니며 다음 시험 호출을 막지 않는다."""
+
+    import asyncio
+
+    breaker = cb.CircuitBreaker("svc", failure_threshold=1, reset_seconds=0)
+    breaker.record(False)
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(breaker.call_async(asyncio.sleep, 1), 0.01)
+    assert breaker.state == cb.HALF_OPEN
+    assert breaker.allow()
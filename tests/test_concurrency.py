@@ -0,0 +1,121 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+import pytest
+import concurrency
+from metrics import metrics
+
+
+class Throttled(Exception):
+    status = 429
+
+
+def test_additive_increase_on_healthy_calls():
+    """정상 응답이 이어지면 한도가 조금씩 늘어난다."""
+
+    limiter = concurrency.AIMDLimiter("t-inc", initial=1, max_limit=4)
+    for _ in range(6):
+        limiter.run(lambda: None)
+    assert 3 <= limiter.limit <= 4
+    assert metrics.snapshot()["gauges"]["t-inc.concurrency_limit"] == limiter.limit
+
+
+def test_multiplicative_decrease_on_429_once_per_burst():
+    """429가 몰려도 같은 시점에 시작된 호출들은 한 번만 한도를 줄인다."""
+
+    limiter = concurrency.AIMDLimiter("t-dec", initial=8, max_limit=8)
+    starts = [limiter.acquire() for _ in range(3)]
+    for started in starts:
+        limiter.release(started, throttled=True)
+    assert limiter.limit == 4
+
+
+def test_latency_spike_cuts_limit():
+    """지연이 임계값을 넘으면 한도를 줄인다."""
+
+    limiter = concurrency.AIMDLimiter("t-lat", initial=4, latency_threshold=1)
+    started = limiter.acquire()
+    with patch.object(concurrency.time, "monotonic", return_value=started + 2):
+        limiter.release(started)
+    assert limiter.limit == 2
+
+
+def test_run_detects_throttled_exception():
+    limiter = concurrency.AIMDLimiter("t-exc", initial=4)
+
+    def _fail():
+        raise Throttled()
+
+    with pytest.raises(Throttled):
+        limiter.run(_fail)
+    assert limiter.limit == 2
+
+
+def test_map_limited_respects_limit_and_order():
+    """동시 실행 수가 한도를 넘지 않고 결과 순서를 유지한다."""
+
+    limiter = concurrency.AIMDLimiter("t-map", initial=2, max_limit=2)
+    active = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def work(x):
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        time.sleep(0.01)
+        with lock:
+            active["now"] -= 1
+        return x * 2
+
+    assert concurrency.map_limited(limiter, work, range(10)) == [x * 2 for x in range(10)]
+    assert active["max"] <= 2
+
+
+@pytest.mark.asyncio
+async def test_gather_limited_waits_for_started_calls_when_deadline_passes():
+    """기한이 지나 중간에 멈추면 이미 시작한 호출을 끝까지 기다린 뒤 예외를 올린다."""
+
+    from deadlines import Deadline, DeadlineExceeded, deadline_scope
+
+    limiter = concurrency.AIMDLimiter("t-gather-deadline", initial=4, max_limit=4)
+    deadline = Deadline(10)
+    finished = []
+
+    def work(x):
+        time.sleep(0.05)
+        finished.append(x)
+        return x
+
+    def items():
+        yield 1
+        yield 2
+        deadline.cancel()
+        yield 3
+
+    with deadline_scope(deadline), pytest.raises(DeadlineExceeded):
+        await concurrency.gather_limited(limiter, work, items())
+    assert sorted(finished) == [1, 2]
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_gather_limited_frees_slot_granted_after_cancel():
+    """슬롯을 기다리다 취소되면 나중에 받은 슬롯을 돌려준다."""
+
+    limiter = concurrency.AIMDLimiter("t-gather-cancel", initial=1, max_limit=1)
+    held = limiter.acquire()
+    task = asyncio.ensure_future(concurrency.gather_limited(limiter, lambda x: x, [1]))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    limiter.release(held)
+    for _ in range(50):
+        if limiter.in_flight == 0:
+            break
+        await asyncio.sleep(0.01)
+    assert limiter.in_flight == 0
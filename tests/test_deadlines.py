@@ -0,0 +1,87 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+import asyncio
+import logging
+import time
+from unittest.mock import MagicMock, patch
+import httpx
+import pytest
+import deadlines
+import retry
+from concurrency import AIMDLimiter, map_limited
+
+
+def test_child_deadline_never_outlives_parent():
+    """하위 기한은 상위 기한을 넘지 않고 상위 취소를 따른다."""
+
+    run = deadlines.Deadline(1.0)
+    phase = run.child("seed", 60)
+    assert phase.remaining() <= 1.0
+    with deadlines.deadline_scope(phase):
+        assert deadlines.call_timeout(60) <= 1.0
+        assert deadlines.call_timeout(0.1) == 0.1
+    run.cancel()
+    assert phase.expired()
+    with pytest.raises(deadlines.DeadlineExceeded):
+        phase.check("pages.create")
+
+
+def test_retry_gives_up_instead_of_sleeping_past_deadline():
+    """남은 시간보다 긴 백오프는 기다리지 않고 기한 초과로 끝낸다."""
+
+    fn = MagicMock(side_effect=httpx.ReadTimeout("slow"))
+    policy = retry.RetryPolicy(max_attempts=4)
+    policy.delay = MagicMock(return_value=5)
+    with deadlines.deadline_scope(deadlines.Deadline(0.5)), patch.object(retry.time, "sleep") as sleep:
+        with pytest.raises(deadlines.DeadlineExceeded):
+            retry.call_with_retry("pages.retrieve", fn, policy=policy)
+    assert fn.call_count == 1
+    sleep.assert_not_called()
+
+
+def test_map_limited_stops_starting_calls_after_deadline():
+    """기한이 지나면 새 호출을 시작하지 않고 작업 스레드도 기한을 본다."""
+
+    limiter = AIMDLimiter("test", initial=1, max_limit=1)
+    seen = []
+
+    def work(item):
+        seen.append(deadlines.current_deadline() is not None)
+        time.sleep(0.05)
+        return item
+
+    with deadlines.deadline_scope(deadlines.Deadline(0.12)):
+        with pytest.raises(deadlines.DeadlineExceeded):
+            map_limited(limiter, work, range(20))
+    assert 0 < len(seen) < 20
+    assert all(seen)
+
+
+def test_run_ends_with_partial_report_when_budget_runs_out():
+    """예산을 넘긴 실행은 멈추지 않고 완료된 결과를 보고하며 끝난다."""
+
+    from simulated import SimulatedCalendar, SimulatedNotion
+    import google_calendar_utils
+    import slack_utils
+    import main as app
+
+    logging.getLogger().removeHandler(app.slack_handler)
+    client = SimulatedNotion(time_scale=20)
+    sent = []
+
+    async def fake_send(text, *args, **kwargs):
+        sent.append(text)
+
+    with patch.object(google_calendar_utils, "_service", SimulatedCalendar(time_scale=20)), \
+            patch.object(slack_utils, "slack_client", None), \
+            patch.object(app, "send_message", fake_send):
+        started = time.perf_counter()
+        result = asyncio.run(app.run(client, "parent", rows=200, deadline=1.0))
+        elapsed = time.perf_counter() - started
+
+    assert result["timed_out"] in {"create_databases", "relations", "seed"}
+    assert elapsed < 3
+    assert "기한 초과" in sent[0] and "teardown: done" in sent[0]
+    assert result["databases"] >= 1
@@ -165,3 +165,31 @@ async def test_create_dummy_data_replaces_dummy_user():
 
         props = mock_notion.pages.create.call_args_list[0].kwargs["properties"]
         assert props["요청자"]["people"] == [{"id": "user-uuid"}]
+
+
+@pytest.mark.asyncio
+async def test_upsert_rerun_skips_unchanged_rows_and_updates_changed():
+    """upsert 재실행은 같은 행을 건너뛰고 바뀐 행만 pages.update 한다."""
+
+    sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+    from simulated import SimulatedNotion
+    import notion_templates
+
+    client = SimulatedNotion(time_scale=1000)
+    tmpl = notion_templates.get_template("교육 수강 신청서")
+    db_id = db_utils.create_database(tmpl, client=client, parent_page_id="parent")
+    first = await db_utils.create_dummy_data(db_id, "교육 수강 신청서", client=client, upsert=True)
+    writes = client.calls["pages.create"]
+    assert writes == 5
+
+    client.calls.clear()
+    again = await db_utils.create_dummy_data(db_id, "교육 수강 신청서", client=client, upsert=True)
+    assert again == first
+    assert client.calls["pages.create"] == 0 and client.calls["pages.update"] == 0
+
+    changed = [dict(item) for item in notion_templates.get_dummy_items("교육 수강 신청서")]
+    changed[1]["교육명"] = "고급 파이썬"
+    with patch.object(notion_templates, "get_dummy_items", return_value=changed):
+        await db_utils.create_dummy_data(db_id, "교육 수강 신청서", client=client, upsert=True)
+    assert client.calls["pages.update"] == 1
+    assert client.calls["pages.create"] == 0
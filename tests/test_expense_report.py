@@ -0,0 +1,74 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from unittest.mock import AsyncMock, MagicMock, patch
+import pytest
+
+pytest.importorskip("numpy")
+import expense_report
+from state_store import StateStore
+
+
+def _page(page_id, amount, month, account, status, edited="2024-05-01T00:00:00.000Z"):
+    sel = lambda name: {"select": {"name": name}}
+    return {
+        "id": page_id,
+        "last_edited_time": edited,
+        "properties": {
+            "금액": {"number": amount},
+            "요청월": sel(month),
+            "계정과목": sel(account),
+            "상태": sel(status),
+        },
+    }
+
+
+def test_store_upsert_and_aggregate_roundtrip(tmp_path):
+    """같은 페이지는 덮어쓰고 월/계정/상태별 합계를 계산한다."""
+
+    path = str(tmp_path / "store.npz")
+    store = expense_report.ExpenseStore(path)
+    rows = [
+        expense_report.page_to_row(_page("a", 100, "2024-05", "기타", "미처리")),
+        expense_report.page_to_row(_page("b", 50, "2024-05", "기타", "미처리")),
+        expense_report.page_to_row(_page("c", 70, "2024-06", "소모품비", "승인됨")),
+    ]
+    assert store.upsert(rows) == 3
+    assert store.upsert([("b", 80.0, "2024-05", "기타", "승인됨")]) == 0
+    store.save()
+
+    reloaded = expense_report.ExpenseStore(path)
+    assert reloaded.aggregate() == [
+        {"month": "2024-05", "account": "기타", "status": "미처리", "total": 100.0, "count": 1},
+        {"month": "2024-05", "account": "기타", "status": "승인됨", "total": 80.0, "count": 1},
+        {"month": "2024-06", "account": "소모품비", "status": "승인됨", "total": 70.0, "count": 1},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_report_reads_only_changed_pages(tmp_path):
+    """두 번째 실행은 마지막 수정 시각 이후 페이지만 조회한다."""
+
+    client = MagicMock()
+    client.databases.query.return_value = {
+        "results": [_page("a", 100, "2024-05", "기타", "미처리", "2024-05-02T10:00:00.000Z")],
+        "next_cursor": None,
+    }
+    state = StateStore(str(tmp_path / "state.json"))
+    store_path = str(tmp_path / "store.npz")
+    with patch("expense_report.send_message", new=AsyncMock()) as send:
+        await expense_report.report_expenses("db", client=client, state=state, store_path=store_path)
+        assert "filter" not in client.databases.query.call_args.kwargs
+
+        client.databases.query.return_value = {
+            "results": [_page("a", 300, "2024-05", "기타", "승인됨", "2024-05-03T10:00:00.000Z")],
+            "next_cursor": None,
+        }
+        rows = await expense_report.report_expenses(
+            "db", client=client, state=state, store_path=store_path
+        )
+
+    flt = client.databases.query.call_args.kwargs["filter"]
+    assert flt["last_edited_time"] == {"on_or_after": "2024-05-02T10:00:00.000Z"}
+    assert [(r["status"], r["total"]) for r in rows] == [("승인됨", 300.0)]
+    assert "300원" in send.call_args.args[0]
@@ -0,0 +1,106 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import threading
+import httpx
+import file_uploads
+import notion_db_utils as db_utils
+
+
+class FakeNotion:
+    """``request``와 httpx ``client``만 흉내 내는 노션 클라이언트."""
+
+    def __init__(self):
+        self.created = []
+        self.completed = []
+        self.parts = []
+        self._lock = threading.Lock()
+
+        def handler(request):
+            upload_id = request.url.path.split("/")[-2]
+            body = request.read()
+            with self._lock:
+                self.parts.append((upload_id, body))
+            return httpx.Response(200, json={"id": upload_id, "status": "pending"})
+
+        self.client = httpx.Client(
+            transport=httpx.MockTransport(handler), base_url="https://api.notion.com/v1/"
+        )
+
+    def request(self, path, method, query=None, body=None, auth=None):
+        with self._lock:
+            if path == "file_uploads":
+                self.created.append(body)
+                return {"id": f"up-{len(self.created)}"}
+            self.completed.append(path)
+            return {"status": "uploaded"}
+
+
+def test_large_file_uses_multi_part_upload(tmp_path):
+    """파트 크기를 넘는 파일은 나눠 보내고 complete 를 호출한다."""
+
+    path = tmp_path / "receipt.pdf"
+    path.write_bytes(b"a" * 25)
+    api = FakeNotion()
+    uploader = file_uploads.FileUploader(api, part_size=10)
+
+    ref = uploader.upload(str(path))
+
+    assert ref == {"name": "receipt.pdf", "type": "file_upload", "file_upload": {"id": "up-1"}}
+    assert api.created == [
+        {
+            "filename": "receipt.pdf",
+            "content_type": "application/pdf",
+            "mode": "multi_part",
+            "number_of_parts": 3,
+        }
+    ]
+    assert len(api.parts) == 3
+    assert b'name="part_number"' in api.parts[0][1]
+    assert api.completed == ["file_uploads/up-1/complete"]
+
+
+def test_identical_files_are_uploaded_once(tmp_path):
+    """내용이 같은 파일은 동시에 요청해도 한 번만 업로드한다."""
+
+    paths = []
+    for name in ("a.pdf", "b.pdf", "c.pdf"):
+        path = tmp_path / name
+        path.write_bytes(b"same receipt")
+        paths.append(str(path))
+    other = tmp_path / "other.pdf"
+    other.write_bytes(b"different")
+    api = FakeNotion()
+    uploader = file_uploads.FileUploader(api, max_concurrency=4)
+
+    refs = uploader.upload_many(paths * 2 + [str(other)])
+
+    assert len(api.created) == 2
+    assert "mode" not in api.created[0]
+    assert len({r["file_upload"]["id"] for r in refs[:-1]}) == 1
+    assert refs[-1]["file_upload"]["id"] != refs[0]["file_upload"]["id"]
+    assert api.completed == []
+
+
+def test_encoded_rows_upload_local_files_on_write(tmp_path):
+    """행 인코딩은 자리표시자를 만들고 쓰기 직전에 업로드 참조로 바꾼다."""
+
+    path = tmp_path / "receipt1.pdf"
+    path.write_bytes(b"pdf")
+    tmpl = {"properties": {"첨부파일": {"files": {}}}}
+    item = {"첨부파일": [str(path), "https://example.com/r.pdf"]}
+
+    props = db_utils.encode_item(item, tmpl)
+    placeholder = props["첨부파일"]["files"][0]
+    assert placeholder["sha256"] == file_uploads.file_digest(str(path))
+    assert props["첨부파일"]["files"][1]["type"] == "external"
+
+    api = FakeNotion()
+    resolved = file_uploads.FileUploader(api).resolve(props)
+    assert resolved["첨부파일"]["files"][0] == {
+        "name": "receipt1.pdf",
+        "type": "file_upload",
+        "file_upload": {"id": "up-1"},
+    }
+    assert resolved["첨부파일"]["files"][1] == props["첨부파일"]["files"][1]
+    assert "path" in props["첨부파일"]["files"][0]
@@ -16,3 +16,51 @@ def test_update_event_calls_api():
         gcal.update_event("eid", summary="회의")
         svc.events.assert_called_once()
 
+
+
+def test_writes_request_only_the_event_id_and_report_payload_sizes():
+    """insert/patch 는 id 만 요청하고 요청·응답 크기를 지표로 남긴다."""
+
+    from metrics import metrics
+
+    class FakeRequest:
+        def __init__(self, body):
+            self.body = body
+            self.postproc = lambda resp, content: {"id": "evt-1"}
+
+        def execute(self):
+            return self.postproc({"-content-encoding": "gzip"}, b'{"id": "evt-1"}')
+
+    metrics.reset()
+    with patch.object(gcal, "_service") as svc:
+        svc.events.return_value.insert.return_value = FakeRequest('{"summary": "회의"}')
+        svc.events.return_value.patch.return_value = FakeRequest('{"summary": "회의2"}')
+        assert gcal.create_event("회의", "2024-10-01", "2024-10-01") == "evt-1"
+        gcal.update_event("evt-1", summary="회의2")
+        gcal.update_event("evt-1")
+
+    assert svc.events.return_value.insert.call_args.kwargs["fields"] == "id"
+    assert svc.events.return_value.patch.call_args.kwargs["fields"] == "id"
+    assert svc.events.return_value.patch.call_count == 1
+    snap = metrics.snapshot()
+    assert snap["observations"]["google_calendar.events.insert.response_bytes"]["sum"] == 15
+    assert snap["observations"]["google_calendar.events.patch.request_bytes"]["count"] == 1
+    assert snap["counters"]["google_calendar.gzip_responses"] == 2
+
+
+def test_calls_get_a_socket_timeout_capped_by_the_deadline():
+    """구글 호출마다 남은 기한으로 줄인 소켓 타임아웃을 전송 계층에 넘긴다."""
+    import threading
+    import deadlines
+
+    request = MagicMock()
+    request.execute.return_value = {"id": "e1"}
+    transports = threading.local()
+    with patch.object(gcal, "_credentials", MagicMock()), patch.object(gcal, "_transports", transports):
+        gcal._execute(request, "events.get")
+        assert request.execute.call_args.kwargs["http"].http.timeout == gcal.GOOGLE_CALL_TIMEOUT
+        with deadlines.deadline_scope(deadlines.Deadline(2)):
+            gcal._execute(request, "events.get")
+        http = request.execute.call_args.kwargs["http"]
+    assert http is transports.http
+    assert 0 < http.http.timeout <= 2
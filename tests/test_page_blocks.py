@@ -0,0 +1,137 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+import itertools
+import threading
+import time
+from unittest.mock import MagicMock, patch
+import pytest
+import notion_db_utils as db_utils
+import notion_templates
+from page_blocks import append_blocks, to_block, write_page_blocks
+from simulated import SimulatedNotion
+
+
+def _client():
+    """append 호출을 기록하고 자식마다 새 블록 id 를 돌려주는 가짜 클라이언트."""
+
+    client = MagicMock()
+    ids = itertools.count(1)
+    lock = threading.Lock()
+    calls = []
+
+    def append(parent_id, *, children):
+        with lock:
+            calls.append((parent_id, children))
+            return {"results": [{"id": f"b{next(ids)}"} for _ in children]}
+
+    client.blocks.children.append.side_effect = append
+    return client, calls
+
+
+def _nest(depth):
+    spec = {"type": "bulleted_list_item", "text": f"L{depth}"}
+    if depth:
+        spec["children"] = [_nest(depth - 1)]
+    return spec
+
+
+def test_siblings_are_chunked_to_one_hundred_per_call():
+    """형제 블록 250개는 순서를 지키며 100개씩 세 번에 나눠 append 한다."""
+
+    client, calls = _client()
+    specs = [{"type": "to_do", "text": str(i)} for i in range(250)]
+    assert write_page_blocks(["page"], specs, client=client) == 3
+    assert [len(children) for _, children in calls] == [100, 100, 50]
+    texts = [c["to_do"]["rich_text"][0]["text"]["content"] for _, cs in calls for c in cs]
+    assert texts == [str(i) for i in range(250)]
+
+
+def test_deep_tree_is_written_level_by_level_under_returned_ids():
+    """두 단계보다 깊은 자식은 다음 라운드에 반환된 블록 id 아래로 append 한다."""
+
+    client, calls = _client()
+    shallow = to_block(_nest(2))
+    deep = to_block(_nest(4))
+    assert append_blocks([("page", [shallow, deep])], client=client) == 3
+
+    (parent, first), (child_parent, second), (grandchild_parent, third) = calls
+    assert parent == "page"
+    assert first[0] == shallow
+    assert "children" not in first[1]["bulleted_list_item"]
+    # Deferred levels go under the ids returned for the blocks sent bare
+    assert child_parent == "b2" and "children" not in second[0]["bulleted_list_item"]
+    assert grandchild_parent == "b3"
+    assert third == deep["bulleted_list_item"]["children"][0]["bulleted_list_item"]["children"]
+
+
+def test_pages_are_written_concurrently():
+    """여러 페이지의 append 는 동시에 실행된다."""
+
+    client = MagicMock()
+    active = peak = 0
+    lock = threading.Lock()
+
+    def append(parent_id, *, children):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return {"results": [{"id": "b"} for _ in children]}
+
+    client.blocks.children.append.side_effect = append
+    pages = [f"p{i}" for i in range(4)]
+    assert write_page_blocks(pages, [{"type": "paragraph", "text": "안내"}], client=client) == 4
+    assert peak > 1
+
+
+@pytest.mark.asyncio
+async def test_dummy_rows_get_template_body_once():
+    """한 요청에 들어가는 본문은 pages.create 와 함께 보내고 upsert 재실행에서는 다시 쓰지 않는다."""
+
+    client = SimulatedNotion(time_scale=1000)
+    tmpl = notion_templates.get_template("출장 요청서")
+    db_id = db_utils.create_database(tmpl, client=client, parent_page_id="parent")
+    pages = await db_utils.create_dummy_data(db_id, "출장 요청서", client=client, upsert=True)
+
+    assert client.calls["blocks.children.append"] == 0
+    assert client.calls["pages.create"] == len(pages)
+    body = client.blocks_store[pages[0]]
+    assert [block["type"] for block in body] == [spec["type"] for spec in tmpl["page_blocks"]]
+
+    client.calls.clear()
+    await db_utils.create_dummy_data(db_id, "출장 요청서", client=client, upsert=True)
+    assert client.calls["pages.create"] == 0 and client.calls["blocks.children.append"] == 0
+
+
+@pytest.mark.asyncio
+async def test_large_template_body_is_appended_after_create():
+    """한 요청을 넘는 본문은 생성된 페이지마다 append 로 나눠 쓴다."""
+
+    client = SimulatedNotion(time_scale=1000)
+    tmpl = notion_templates.get_template("교육 수강 신청서")
+    large = {**tmpl, "page_blocks": [{"type": "to_do", "text": str(i)} for i in range(150)]}
+    db_id = db_utils.create_database(tmpl, client=client, parent_page_id="parent")
+    with patch.object(notion_templates, "get_template", return_value=large):
+        pages = await db_utils.create_dummy_data(db_id, "교육 수강 신청서", client=client)
+
+    assert client.calls["blocks.children.append"] == 2 * len(pages)
+    assert len(client.blocks_store[pages[-1]]) == 150
+
+
+def test_template_guides_only_name_existing_status_options():
+    """본문 안내에 나오는 상태 값은 실제 상태 옵션이고, 첨부 안내는 파일 속성이 있는 템플릿에만 있어야 한다."""
+
+    options = {option["name"] for option in db_utils.DEFAULT_SELECT_OPTIONS}
+    for tmpl in notion_templates.DATABASE_TEMPLATES:
+        has_files = any("files" in prop for prop in tmpl["properties"].values())
+        for spec in tmpl.get("page_blocks", []):
+            text = spec.get("text", "")
+            if "상태를" in text:
+                assert text.split("'")[1] in options
+            if "첨부" in text:
+                assert has_files, (tmpl["template_title"], text)
@@ -0,0 +1,64 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
+from page_decoder import Column, PageDecoder, plain_text
+
+PAGE = {
+    "id": "p1",
+    "last_edited_time": "2024-06-01T00:00:00.000Z",
+    "properties": {
+        "제목": {"type": "title", "title": [{"plain_text": "출장"}, {"text": {"content": "1"}}]},
+        "금액": {"type": "number", "number": 1200},
+        "상태": {"type": "select", "select": {"name": "승인됨"}},
+        "출장기간": {"type": "date", "date": {"start": "2024-06-01", "end": "2024-06-05"}},
+        "출장자": {"type": "people", "people": [{"id": "u1"}, {"id": "u2"}]},
+        "관련": {"type": "relation", "relation": [{"id": "r1"}]},
+        "첨부": {
+            "type": "files",
+            "files": [{"type": "external", "external": {"url": "https://e/x.pdf"}}],
+        },
+        "비고": {"type": "rich_text", "rich_text": []},
+    },
+}
+
+
+def test_decode_selected_columns_by_kind_and_value_type():
+    """지정한 열만 타입별로 평탄화한다."""
+
+    decoder = PageDecoder(
+        [
+            Column("id", "page_id"),
+            "제목",
+            Column("출장기간", "date", name="start"),
+            Column("출장기간", "date_end", name="end"),
+            "출장자",
+            "관련",
+            "첨부",
+            Column("없음", "select", "기본"),
+        ]
+    )
+    assert decoder.row(PAGE) == (
+        "p1", "출장1", "2024-06-01", "2024-06-05", ("u1", "u2"), ("r1",), ("https://e/x.pdf",), "기본",
+    )
+    assert decoder.decode(PAGE)["end"] == "2024-06-05"
+
+
+def test_from_schema_and_column_arrays():
+    """스키마로 디코더를 만들고 열 단위 배열로 돌려준다."""
+
+    schema = {name: {"type": prop["type"]} for name, prop in PAGE["properties"].items()}
+    decoder = PageDecoder.from_schema(schema, ["금액", "상태", "출장자"])
+    cols = decoder.column_arrays([PAGE, PAGE])
+    assert cols == {"금액": [1200, 1200], "상태": ["승인됨"] * 2, "출장자": [("u1", "u2")] * 2}
+
+    np = pytest.importorskip("numpy")
+    arrays = decoder.column_arrays([PAGE, PAGE], arrays=True)
+    assert arrays["금액"].sum() == 2400
+    assert arrays["출장자"].dtype == np.dtype(object)
+
+
+def test_unknown_kind_and_plain_text():
+    with pytest.raises(ValueError):
+        PageDecoder([Column("x", "nope")])
+    assert plain_text(None) == ""
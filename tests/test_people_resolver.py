@@ -0,0 +1,63 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from unittest.mock import MagicMock, patch
+import pytest
+import notion_db_utils as db_utils
+from people_resolver import PeopleResolver
+
+USERS = [
+    {"id": "u1", "name": "홍길동", "type": "person", "person": {"email": "Hong@Example.com"}},
+    {"id": "u2", "name": "김철수", "type": "person", "person": {"email": "kim@example.com"}},
+    {"id": "u3", "name": "김철수", "type": "person", "person": {"email": "kim2@example.com"}},
+    {"id": "b1", "name": "봇", "type": "bot", "bot": {}},
+]
+
+
+def test_resolves_email_and_unique_name(tmp_path):
+    """이메일과 중복되지 않는 이름을 사용자 ID로 변환한다."""
+
+    resolver = PeopleResolver(lambda: USERS, cache_file=str(tmp_path / "p.json"))
+    assert resolver.resolve("hong@example.com") == "u1"
+    assert resolver.resolve({"email": "kim2@example.com"}) == "u3"
+    assert resolver.resolve("홍길동") == "u1"
+    assert resolver.resolve("김철수") is None
+    assert resolver.resolve_many(["hong@example.com", "홍길동", "none@x.com"]) == [{"id": "u1"}]
+
+
+def test_disk_cache_avoids_second_listing(tmp_path):
+    """TTL 안에서는 디스크 캐시를 사용해 사용자 목록을 다시 조회하지 않는다."""
+
+    path = str(tmp_path / "p.json")
+    loader = MagicMock(return_value=USERS)
+    PeopleResolver(loader, key="ws", cache_file=path).resolve("hong@example.com")
+    assert PeopleResolver(loader, key="ws", cache_file=path).resolve("kim@example.com") == "u2"
+    assert loader.call_count == 1
+    PeopleResolver(loader, key="ws", cache_file=path, ttl=-1).load()
+    assert loader.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_create_dummy_data_resolves_emails_with_one_listing(tmp_path, monkeypatch):
+    """더미 데이터의 이메일 사람 값은 users.list 한 번으로 일괄 변환된다."""
+
+    items = [
+        {"제목": "지출A", "요청자": ["hong@example.com"], "상태": "미처리"},
+        {"제목": "지출B", "요청자": [{"email": "kim@example.com"}], "상태": "미처리"},
+    ]
+    monkeypatch.chdir(tmp_path)
+    with patch.object(db_utils, "notion") as mock_notion, patch.object(
+        db_utils.templates, "get_dummy_items", return_value=items
+    ):
+        mock_notion.pages.create = MagicMock(return_value={"id": "p"})
+        mock_notion.databases.retrieve.return_value = {
+            "properties": {"상태": {"type": "select"}}
+        }
+        mock_notion.users.list.return_value = {"results": USERS, "next_cursor": None}
+
+        await db_utils.create_dummy_data("db", "지출결의서")
+
+        assert mock_notion.users.list.call_count == 1
+        calls = mock_notion.pages.create.call_args_list
+        people = sorted(c.kwargs["properties"]["요청자"]["people"][0]["id"] for c in calls)
+        assert people == ["u1", "u2"]
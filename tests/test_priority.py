@@ -0,0 +1,70 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asyncio
+import threading
+import time
+from priority import PriorityScheduler, current_priority, priority
+from rate_limit import RateLimiter
+
+
+def test_waiting_classes_share_tokens_by_weight():
+    """대기 중인 클래스는 가중치 비율대로 토큰을 받는다."""
+
+    limiter = RateLimiter(50, burst=1)
+    assert limiter.try_acquire()
+    scheduler = PriorityScheduler(
+        "test", limiter, weights={"critical": 3, "sync": 1}, max_wait={}
+    )
+    order = []
+    lock = threading.Lock()
+
+    def call(cls):
+        assert scheduler.acquire(cls)
+        with lock:
+            order.append(cls)
+
+    threads = [threading.Thread(target=call, args=(cls,)) for cls in ["sync", "critical"] * 8]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    assert len(order) == 16
+    assert order[:8].count("critical") >= 5
+
+
+def test_background_is_shed_without_a_free_token():
+    """background 는 토큰이 없거나 다른 대기가 있으면 바로 버린다."""
+
+    scheduler = PriorityScheduler(
+        "test", RateLimiter(1, burst=1), weights={}, max_wait={"background": 0}
+    )
+    assert scheduler.acquire("background") is True
+    started = time.monotonic()
+    assert scheduler.acquire("background") is False
+    assert time.monotonic() - started < 0.1
+
+
+def test_deferred_class_is_shed_after_its_max_wait():
+    """notify 는 최대 대기 시간까지 미뤄진 뒤 버려진다."""
+
+    limiter = RateLimiter(0.5, burst=1)
+    assert limiter.try_acquire()
+    scheduler = PriorityScheduler("test", limiter, weights={}, max_wait={"notify": 0.05})
+    started = time.monotonic()
+    assert scheduler.acquire("notify") is False
+    assert 0.04 <= time.monotonic() - started < 0.5
+    assert scheduler.waiting() == 0
+
+
+def test_priority_follows_worker_threads():
+    """우선순위는 기본 critical 이며 to_thread 작업에도 이어진다."""
+
+    assert current_priority() == "critical"
+
+    async def inner():
+        with priority("sync"):
+            return await asyncio.to_thread(current_priority)
+
+    assert asyncio.run(inner()) == "sync"
+    assert current_priority() == "critical"
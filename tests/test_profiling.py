@@ -0,0 +1,40 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asyncio
+import pstats
+import time
+import pytest
+from profiling import Profiler, current_phase, profiled, profiler
+
+
+@pytest.mark.asyncio
+async def test_spans_nest_and_collect_api_time_from_threads():
+    """스레드에서 보고한 API 시간도 현재 단계에 집계된다."""
+
+    prof = Profiler()
+    with prof.span("seed"):
+        with prof.span("calendar"):
+            assert current_phase() == "seed/calendar"
+
+            def call():
+                with prof.api_call():
+                    time.sleep(0.02)
+
+            await asyncio.to_thread(call)
+    assert current_phase() == ""
+    rows = {r["phase"]: r for r in prof.breakdown()}
+    assert rows["seed/calendar"]["api"] >= 0.02
+    assert rows["seed"]["wall"] >= rows["seed/calendar"]["wall"]
+    assert rows["seed"]["api"] == 0
+
+
+def test_profiled_writes_cprofile_and_prints_breakdown(tmp_path, capsys):
+    """cProfile 파일을 저장하고 단계별 표를 출력한다."""
+
+    out = str(tmp_path / "run.prof")
+    with profiled(out, top=1):
+        with profiler.span("teardown"):
+            sum(range(1000))
+    assert pstats.Stats(out).total_calls > 0
+    assert "teardown" in capsys.readouterr().out
@@ -0,0 +1,68 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+import read_cache
+import notion_db_utils as db_utils
+
+
+def test_single_flight_shares_one_call():
+    """동시에 들어온 같은 조회는 한 번만 호출한다."""
+
+    flight = read_cache.SingleFlight()
+    calls = []
+    gate = threading.Event()
+
+    def load():
+        calls.append(1)
+        gate.wait(1)
+        return {"id": "db"}
+
+    with ThreadPoolExecutor(5) as pool:
+        futures = [pool.submit(flight.do, "k", load) for _ in range(5)]
+        time.sleep(0.05)
+        gate.set()
+    assert [f.result() for f in futures] == [{"id": "db"}] * 5
+    assert len(calls) == 1
+
+
+def test_cache_reuses_until_invalidated():
+    """TTL 안에서는 재사용하고 쓰기 후에는 다시 조회한다."""
+
+    cache = read_cache.ReadCache(ttl=60)
+    loader = MagicMock(side_effect=[{"v": 1}, {"v": 2}])
+    assert cache.get(("r", "x"), loader) == {"v": 1}
+    first = cache.get(("r", "x"), loader)
+    first["v"] = 99
+    assert cache.get(("r", "x"), loader) == {"v": 1}
+    cache.invalidate(("r", "x"))
+    assert cache.get(("r", "x"), loader) == {"v": 2}
+    assert loader.call_count == 2
+
+
+def test_status_check_and_seeding_share_schema_read():
+    """상태 컬럼 확인과 더미 데이터 생성이 스키마 조회를 공유한다."""
+
+    api = MagicMock()
+    api.databases.retrieve.return_value = {"properties": {"상태": {"type": "select"}}}
+    db_utils.ensure_status_column("db", client=api)
+    db_utils.retrieve_database("db", client=api)
+    assert api.databases.retrieve.call_count == 1
+
+    db_utils.update_database("db", client=api, properties={})
+    db_utils.retrieve_database("db", client=api)
+    assert api.databases.retrieve.call_count == 2
+
+
+def test_list_users_follows_pagination_once():
+    api = MagicMock()
+    api.users.list.side_effect = [
+        {"results": [{"id": "u1"}], "next_cursor": "c"},
+        {"results": [{"id": "u2"}], "next_cursor": None},
+    ]
+    assert [u["id"] for u in db_utils.list_users(client=api)] == ["u1", "u2"]
+    assert [u["id"] for u in db_utils.list_users(client=api)] == ["u1", "u2"]
+    assert api.users.list.call_count == 2
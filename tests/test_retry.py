@@ -0,0 +1,87 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from unittest.mock import MagicMock, patch
+import pytest
+import retry
+import notion_db_utils as db_utils
+
+
+class FakeHTTPError(Exception):
+    def __init__(self, status, headers=None):
+        super().__init__(f"status {status}")
+        self.status = status
+        self.headers = headers or {}
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    with patch.object(retry.time, "sleep") as sleep:
+        yield sleep
+
+
+def test_classify_errors():
+    """429는 미적용, 5xx는 모호한 실패, 4xx는 재시도 불가로 분류한다."""
+
+    assert retry.classify(FakeHTTPError(429)) == "unsent"
+    assert retry.classify(FakeHTTPError(502)) == "ambiguous"
+    assert retry.classify(FakeHTTPError(400)) is None
+    assert retry.classify(ValueError("x")) is None
+
+
+def test_safe_call_retries_until_success(no_sleep):
+    """멱등 호출은 일시 오류 후 다시 시도한다."""
+
+    fn = MagicMock(side_effect=[FakeHTTPError(503), FakeHTTPError(429, {"retry-after": "2"}), "ok"])
+    assert retry.call_with_retry("ep", fn, budget=retry.RetryBudget(10)) == "ok"
+    assert fn.call_count == 3
+    assert no_sleep.call_args_list[-1].args[0] == 2.0
+
+
+def test_unsafe_call_without_recover_is_not_retried_on_ambiguous_error():
+    """확인 수단이 없는 생성 요청은 5xx 후 재시도하지 않는다."""
+
+    fn = MagicMock(side_effect=FakeHTTPError(502))
+    with pytest.raises(FakeHTTPError):
+        retry.call_with_retry("ep", fn, safe=False, budget=retry.RetryBudget(10))
+    assert fn.call_count == 1
+
+
+def test_budget_limits_retries_per_endpoint():
+    """엔드포인트별 재시도 예산을 넘으면 바로 실패한다."""
+
+    budget = retry.RetryBudget(1)
+    fn = MagicMock(side_effect=FakeHTTPError(503))
+    with pytest.raises(FakeHTTPError):
+        retry.call_with_retry("ep", fn, budget=budget)
+    assert fn.call_count == 2
+
+
+def test_budget_scope_gives_each_run_a_fresh_budget(no_sleep):
+    """실행마다 새 예산을 써서 이전 실행이 소진한 예산이 남지 않는다."""
+
+    def run():
+        fn = MagicMock(side_effect=[FakeHTTPError(503), "ok"])
+        with retry.retry_budget_scope(retry.RetryBudget(1)) as budget:
+            assert retry.call_with_retry("ep", fn) == "ok"
+        return budget
+
+    first, second = run(), run()
+    assert first is not second and second.used == {"ep": 1}
+    assert retry.current_budget() is retry.DEFAULT_BUDGET
+
+
+def test_create_page_recovers_existing_page_instead_of_duplicating():
+    """생성 응답이 유실돼도 생성키로 찾은 페이지를 반환한다."""
+
+    api = MagicMock()
+    api.pages.create.side_effect = FakeHTTPError(504)
+    api.databases.query.return_value = {"results": [{"id": "created"}]}
+    with patch.object(retry, "DEFAULT_BUDGET", retry.RetryBudget(10)):
+        page = db_utils.create_page("db", {"제목": {"title": []}}, client=api)
+
+    assert page == {"id": "created"}
+    assert api.pages.create.call_count == 1
+    key = api.pages.create.call_args.kwargs["properties"][db_utils.IDEMPOTENCY_PROPERTY]
+    flt = api.databases.query.call_args.kwargs["filter"]
+    assert flt["rich_text"]["equals"] == key["rich_text"][0]["text"]["content"]
@@ -0,0 +1,128 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import logging
+from unittest.mock import MagicMock, patch
+import slack_utils
+
+
+def _record(name="notion_db_utils", level=logging.ERROR, msg="캘린더 이벤트 생성 실패 %s", args=("x",)):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_filter_routes_by_logger_prefix():
+    """라우팅 설정보다 낮은 레벨의 외부 라이브러리 로그는 전송하지 않는다."""
+
+    flt = slack_utils.SlackLogFilter(
+        slack_utils.parse_log_routes("googleapiclient=WARNING"), default_level="INFO"
+    )
+    assert not flt.filter(_record("googleapiclient.discovery", logging.INFO, "debug", ()))
+    assert flt.filter(_record("googleapiclient.discovery", logging.WARNING, "warn", ()))
+    assert flt.filter(_record("main", logging.INFO, "hello", ()))
+
+
+def test_filter_collapses_identical_records():
+    """같은 메시지 템플릿은 창 안에서 한 번만 전송하고 반복 횟수를 센다."""
+
+    flt = slack_utils.SlackLogFilter({}, default_level="INFO", window=60)
+    assert flt.filter(_record(args=("a",)))
+    for row in "bcd":
+        assert not flt.filter(_record(args=(row,)))
+    assert flt.drain() == ["캘린더 이벤트 생성 실패 a (외 3건 반복)"]
+
+
+def test_filter_reports_repeats_after_window():
+    """창이 지나면 다음 기록에 이전 반복 횟수를 표시한다."""
+
+    flt = slack_utils.SlackLogFilter({}, default_level="INFO", window=10)
+    with patch.object(slack_utils.time, "monotonic", side_effect=[0, 1, 2, 20]):
+        assert flt.filter(_record())
+        assert not flt.filter(_record())
+        assert not flt.filter(_record())
+        rec = _record()
+        assert flt.filter(rec)
+    assert rec.slack_repeats == 2
+
+
+def test_filter_forgets_fingerprints_after_window():
+    """창이 지나고 반복이 없는 지문은 잊어 메모리가 계속 늘지 않는다."""
+
+    flt = slack_utils.SlackLogFilter({}, default_level="INFO", window=10, max_per_minute=1000)
+    flt._pruned = 0
+    with patch.object(slack_utils.time, "monotonic", side_effect=[0, 1, 2, 30]):
+        assert flt.filter(_record(msg="once", args=()))
+        assert flt.filter(_record(msg="twice", args=()))
+        assert not flt.filter(_record(msg="twice", args=()))
+        assert flt.filter(_record(msg="later", args=()))
+    assert {key[2] for key in flt._seen} == {"twice", "later"}
+    with patch.object(slack_utils.time, "monotonic", return_value=100):
+        assert flt.drain() == ["twice (외 1건 반복)"]
+    assert flt._seen == {}
+
+
+def test_shed_records_are_reported_apart_from_the_minute_cap():
+    """예산 부족으로 못 보낸 기록은 분당 한도와 따로 집계하고 반복 횟수를 유지한다."""
+
+    flt = slack_utils.SlackLogFilter({}, default_level="INFO", window=10)
+    handler = slack_utils.SlackLogHandler(flt, scheduler=MagicMock())
+    handler.scheduler.acquire.return_value = False
+    handler.webhook = MagicMock()
+    with patch.object(slack_utils.time, "monotonic", side_effect=[0, 1, 2, 20]):
+        for _ in range(4):
+            handler.handle(_record())
+    handler.webhook.send.assert_not_called()
+    with patch.object(slack_utils.time, "monotonic", return_value=21):
+        assert flt.drain() == [
+            "캘린더 이벤트 생성 실패 x (외 2건 반복)",
+            "슬랙 전송 예산 부족(또는 서킷 열림)으로 2건 미전송",
+        ]
+
+
+def test_filter_enforces_per_minute_cap():
+    """분당 전송 한도를 넘는 기록은 버리고 개수를 보고한다."""
+
+    flt = slack_utils.SlackLogFilter({}, default_level="INFO", max_per_minute=2)
+    passed = [flt.filter(_record(msg=f"msg {i}", args=())) for i in range(5)]
+    assert passed == [True, True, False, False, False]
+    assert flt.drain() == ["분당 전송 한도로 3건 생략"]
+
+
+def test_handler_posts_once_for_log_storm():
+    """반복 오류가 많아도 웹훅 호출은 한 번이다."""
+
+    handler = slack_utils.SlackLogHandler(
+        slack_utils.SlackLogFilter({}, default_level="INFO")
+    )
+    handler.webhook = MagicMock()
+    handler.error_webhook = None
+    logger = logging.getLogger("storm-test")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        for i in range(100):
+            logger.error("캘린더 이벤트 생성 실패 %s", i)
+    finally:
+        logger.removeHandler(handler)
+    assert handler.webhook.send.call_count == 1
+    handler.close()
+    assert "외 99건 반복" in handler.webhook.send.call_args.kwargs["text"]
+
+
+def test_handler_webhook_posts_are_traced(tmp_path):
+    """로그 핸들러의 웹훅 전송도 호출 추적에 기록한다."""
+
+    import tracing
+
+    path = str(tmp_path / "trace.jsonl")
+    handler = slack_utils.SlackLogHandler(
+        slack_utils.SlackLogFilter({}, default_level="INFO"), scheduler=MagicMock()
+    )
+    handler.webhook = MagicMock()
+    handler.error_webhook = MagicMock()
+    with patch.object(slack_utils, "tracer", tracing.Tracer(path)) as tracer:
+        handler.handle(_record(args=("a",)))
+        handler.handle(_record(args=("b",)))
+        handler.close()
+        tracer.close()
+    records = tracing.load_trace(path)
+    assert [(r["service"], r["endpoint"]) for r in records] == [("slack", "webhook")] * 3
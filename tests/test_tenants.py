@@ -0,0 +1,53 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asyncio
+import json
+import threading
+from unittest.mock import AsyncMock, patch
+import pytest
+import tenants
+
+
+def test_load_manifest_requires_parent_page(tmp_path):
+    """parent_page_id 가 없는 테넌트는 오류로 처리한다."""
+
+    path = tmp_path / "tenants.json"
+    path.write_text(json.dumps([{"notion_token": "t"}]), encoding="utf-8")
+    with pytest.raises(ValueError):
+        tenants.load_manifest(str(path))
+
+
+@pytest.mark.asyncio
+async def test_run_tenants_uses_separate_clients_and_cap():
+    """테넌트마다 별도 클라이언트를 쓰고 동시 실행 수를 제한한다."""
+
+    manifest = [
+        {"name": f"t{i}", "notion_token": f"token-{i}", "parent_page_id": f"p{i}"}
+        for i in range(4)
+    ]
+    seen = []
+    active = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    async def runner(client, parent_page_id, notify=True):
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        seen.append((client, parent_page_id))
+        await asyncio.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        if parent_page_id == "p3":
+            raise RuntimeError("boom")
+        return {"databases": 7, "pages": 30}
+
+    with patch.object(tenants, "build_notion_client", side_effect=lambda tok, limiter: (tok, limiter)), patch.object(
+        tenants, "send_message", new=AsyncMock()
+    ) as send:
+        results = await tenants.run_tenants(manifest, runner, concurrency=2)
+
+    assert active["max"] <= 2
+    assert len({id(client[1]) for client, _ in seen}) == 4
+    assert [r["status"] for r in results] == ["ok", "ok", "ok", "error"]
+    assert "3/4 성공" in send.call_args.args[0]
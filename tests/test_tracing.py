@@ -0,0 +1,90 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
+from profiling import Profiler
+import tracing
+
+
+def _call(start, end, endpoint="POST /v1/pages", phase="seed", service="notion"):
+    return {"service": service, "endpoint": endpoint, "start": start, "end": end,
+            "status": 200, "phase": phase}
+
+
+def test_tracer_records_phase_and_error_status(tmp_path):
+    """호출마다 단계와 상태를 JSONL로 남긴다."""
+
+    path = str(tmp_path / "trace.jsonl")
+    tracer = tracing.Tracer(path)
+    prof = Profiler()
+    with prof.span("teardown"):
+        tracer.wrap("notion", "blocks.delete", lambda: None)()
+        with pytest.raises(ValueError):
+            with tracer.call("slack", "chat.postMessage"):
+                raise ValueError("boom")
+    tracer.close()
+    records = tracing.load_trace(path)
+    assert [(r["endpoint"], r["status"], r["phase"]) for r in records] == [
+        ("blocks.delete", "ok", "teardown"),
+        ("chat.postMessage", "ValueError", "teardown"),
+    ]
+
+
+def test_normalize_path_groups_ids():
+    assert tracing.normalize_path(
+        "/v1/databases/0c1f3b5e-1111-2222-3333-444455556666/query"
+    ) == "/v1/databases/{id}/query"
+
+
+def test_analyze_critical_path_and_rate_bound():
+    """겹치지 않은 호출 사슬과 요청 한도 기반 최소 시간을 계산한다."""
+
+    calls = [
+        _call(0.0, 1.0, phase="teardown"),
+        _call(0.5, 1.0, phase="teardown"),
+        _call(1.0, 3.0),
+        _call(1.2, 1.8),
+        _call(3.0, 3.5),
+    ]
+    report = tracing.analyze(calls, {"notion": 10})
+    assert report["wall"] == 3.5
+    assert report["critical_path"] == 3.5
+    assert report["critical_calls"] == 3
+    assert report["parallelism"] == pytest.approx(4.6 / 3.5)
+    # teardown needs its 1s call, seed its 2s call; the rate allows both
+    assert report["min_wall"] == pytest.approx(3.0)
+    slow = tracing.analyze(calls, {"notion": 1})
+    assert slow["min_wall"] == pytest.approx(2.0 + 3.0)
+    assert "임계 경로" in tracing.format_report(report)
+
+
+def test_notion_trace_excludes_limiter_wait(tmp_path):
+    """노션 호출 추적은 토큰을 받은 뒤부터 재고, 대기 시간은 API 시간에만 포함한다."""
+
+    import time
+    import httpx
+    from unittest.mock import patch
+    import notion_db_utils
+    from rate_limit import RateLimiter
+
+    def slow_acquire(self, cls=None):
+        time.sleep(0.2)
+        return True
+
+    path = str(tmp_path / "trace.jsonl")
+    prof = Profiler()
+    with patch("priority.PriorityScheduler.acquire", slow_acquire), patch.object(
+        notion_db_utils, "tracer", tracing.Tracer(path)
+    ) as tracer, patch.object(notion_db_utils, "profiler", prof):
+        client = notion_db_utils.build_notion_client("token", limiter=RateLimiter(100))
+        hooks = client.client.event_hooks
+        request = httpx.Request("GET", "https://api.notion.com/v1/users")
+        with prof.span("seed"):
+            for hook in hooks["request"]:
+                hook(request)
+            for hook in hooks["response"]:
+                hook(httpx.Response(200, request=request))
+        tracer.close()
+    (record,) = tracing.load_trace(path)
+    assert record["end"] - record["start"] < 0.1
+    assert sum(entry["api"] for entry in prof.phases.values()) >= 0.2
@@ -0,0 +1,82 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+import pytest
+import watch_daemon
+from state_store import StateStore
+
+
+def _page(pid, edited):
+    return {"id": pid, "last_edited_time": edited, "properties": {}}
+
+
+def test_poll_filters_by_last_edited_time_and_dedupes():
+    """같은 분에 다시 조회된 페이지는 중복 보고하지 않는다."""
+
+    client = MagicMock()
+    client.databases.query.side_effect = [
+        {"results": [_page("a", "2024-10-01T10:00:00.000Z")], "next_cursor": None},
+        {
+            "results": [
+                _page("a", "2024-10-01T10:00:00.000Z"),
+                _page("b", "2024-10-01T10:00:00.000Z"),
+            ],
+            "next_cursor": None,
+        },
+    ]
+    watcher = watch_daemon.DatabaseWatcher("db", since="2024-10-01T09:00:00Z")
+
+    first = watcher.poll(client)
+    second = watcher.poll(client)
+
+    flt = client.databases.query.call_args_list[0].kwargs["filter"]
+    assert flt["last_edited_time"] == {"on_or_after": "2024-10-01T09:00:00Z"}
+    assert [p["id"] for p in first] == ["a"]
+    assert [p["id"] for p in second] == ["b"]
+    assert watcher.since == "2024-10-01T10:00:00.000Z"
+
+
+def test_adapt_shrinks_on_changes_and_grows_when_idle():
+    """변경이 있으면 주기를 줄이고 없으면 늘리되 한계를 지킨다."""
+
+    watcher = watch_daemon.DatabaseWatcher("db", min_interval=2, max_interval=10)
+    watcher.interval = 8
+    assert watcher.adapt(3) == 4
+    assert watcher.adapt(1) == 2
+    assert watcher.adapt(1) == 2
+    for _ in range(10):
+        watcher.adapt(0)
+    assert watcher.interval == 10
+    assert watcher.adapt(1, floor=6) == 6
+
+
+@pytest.mark.asyncio
+async def test_daemon_dispatches_calendar_changes(tmp_path):
+    """캘린더 DB 변경은 캘린더 동기화와 슬랙으로 전달된다."""
+
+    client = MagicMock()
+    client.databases.retrieve.return_value = {
+        "title": [{"plain_text": "회사 일정 캘린더"}]
+    }
+    client.databases.query.return_value = {
+        "results": [_page("a", "2024-10-01T10:00:00.000Z")],
+        "next_cursor": None,
+    }
+    state = StateStore(str(tmp_path / "state.json"))
+    daemon = watch_daemon.WatchDaemon(["db"], client=client, state=state, budget=100)
+    stop = asyncio.Event()
+
+    def _sync(pages, st, **kwargs):
+        stop.set()
+        return {}
+
+    with patch.object(watch_daemon, "sync_pages_to_calendar", side_effect=_sync) as sync, patch.object(
+        watch_daemon, "send_message", new=AsyncMock()
+    ) as send:
+        await asyncio.wait_for(daemon.run(stop), timeout=5)
+
+    sync.assert_called_once()
+    send.assert_awaited_once()
+    assert state.get(watch_daemon.CURSORS_NS, "db") == "2024-10-01T10:00:00.000Z"
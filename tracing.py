@@ -0,0 +1,239 @@
+"""JSONL trace of outbound API calls and an offline critical-path analyzer.
+
+When a trace file is configured (``TRACE_FILE`` or ``main.py --trace``) every
+Notion, Google Calendar and Slack call appends one JSON line::
+
+    {"service": "notion", "endpoint": "POST /v1/pages", "start": 1718000000.12,
+     "end": 1718000000.48, "status": 200, "phase": "seed"}
+
+``python tracing.py trace.jsonl`` then reports how calls overlapped: the
+achieved parallelism, the longest chain of back-to-back calls and the
+theoretical minimum wall time allowed by the Notion rate limit.
+"""
+import argparse
+import bisect
+import json
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from config import NOTION_RATE_LIMIT, TRACE_FILE
+from logging_utils import get_logger
+from profiling import current_phase
+from retry import error_status
+
+log = get_logger(__name__)
+
+_ID_RE = re.compile(r"[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}")
+
+
+def normalize_path(path: str) -> str:
+    """Replace object ids in a URL path so calls group by endpoint."""
+    return _ID_RE.sub("{id}", path)
+
+
+class Tracer:
+    """Append call records to a JSONL file; a no-op until :meth:`open`."""
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self._lock = threading.Lock()
+        self._fh = None
+        self.path = None
+        if path:
+            self.open(path)
+
+    @property
+    def enabled(self) -> bool:
+        return self._fh is not None
+
+    def open(self, path: str) -> None:
+        """Start writing records to ``path`` (truncating it)."""
+        self.close()
+        with self._lock:
+            self._fh = open(path, "w", encoding="utf-8")
+            self.path = path
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh:
+                self._fh.close()
+            self._fh = None
+
+    def record(
+        self, service: str, endpoint: str, start: float, end: float, status: Any
+    ) -> None:
+        """Write one call record attributed to the active profiling phase."""
+        if not self._fh:
+            return
+        line = json.dumps(
+            {
+                "service": service,
+                "endpoint": endpoint,
+                "start": round(start, 6),
+                "end": round(end, 6),
+                "status": status,
+                "phase": current_phase(),
+            },
+            ensure_ascii=False,
+        )
+        with self._lock:
+            if self._fh:
+                self._fh.write(line + "\n")
+                self._fh.flush()
+
+    @contextmanager
+    def call(self, service: str, endpoint: str) -> Iterator[None]:
+        """Trace the enclosed call; exceptions are recorded with their status."""
+        if not self._fh:
+            yield
+            return
+        start = time.time()
+        status: Any = "ok"
+        try:
+            yield
+        except Exception as exc:
+            status = error_status(exc) or type(exc).__name__
+            raise
+        finally:
+            self.record(service, endpoint, start, time.time(), status)
+
+    def wrap(self, service: str, endpoint: str, fn: Callable) -> Callable:
+        """Return ``fn`` traced as one call per invocation."""
+
+        def traced(*args, **kwargs):
+            with self.call(service, endpoint):
+                return fn(*args, **kwargs)
+
+        return traced
+
+
+tracer = Tracer(TRACE_FILE)
+
+
+def load_trace(path: str) -> List[Dict]:
+    with open(path, encoding="utf-8") as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+def _busy_time(calls: List[Dict]) -> float:
+    """Return the time during which at least one call was in flight."""
+    busy = 0.0
+    cur_start = cur_end = None
+    for call in sorted(calls, key=lambda c: c["start"]):
+        if cur_end is None or call["start"] > cur_end:
+            if cur_end is not None:
+                busy += cur_end - cur_start
+            cur_start, cur_end = call["start"], call["end"]
+        else:
+            cur_end = max(cur_end, call["end"])
+    if cur_end is not None:
+        busy += cur_end - cur_start
+    return busy
+
+
+def critical_path(calls: List[Dict]) -> List[Dict]:
+    """Return the longest chain of calls where each starts after the previous ends.
+
+    Without explicit dependencies, calls that never overlapped are treated as
+    serialized; the chain is the part of the run that concurrency did not
+    hide.
+    """
+    order = sorted(calls, key=lambda c: c["end"])
+    ends = [c["end"] for c in order]
+    best: List[float] = []
+    prev: List[int] = []
+    best_upto: List[int] = []  # index of the best chain ending at or before i
+    for i, call in enumerate(order):
+        j = bisect.bisect_right(ends, call["start"], 0, i) - 1
+        base = best[best_upto[j]] if j >= 0 else 0.0
+        best.append(base + call["end"] - call["start"])
+        prev.append(best_upto[j] if j >= 0 else -1)
+        if i and best[best_upto[i - 1]] >= best[i]:
+            best_upto.append(best_upto[i - 1])
+        else:
+            best_upto.append(i)
+    if not order:
+        return []
+    chain = []
+    i = best_upto[-1]
+    while i >= 0:
+        chain.append(order[i])
+        i = prev[i]
+    return chain[::-1]
+
+
+def analyze(calls: List[Dict], rates: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """Summarise a trace.
+
+    ``min_wall`` assumes the top-level phases stay sequential and each phase
+    needs at least its longest call and ``calls / rate`` seconds for every
+    rate-limited service.
+    """
+    rates = rates if rates is not None else {"notion": NOTION_RATE_LIMIT}
+    if not calls:
+        return {"calls": 0, "wall": 0.0, "busy": 0.0, "parallelism": 0.0,
+                "critical_path": 0.0, "critical_calls": 0, "min_wall": 0.0,
+                "phases": {}, "critical_endpoints": []}
+    wall = max(c["end"] for c in calls) - min(c["start"] for c in calls)
+    total = sum(c["end"] - c["start"] for c in calls)
+    chain = critical_path(calls)
+
+    phases: Dict[str, List[Dict]] = defaultdict(list)
+    for call in calls:
+        phases[(call.get("phase") or "-").split("/")[0]].append(call)
+    phase_stats = {}
+    min_wall = 0.0
+    for name, items in phases.items():
+        counts = Counter(c["service"] for c in items)
+        bound = max(
+            [max(c["end"] - c["start"] for c in items)]
+            + [counts[svc] / rate for svc, rate in rates.items() if rate > 0]
+        )
+        min_wall += bound
+        phase_stats[name] = {
+            "calls": len(items),
+            "wall": max(c["end"] for c in items) - min(c["start"] for c in items),
+            "min_wall": bound,
+        }
+    return {
+        "calls": len(calls),
+        "wall": wall,
+        "busy": _busy_time(calls),
+        "parallelism": total / wall if wall else 0.0,
+        "critical_path": sum(c["end"] - c["start"] for c in chain),
+        "critical_calls": len(chain),
+        "critical_endpoints": Counter(c["endpoint"] for c in chain).most_common(5),
+        "min_wall": min_wall,
+        "phases": phase_stats,
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"호출 {report['calls']}건, 실행 시간 {report['wall']:.2f}s "
+        f"(호출 진행 중 {report['busy']:.2f}s)",
+        f"평균 병렬도 {report['parallelism']:.2f}",
+        f"임계 경로 {report['critical_path']:.2f}s ({report['critical_calls']}건)",
+        f"이론적 최소 시간 {report['min_wall']:.2f}s",
+    ]
+    for endpoint, count in report["critical_endpoints"]:
+        lines.append(f"  임계 경로 {endpoint}: {count}건")
+    for name, stats in report["phases"].items():
+        lines.append(
+            f"  단계 {name}: {stats['calls']}건, {stats['wall']:.2f}s (최소 {stats['min_wall']:.2f}s)"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="호출 추적 파일 분석")
+    parser.add_argument("path", help="JSONL 추적 파일")
+    parser.add_argument("--rate", type=float, default=NOTION_RATE_LIMIT, help="노션 초당 요청 한도")
+    args = parser.parse_args(argv)
+    print(format_report(analyze(load_trace(args.path), {"notion": args.rate})))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Long-running watcher that pushes Notion edits to Calendar and Slack."""
+import asyncio
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from config import (
+    WATCH_API_BUDGET,
+    WATCH_DATABASE_IDS,
+    WATCH_MAX_INTERVAL,
+    WATCH_MIN_INTERVAL,
+)
+from logging_utils import get_logger
+from priority import priority
+from notion_db_utils import notion, retrieve_database
+from page_decoder import plain_text
+from calendar_routes import route_for
+from calendar_sync import sync_pages_to_calendar
+from circuit_breaker import CircuitOpenError, get_breaker
+from rate_limit import RateLimiter
+from retry import retry_budget_scope
+from slack_utils import send_message
+from state_store import StateStore
+
+log = get_logger(__name__)
+
+# StateStore namespace holding the last seen edit time per database
+CURSORS_NS = "watch_cursors"
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+class DatabaseWatcher:
+    """Poll one database for pages edited since the previous poll.
+
+    Notion rounds ``last_edited_time`` to the minute, so the query uses
+    ``on_or_after`` and pages already reported with the same edit time are
+    filtered out locally.
+    """
+
+    def __init__(
+        self,
+        db_id: str,
+        *,
+        since: Optional[str] = None,
+        min_interval: float = WATCH_MIN_INTERVAL,
+        max_interval: float = WATCH_MAX_INTERVAL,
+    ) -> None:
+        self.db_id = db_id
+        self.title = ""
+        self.since = since or _now_iso()
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self._seen: Dict[str, str] = {}
+
+    def poll(self, client) -> List[Dict]:
+        """Return pages edited since the last poll and advance the cursor."""
+        query = {
+            "filter": {
+                "timestamp": "last_edited_time",
+                "last_edited_time": {"on_or_after": self.since},
+            }
+        }
+        pages: List[Dict] = []
+        cursor = None
+        while True:
+            if cursor:
+                data = client.databases.query(self.db_id, start_cursor=cursor, **query)
+            else:
+                data = client.databases.query(self.db_id, **query)
+            pages.extend(data.get("results", []))
+            cursor = data.get("next_cursor")
+            if not cursor:
+                break
+
+        changed = [p for p in pages if self._seen.get(p["id"]) != p.get("last_edited_time")]
+        for page in changed:
+            self._seen[page["id"]] = page.get("last_edited_time", "")
+        if changed:
+            self.since = max(p.get("last_edited_time") or self.since for p in changed)
+            # Only edits in the current minute can be returned again
+            self._seen = {k: v for k, v in self._seen.items() if v >= self.since}
+        return changed
+
+    def adapt(self, changed: int, floor: float = 0.0) -> float:
+        """Halve the interval after changes and back off by 1.5x when idle."""
+        low = max(self.min_interval, floor)
+        if changed:
+            self.interval = max(low, self.interval / 2)
+        else:
+            self.interval = min(self.max_interval, max(low, self.interval * 1.5))
+        return self.interval
+
+
+class WatchDaemon:
+    """Watch several databases in one asyncio process.
+
+    Every poll takes a token from a shared :class:`RateLimiter`, and the
+    shortest polling interval is stretched so that all watchers together stay
+    within ``budget`` requests per second.
+    """
+
+    def __init__(
+        self,
+        db_ids: List[str],
+        *,
+        client=None,
+        state: Optional[StateStore] = None,
+        budget: float = WATCH_API_BUDGET,
+    ) -> None:
+        self.client = client or notion
+        self.state = state or StateStore()
+        self.budget = RateLimiter(budget)
+        self.floor = len(db_ids) / budget if db_ids else 0.0
+        self.watchers = [
+            DatabaseWatcher(db_id, since=self.state.get(CURSORS_NS, db_id))
+            for db_id in db_ids
+        ]
+
+    async def dispatch(self, watcher: DatabaseWatcher, pages: List[Dict]) -> None:
+        """Forward changed pages to the calendar and Slack pipelines."""
+        route = route_for(watcher.title)
+        if route:
+            await asyncio.to_thread(sync_pages_to_calendar, pages, self.state, route=route)
+        await send_message(f"📝 {watcher.title or watcher.db_id}: {len(pages)}건 변경")
+
+    async def _watch(self, watcher: DatabaseWatcher, stop: asyncio.Event) -> None:
+        try:
+            info = await asyncio.to_thread(
+                retrieve_database, watcher.db_id, client=self.client
+            )
+            watcher.title = plain_text(info.get("title"))
+        except Exception as exc:
+            log.warning("데이터베이스 정보 조회 실패 %s: %s", watcher.db_id, exc)
+        while not stop.is_set():
+            await self.budget.acquire_async()
+            changed: List[Dict] = []
+            # Every poll gets its own retry budget
+            with retry_budget_scope():
+                try:
+                    changed = await asyncio.to_thread(
+                        get_breaker("notion").call, watcher.poll, self.client
+                    )
+                    if changed:
+                        log.info(
+                            "%s 변경 %d건 감지", watcher.title or watcher.db_id, len(changed)
+                        )
+                        self.state.set(CURSORS_NS, watcher.db_id, watcher.since)
+                        await self.dispatch(watcher, changed)
+                        self.state.save()
+                except CircuitOpenError:
+                    log.debug("노션 서킷 열림으로 %s 조회 건너뜀", watcher.db_id)
+                except Exception as exc:
+                    log.error("데이터베이스 감시 실패 %s: %s", watcher.db_id, exc)
+            interval = watcher.adapt(len(changed), self.floor)
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Poll until ``stop`` is set."""
+        stop = stop or asyncio.Event()
+        if not self.client:
+            log.warning("노션 클라이언트 미설정으로 감시를 건너뜁니다")
+            return
+        log.info("데이터베이스 %d개 감시 시작", len(self.watchers))
+        # Polling yields the Notion budget to provisioning writes
+        with priority("sync"):
+            await asyncio.gather(*(self._watch(w, stop) for w in self.watchers))
+
+
+async def watch(db_ids: Optional[List[str]] = None) -> None:
+    """Run the daemon for ``db_ids`` or ``WATCH_DATABASE_IDS``."""
+    db_ids = db_ids or WATCH_DATABASE_IDS
+    if not db_ids:
+        log.warning("WATCH_DATABASE_IDS 미설정으로 감시할 데이터베이스가 없습니다")
+        return
+    await WatchDaemon(db_ids).run()
+
+# Example usage:
+# asyncio.run(watch(["<노션 DB ID>"]))